@@ -0,0 +1,161 @@
+"""
+Node-level result caching for QaAI workflow nodes.
+
+Mirrors LangGraph's node CachePolicy (key + ttl) for the pinned
+langgraph<0.3 release, which predates the built-in node cache:
+- Keys are derived from the minimal deterministic subset of WorkflowState
+- Only the node's output fields are cached, never the full state, so a
+  cache hit cannot leak thinking states or errors from another run
+- Failed node runs (state with "error") are never cached
+"""
+
+from __future__ import annotations
+import functools
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from core.config import settings
+from core.models import WorkflowState
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Cache policy for a workflow node."""
+    key: Callable[[WorkflowState], str]
+    fields: Tuple[str, ...]
+    ttl: Optional[float] = 3600.0
+
+
+class NodeCache:
+    """
+    Bounded in-memory LRU cache with TTLs, shared by workflow nodes.
+
+    Entries are namespaced per node and keyed on a SHA-256 digest of the
+    policy key so large prompts/drafts do not bloat the key space.
+
+    Args:
+        max_entries (int): Maximum cached node outputs before evicting the least recently used.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Dict[str, Any]]]" = OrderedDict()
+
+    @staticmethod
+    def _digest(namespace: str, key: str) -> str:
+        """Build a namespaced digest for a cache key."""
+        return f"{namespace}:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+
+    def get(self, namespace: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return cached node output, or None if missing/expired."""
+        digest = self._digest(namespace, key)
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if self._expired(expires_at, time.monotonic()):
+            del self._entries[digest]
+            return None
+
+        self._entries.move_to_end(digest)
+        return value
+
+    @staticmethod
+    def _expired(expires_at: Optional[float], now: float) -> bool:
+        return expires_at is not None and expires_at < now
+
+    def set(self, namespace: str, key: str, value: Dict[str, Any], ttl: Optional[float]):
+        """Store node output with an optional TTL in seconds."""
+        now = time.monotonic()
+        digest = self._digest(namespace, key)
+        self._entries[digest] = (now + ttl if ttl is not None else None, value)
+        self._entries.move_to_end(digest)
+
+        # Reason: entries that are never read again would otherwise stay
+        # until evicted; expired ones at the cold end are dropped first
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if not self._expired(oldest[0], now):
+                break
+            self._entries.popitem(last=False)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached node outputs."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {"cache_size": len(self._entries), "max_entries": self.max_entries}
+
+
+def state_key(*values: Any) -> str:
+    """
+    Serialize state values into a stable cache key.
+
+    Enums collapse to their values and unknown objects fall back to str().
+    """
+    return json.dumps(
+        [getattr(value, "value", value) for value in values],
+        sort_keys=True,
+        default=str
+    )
+
+
+def cached_node(
+    policy: CachePolicy,
+    cache: Optional[NodeCache] = None,
+    emit: Optional[Callable[[str], WorkflowState]] = None
+) -> Callable[[Callable[[WorkflowState], Awaitable[WorkflowState]]], Callable[[WorkflowState], Awaitable[WorkflowState]]]:
+    """
+    Wrap an async node so repeated deterministic inputs skip the LLM/retriever call.
+
+    Args:
+        policy (CachePolicy): Key function, cached output fields and TTL.
+        cache (Optional[NodeCache]): Cache to use; defaults to the shared node_cache.
+        emit (Optional[Callable]): Thinking-state emitter used to record cache hits.
+
+    Returns:
+        Callable: Decorator producing the cached node.
+    """
+    def decorator(node):
+        namespace = node.__name__
+
+        @functools.wraps(node)
+        async def wrapper(state: WorkflowState) -> WorkflowState:
+            store = cache or node_cache
+
+            # Reason: upstream errors short-circuit inside the node itself
+            if state.get("error"):
+                return await node(state)
+
+            key = policy.key(state)
+            cached = store.get(namespace, key)
+            if cached is not None:
+                update = emit(f"Reusing cached {namespace} result") if emit else {}
+                return {**update, **cached}
+
+            result = await node(state)
+            if not result.get("error"):
+                store.set(
+                    namespace,
+                    key,
+                    {field: result[field] for field in policy.fields if field in result},
+                    policy.ttl
+                )
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+# Global node cache instance
+node_cache = NodeCache(max_entries=settings.node_cache_max_entries)
@@ -2,29 +2,36 @@
 LangGraph composition for QaAI workflows.
 
 Following examples/workflow_draft_from_template.graph.py patterns:
-- Deterministic graph: preflight → plan → retrieve → draft → verify → export  
+- Deterministic graph: preflight → (plan ∥ retrieve) → draft → (verify ∥ export)
+- Plan and retrieve share no data dependency, so they run concurrently
 - Proper error handling and retry policies
 - State management with TypedDict
 """
 
 from __future__ import annotations
-from typing import Dict, Any, Optional, Literal
+import asyncio
+import uuid
+from typing import Dict, Any, List, Optional, Literal
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import StreamWriter
 
 from core.models import WorkflowState, JurisdictionType
+from .router import get_model_router
+from .checkpoint import ShardedMemorySaver
 from .nodes import (
     preflight,
-    plan, 
-    retrieve,
+    plan_and_retrieve,
     draft,
-    verify_citations,
-    human_review,
-    export,
+    verify_and_finalize,
     NODE_REGISTRY
 )
 
 
+def should_continue(state: WorkflowState) -> Literal["continue", "end"]:
+    """Conditional logic for error handling."""
+    return "end" if state.get("error") else "continue"
+
+
 class QaAIWorkflowGraph:
     """
     QaAI workflow orchestration using LangGraph.
@@ -35,7 +42,9 @@ class QaAIWorkflowGraph:
     def __init__(self):
         self.graph = None
         self.app = None
-        self.checkpointer = MemorySaver()
+        self.app_with_checkpoint = None
+        self.checkpointer = ShardedMemorySaver()
+        self._model_validation: Optional[Dict[str, Any]] = None
         self._build_graph()
     
     def _build_graph(self):
@@ -45,47 +54,33 @@ class QaAIWorkflowGraph:
         
         # Add nodes (avoid conflicts with state keys)
         self.graph.add_node("preflight", preflight)
-        self.graph.add_node("planner", plan)
-        self.graph.add_node("retriever", retrieve)
+        # Reason: plan (LLM) and retrieve (vector search) both read only the
+        # prompt/jurisdiction, so one node gathers them concurrently
+        self.graph.add_node("planner_retriever", plan_and_retrieve)
         self.graph.add_node("drafter", draft)
-        self.graph.add_node("verifier", verify_citations)
-        self.graph.add_node("reviewer", human_review)
-        self.graph.add_node("exporter", export)
+        # Reason: the review/export payloads are built while the verifier LLM
+        # call is in flight, and share references instead of copying state
+        self.graph.add_node("verifier_finalizer", verify_and_finalize)
         
         # Set entry point
         self.graph.set_entry_point("preflight")
         
-        # Add edges - deterministic flow
-        self.graph.add_edge("preflight", "planner")
-        self.graph.add_edge("planner", "retriever")
-        self.graph.add_edge("retriever", "drafter")
-        self.graph.add_edge("drafter", "verifier")
-        self.graph.add_edge("verifier", "reviewer")
-        self.graph.add_edge("reviewer", "exporter")
-        self.graph.add_edge("exporter", END)
+        # Add edges - deterministic flow; each step either continues or
+        # ends on error, so the conditional edges are the only transitions
+        self.graph.add_edge("verifier_finalizer", END)
         
-        # Add conditional edges for error handling
         self.graph.add_conditional_edges(
             "preflight",
-            self._should_continue,
-            {
-                "continue": "planner",
-                "end": END
-            }
-        )
-        
-        self.graph.add_conditional_edges(
-            "planner",
-            self._should_continue,
+            should_continue,
             {
-                "continue": "retriever", 
+                "continue": "planner_retriever",
                 "end": END
             }
         )
         
         self.graph.add_conditional_edges(
-            "retriever",
-            self._should_continue,
+            "planner_retriever",
+            should_continue,
             {
                 "continue": "drafter",
                 "end": END
@@ -94,39 +89,58 @@ class QaAIWorkflowGraph:
         
         self.graph.add_conditional_edges(
             "drafter",
-            self._should_continue,
+            should_continue,
             {
-                "continue": "verifier",
+                "continue": "verifier_finalizer",
                 "end": END
             }
         )
         
-        self.graph.add_conditional_edges(
-            "verifier",
-            self._should_continue,
-            {
-                "continue": "reviewer",
-                "end": END
-            }
-        )
+        # Compile the graph
+        # Reason: one-shot runs skip per-node checkpoint serialization;
+        # the checkpointed app is only used when a run asks to be resumable
+        self.app = self.graph.compile()
+        self.app_with_checkpoint = self.graph.compile(checkpointer=self.checkpointer)
+    
+    def _models_validated(self) -> bool:
+        """
+        Validate model routing once per graph instead of once per run.
         
-        self.graph.add_conditional_edges(
-            "reviewer",
-            self._should_continue,
-            {
-                "continue": "exporter",
-                "end": END
+        Invalid results are not trusted; preflight re-validates and reports them.
+        """
+        if self._model_validation is None:
+            try:
+                self._model_validation = get_model_router().validate_model_availability()
+            except Exception:
+                return False
+        return self._model_validation["valid"]
+    
+    def _select_app(
+        self,
+        prefix: str,
+        resumable: bool,
+        config: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Pick the compiled app and run configuration for a workflow run.
+        
+        Resumable runs get the checkpointed app and a unique thread_id so
+        concurrent runs never share checkpoint state.
+        """
+        run_config: Dict[str, Any] = {}
+        app = self.app
+        
+        if resumable:
+            app = self.app_with_checkpoint
+            run_config["configurable"] = {
+                "thread_id": f"{prefix}_{uuid.uuid4().hex}",
+                "checkpoint_id": None
             }
-        )
         
-        # Compile the graph
-        self.app = self.graph.compile(checkpointer=self.checkpointer)
-    
-    def _should_continue(self, state: WorkflowState) -> Literal["continue", "end"]:
-        """Conditional logic for error handling."""
-        if state.get("error"):
-            return "end"
-        return "continue"
+        if config:
+            run_config.update(config)
+        
+        return app, run_config
     
     async def run(
         self,
@@ -135,7 +149,8 @@ class QaAIWorkflowGraph:
         template_doc_id: Optional[str] = None,
         reference_doc_ids: Optional[list] = None,
         model_override: Optional[str] = None,
-        config: Optional[Dict[str, Any]] = None
+        config: Optional[Dict[str, Any]] = None,
+        resumable: bool = False
     ) -> Dict[str, Any]:
         """
         Run the complete workflow.
@@ -147,6 +162,7 @@ class QaAIWorkflowGraph:
             reference_doc_ids: Reference document IDs
             model_override: Manual model override
             config: Additional configuration
+            resumable: Checkpoint each node so the run can be resumed
             
         Returns:
             Dict containing final output and metadata
@@ -158,24 +174,16 @@ class QaAIWorkflowGraph:
             "template_doc_id": template_doc_id,
             "reference_doc_ids": reference_doc_ids or [],
             "model_override": model_override,
+            "models_validated": self._models_validated(),
             "thinking": [],
             "citations": []
         }
         
-        # Run configuration
-        run_config = {
-            "configurable": {
-                "thread_id": "qaai_workflow",
-                "checkpoint_id": None
-            }
-        }
-        
-        if config:
-            run_config.update(config)
+        app, run_config = self._select_app("qaai_workflow", resumable, config)
         
         try:
             # Execute workflow
-            result = await self.app.ainvoke(initial_state, run_config)
+            result = await app.ainvoke(initial_state, run_config)
             
             return {
                 "success": True,
@@ -206,6 +214,33 @@ class QaAIWorkflowGraph:
                 }
             }
     
+    async def run_batch(
+        self,
+        prompts: List[str],
+        concurrency: int = 8,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the workflow for several prompts concurrently.
+        
+        Args:
+            prompts: User queries/instructions, one workflow run each
+            concurrency: Maximum number of runs in flight at once
+            **kwargs: Shared run() arguments (jurisdiction, model_override, ...)
+            
+        Returns:
+            List of run() results in the same order as prompts
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _run_one(prompt: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.run(prompt, **kwargs)
+        
+        # Reason: model validation is cached on the graph, so the batch pays it once
+        self._models_validated()
+        return await asyncio.gather(*[_run_one(prompt) for prompt in prompts])
+    
     async def stream_run(
         self,
         prompt: str,
@@ -213,12 +248,15 @@ class QaAIWorkflowGraph:
         template_doc_id: Optional[str] = None,
         reference_doc_ids: Optional[list] = None,
         model_override: Optional[str] = None,
-        config: Optional[Dict[str, Any]] = None
+        config: Optional[Dict[str, Any]] = None,
+        resumable: bool = False
     ):
         """
         Stream workflow execution with thinking states.
         
-        Yields thinking states and progress updates as they occur.
+        Yields thinking states and progress updates as they occur. Draft
+        tokens are forwarded from the "custom" stream as soon as the model
+        produces them, rather than after the drafter node returns.
         """
         # Prepare initial state
         initial_state: WorkflowState = {
@@ -227,69 +265,75 @@ class QaAIWorkflowGraph:
             "template_doc_id": template_doc_id,
             "reference_doc_ids": reference_doc_ids or [],
             "model_override": model_override,
+            "models_validated": self._models_validated(),
             "thinking": [],
             "citations": []
         }
         
-        # Run configuration
-        run_config = {
-            "configurable": {
-                "thread_id": f"qaai_stream_{id(initial_state)}",
-                "checkpoint_id": None
-            }
-        }
-        
-        if config:
-            run_config.update(config)
+        app, run_config = self._select_app("qaai_stream", resumable, config)
+        final_draft = None
         
         try:
-            # Stream workflow execution
-            async for event in self.app.astream(initial_state, run_config):
+            # Reason: "updates" yields each node's returned delta as-is (no
+            # full-state snapshots), which is lighter than astream_events'
+            # per-runnable callback events for the same information
+            async for mode, event in app.astream(
+                initial_state,
+                run_config,
+                stream_mode=["updates", "custom"]
+            ):
+                # Forward draft tokens written by the drafter node
+                if mode == "custom":
+                    if event.get("type") == "draft_progress":
+                        yield {
+                            "type": "draft_progress",
+                            "node": "drafter",
+                            "delta": event.get("delta", ""),
+                            "complete": False
+                        }
+                    continue
+                
                 # Extract thinking states and progress
                 for node_name, node_output in event.items():
-                    if isinstance(node_output, dict):
-                        # Emit thinking states
-                        thinking_states = node_output.get("thinking", [])
-                        if thinking_states:
-                            # Get new thinking states since last emission
-                            for thinking_state in thinking_states[-1:]:  # Just the latest
-                                yield {
-                                    "type": "thinking_state",
-                                    "node": node_name,
-                                    "label": thinking_state,
-                                    "timestamp": None
-                                }
-                        
-                        # Emit progress updates
-                        if node_name == "draft" and "draft" in node_output:
-                            yield {
-                                "type": "draft_progress",
-                                "node": node_name,
-                                "content": node_output["draft"][:200] + "...",
-                                "complete": False
-                            }
-                        
-                        # Emit citations when available
-                        if "citations" in node_output and node_output["citations"]:
-                            for citation in node_output["citations"]:
-                                yield {
-                                    "type": "citation",
-                                    "citation": citation
-                                }
-                        
-                        # Emit errors
-                        if "error" in node_output and node_output["error"]:
-                            yield {
-                                "type": "error",
-                                "node": node_name,
-                                "error": node_output["error"]
-                            }
-                            return
+                    if not isinstance(node_output, dict):
+                        continue
+                    
+                    # Emit thinking states
+                    # Node outputs carry only their new thinking entries
+                    for thinking_state in node_output.get("thinking") or []:
+                        yield {
+                            "type": "thinking_state",
+                            "node": node_name,
+                            "label": thinking_state,
+                            "timestamp": None
+                        }
+                    
+                    # Emit citations when available (only retrieve writes them)
+                    for citation in node_output.get("citations") or []:
+                        yield {
+                            "type": "citation",
+                            "citation": citation
+                        }
+                    
+                    # Keep the drafter's full output (tokens plus disclaimer)
+                    if node_output.get("draft"):
+                        final_draft = node_output["draft"]
+                    
+                    # Emit errors
+                    error = node_output.get("error")
+                    if error:
+                        yield {
+                            "type": "error",
+                            "node": node_name,
+                            "error": error
+                        }
+                        return
             
             # Final completion event
             yield {
                 "type": "done",
-                "message": "Workflow completed successfully"
+                "message": "Workflow completed successfully",
+                "draft": final_draft
             }
             
         except Exception as e:
@@ -327,12 +371,13 @@ class QaAIWorkflowGraph:
         edge_list = [
             ("start", "preflight"),
             ("preflight", "plan"),
-            ("plan", "retrieve"),
+            ("preflight", "retrieve"),
+            ("plan", "draft"),
             ("retrieve", "draft"),
             ("draft", "verify_citations"),
-            ("verify_citations", "human_review"),
-            ("human_review", "export"),
-            ("export", "end")
+            ("draft", "finalize"),
+            ("verify_citations", "end"),
+            ("finalize", "end")
         ]
         
         for source, target in edge_list:
@@ -364,18 +409,31 @@ class SimpleAssistantGraph:
     
     def _build_simple_graph(self):
         """Build simplified assistant graph."""
-        from .nodes import retrieve, draft as draft_node
+        from .nodes import retrieve, draft as draft_node, emit, needs_retrieval
         
-        async def simple_assistant(state: WorkflowState) -> WorkflowState:
+        async def simple_assistant(state: WorkflowState, writer: StreamWriter) -> WorkflowState:
             """Combined node for simple assistant operations."""
-            # Get retrieval context
-            retrieval_state = await retrieve(state)
-            if retrieval_state.get("error"):
-                return retrieval_state
+            # Get retrieval context, skipping the search for greetings and test pings
+            if needs_retrieval(state["prompt"]):
+                retrieval_state = await retrieve(state)
+                if retrieval_state.get("error"):
+                    return retrieval_state
+            else:
+                retrieval_state = {
+                    **emit("Skipping retrieval for general query"),
+                    "retrieved_context": [],
+                    "citations": []
+                }
             
             # Generate response
-            draft_state = await draft_node(retrieval_state)
-            return draft_state
+            # Reason: nodes return only their deltas, so feed draft the merged view
+            draft_state = await draft_node({**state, **retrieval_state}, writer)
+            
+            return {
+                **retrieval_state,
+                **draft_state,
+                "thinking": retrieval_state.get("thinking", []) + draft_state.get("thinking", [])
+            }
         
         # Create simple graph
         self.graph = StateGraph(WorkflowState)
@@ -5,7 +5,8 @@ Following examples/workflow_draft_from_template.graph.py patterns:
 - Use emit() pattern for thinking states
 - Per-step model routing (reasoning vs drafting vs verification)
 - DIFC-first retrieval with jurisdiction boosting
-- Return state updates, not modify in place
+- Return only state deltas; reducers merge them into the graph state
+- Deterministic LLM/retrieval nodes are cached per key (see agents/cache.py)
 """
 
 from __future__ import annotations
@@ -13,25 +14,63 @@ import asyncio
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from langgraph.types import StreamWriter
+
 from core.models import WorkflowState, JurisdictionType, Citation
-from rag.retrievers import difc_retriever, RetrievalContext
+from rag.retrievers import get_difc_retriever, RetrievalContext
 from services.openai_client import openai_client
 from services.anthropic_client import anthropic_client
-from agents.router import model_router, ModelProvider
-from agents.prompts import DIFCPrompts, get_disclaimer_for_topic
+from agents.router import get_model_router, ModelProvider
+from agents.prompts import (
+    get_planner_prompt,
+    get_drafter_prompt,
+    get_verifier_prompt,
+    get_disclaimer_for_topic
+)
+from agents.cache import CachePolicy, cached_node, state_key
+
+# Retrieved context kept in state: only what the drafter prompt consumes
+MAX_CONTEXT_DOCS = 5
+MAX_CONTEXT_CHARS = 500
+
+# Terms that mark a prompt as a legal question worth a DIFC source search
+LEGAL_VOCAB = frozenset({
+    "difc", "dfsa", "uae", "dubai", "law", "laws", "legal", "regulation", "regulations",
+    "rule", "rules", "rulebook", "court", "courts", "contract", "contracts", "agreement",
+    "clause", "article", "section", "employment", "employer", "employee", "notice",
+    "termination", "liability", "data", "protection", "company", "companies", "license",
+    "licence", "compliance", "dispute", "arbitration", "lease", "trust", "insolvency"
+})
 
 
-def emit(state: WorkflowState, label: str) -> WorkflowState:
+def emit(label: str, update: Optional[WorkflowState] = None) -> WorkflowState:
     """
     Emit thinking state following examples pattern.
     
-    Critical: Returns state updates, doesn't modify in place.
+    Critical: Returns only the delta for the `thinking` reducer channel
+    (operator.add), never a copy of the full state or thinking list.
+    Pass an existing update to append further entries to it.
     """
-    thinking = state.get("thinking", [])
-    thinking_updated = thinking.copy()
-    thinking_updated.append(f"[{datetime.now().strftime('%H:%M:%S')}] {label}")
+    entry = f"[{datetime.now().strftime('%H:%M:%S')}] {label}"
+    
+    if update is None:
+        return {"thinking": [entry]}
+    
+    update.setdefault("thinking", []).append(entry)
+    return update
+
+
+def routed_model(state: WorkflowState, role: str, resolve) -> tuple:
+    """
+    Get the model for a role, preferring the routing resolved in preflight.
     
-    return {**state, "thinking": thinking_updated}
+    Falls back to resolve() (a ModelRouter getter) when the state has no
+    routing for the role, e.g. when a node runs outside the graph.
+    """
+    model_name = state.get("model_routing", {}).get(role)
+    if model_name:
+        return model_name, get_model_router().MODEL_PROVIDERS.get(model_name, ModelProvider.OPENAI)
+    return resolve()
 
 
 async def preflight(state: WorkflowState) -> WorkflowState:
@@ -40,52 +79,67 @@ async def preflight(state: WorkflowState) -> WorkflowState:
     
     Following examples/workflow_draft_from_template.graph.py pattern.
     """
-    state = emit(state, "Validating workflow inputs")
+    update = emit("Validating workflow inputs")
     
     # Check required inputs
     if not state.get("prompt"):
-        return {**state, "error": "Missing user prompt"}
+        return {**update, "error": "Missing user prompt"}
     
     # Set defaults
     if "jurisdiction" not in state:
-        state = {**state, "jurisdiction": JurisdictionType.DIFC}
-    
-    if "thinking" not in state:
-        state = {**state, "thinking": []}
+        update["jurisdiction"] = JurisdictionType.DIFC
     
     if "citations" not in state:
-        state = {**state, "citations": []}
+        update["citations"] = []
     
-    # Validate model routing
+    # Validate model routing (skipped when the graph already validated it)
     try:
-        validation = model_router.validate_model_availability()
-        if not validation["valid"]:
-            return {**state, "error": f"Model availability issues: {validation['issues']}"}
+        if not state.get("models_validated"):
+            validation = get_model_router().validate_model_availability()
+            if not validation["valid"]:
+                return {**update, "error": f"Model availability issues: {validation['issues']}"}
+        
+        # Reason: resolve routing once; the drafter entry depends on context length
+        update["model_routing"] = {
+            "planner": get_model_router().get_planner_model()[0],
+            "verifier": get_model_router().get_verifier_model()[0]
+        }
     except Exception as e:
-        return {**state, "error": f"Model routing error: {str(e)}"}
+        return {**update, "error": f"Model routing error: {str(e)}"}
     
-    state = emit(state, "Preflight validation completed")
-    return state
+    emit("Preflight validation completed", update)
+    return update
 
 
+@cached_node(CachePolicy(
+    key=lambda s: state_key(
+        s.get("prompt"),
+        s.get("jurisdiction"),
+        s.get("template_doc_id"),
+        s.get("reference_doc_ids", []),
+        s.get("model_override")
+    ),
+    fields=("plan",),
+    ttl=3600
+), emit=emit)
 async def plan(state: WorkflowState) -> WorkflowState:
     """
     Create research and drafting plan using reasoning model.
     
     Uses o1 or similar reasoning model for complex analysis.
     """
-    state = emit(state, "Creating workflow plan")
+    update = emit("Creating workflow plan")
     
     if state.get("error"):
-        return state
+        return update
     
     try:
         # Get planning model
-        model_name, provider = model_router.get_planner_model()
-        state = emit(state, f"Using {model_name} for planning")
+        model_name, provider = routed_model(state, "planner", get_model_router().get_planner_model)
+        emit(f"Using {model_name} for planning", update)
         
         # Generate planning prompt
-        prompt = DIFCPrompts.get_planner_prompt(
+        prompt = get_planner_prompt(
             query=state["prompt"],
             jurisdiction=state.get("jurisdiction", JurisdictionType.DIFC),
             context={
@@ -112,27 +166,39 @@ async def plan(state: WorkflowState) -> WorkflowState:
             )
         
         if not plan_response or not plan_response.get("content"):
-            return {**state, "error": "Failed to generate plan"}
+            return {**update, "error": "Failed to generate plan"}
         
         plan_content = plan_response["content"]
-        state = emit(state, "Plan generation completed")
+        emit("Plan generation completed", update)
         
-        return {**state, "plan": plan_content}
+        return {**update, "plan": plan_content}
         
     except Exception as e:
-        return {**state, "error": f"Planning error: {str(e)}"}
+        return {**update, "error": f"Planning error: {str(e)}"}
 
 
+@cached_node(CachePolicy(
+    # Reason: the store generation changes on every write, so newly ingested
+    # documents are visible immediately instead of after the TTL
+    key=lambda s: state_key(
+        s.get("prompt"),
+        s.get("jurisdiction"),
+        s.get("reference_doc_ids", []),
+        get_difc_retriever().vector_store.generation
+    ),
+    fields=("retrieved_context", "citations"),
+    ttl=3600
+), emit=emit)
 async def retrieve(state: WorkflowState) -> WorkflowState:
     """
     Retrieve relevant context using DIFC-first approach.
     
     Implements jurisdiction boosting and citation verification.
     """
-    state = emit(state, "Retrieving DIFC sources and context")
+    update = emit("Retrieving DIFC sources and context")
     
     if state.get("error"):
-        return state
+        return update
     
     try:
         # Create retrieval context
@@ -146,16 +212,18 @@ async def retrieve(state: WorkflowState) -> WorkflowState:
         )
         
         # Perform retrieval with citations
-        matches, citations = await difc_retriever.retrieve_with_citations(retrieval_context)
+        matches, citations = await get_difc_retriever().retrieve_with_citations(retrieval_context)
         
-        state = emit(state, f"Retrieved {len(matches)} relevant documents")
+        emit(f"Retrieved {len(matches)} relevant documents", update)
         
         # Format retrieved context
+        # Reason: trim to what draft uses so state, cache entries and stream
+        # events never carry full chunk bodies
         retrieved_docs = []
-        for match in matches:
+        for match in matches[:MAX_CONTEXT_DOCS]:
             doc_info = {
                 "title": match.chunk.metadata.get("title", "Unknown") if match.chunk.metadata else "Unknown",
-                "content": match.chunk.content,
+                "content": match.chunk.content[:MAX_CONTEXT_CHARS],
                 "score": match.score,
                 "jurisdiction": match.chunk.metadata.get("jurisdiction") if match.chunk.metadata else "Unknown",
                 "instrument_type": match.chunk.metadata.get("instrument_type") if match.chunk.metadata else "Unknown",
@@ -163,103 +231,152 @@ async def retrieve(state: WorkflowState) -> WorkflowState:
             }
             retrieved_docs.append(doc_info)
         
-        state = emit(state, f"Generated {len(citations)} verified citations")
+        emit(f"Generated {len(citations)} verified citations", update)
         
         return {
-            **state,
+            **update,
             "retrieved_context": retrieved_docs,
-            "citations": [citation.dict() if hasattr(citation, 'dict') else citation for citation in citations]
+            "citations": [citation.model_dump() for citation in citations]
         }
         
     except Exception as e:
-        return {**state, "error": f"Retrieval error: {str(e)}"}
+        return {**update, "error": f"Retrieval error: {str(e)}"}
+
+
+def needs_retrieval(prompt: str) -> bool:
+    """
+    Cheap gate for the DIFC source search.
+    
+    Only short prompts with no legal vocabulary ("hello", "test") skip
+    retrieval; anything longer or mentioning a legal term is searched.
+    """
+    tokens = [token.strip("?!.,;:'\"()") for token in prompt.lower().split()]
+    if any(token in LEGAL_VOCAB for token in tokens):
+        return True
+    return len(tokens) >= 3
+
+
+async def plan_and_retrieve(state: WorkflowState) -> WorkflowState:
+    """
+    Run planning and retrieval concurrently.
+    
+    Both steps consume only the prompt and jurisdiction, so the LLM plan
+    call and the vector search are scheduled together and merged before
+    drafting. Latency becomes max(plan, retrieve) instead of the sum.
+    """
+    if state.get("error"):
+        return {}
+    
+    plan_state, retrieve_state = await asyncio.gather(plan(state), retrieve(state))
+    
+    # Reason: each branch returns only its own thinking delta, so both are
+    # concatenated (plan first, then retrieve) for the reducer channel.
+    thinking = plan_state.get("thinking", []) + retrieve_state.get("thinking", [])
+    
+    merged = {**plan_state, **retrieve_state, "thinking": thinking}
+    
+    error = plan_state.get("error") or retrieve_state.get("error")
+    if error:
+        merged["error"] = error
+    
+    return merged
 
 
-async def draft(state: WorkflowState) -> WorkflowState:
+async def draft(state: WorkflowState, writer: Optional[StreamWriter] = None) -> WorkflowState:
     """
     Generate draft content using generation model.
     
-    Uses gpt-4.1 or claude-3.7-sonnet for content creation.
+    Uses gpt-4.1 or claude-3.7-sonnet for content creation. Tokens are
+    streamed as they arrive through LangGraph's injected custom stream
+    writer as {"type": "draft_progress", "delta": ...} events.
     """
-    state = emit(state, "Drafting content with DIFC legal analysis")
+    update = emit("Drafting content with DIFC legal analysis")
     
     if state.get("error"):
-        return state
+        return update
     
     try:
         # Estimate context length for model selection
         context_length = len(str(state.get("plan", ""))) + len(str(state.get("retrieved_context", [])))
         
         # Get drafting model
-        model_name, provider = model_router.get_drafter_model(context_length)
-        state = emit(state, f"Using {model_name} for drafting")
+        model_name, provider = get_model_router().get_drafter_model(context_length)
+        update["model_routing"] = {**state.get("model_routing", {}), "drafter": model_name}
+        emit(f"Using {model_name} for drafting", update)
         
         # Format retrieved context for prompt
         context_text = ""
         if state.get("retrieved_context"):
             context_text = "\\n\\n".join([
-                f"**{doc['title']}** (Score: {doc['score']:.3f})\\n{doc['content'][:500]}..."
-                for doc in state["retrieved_context"][:5]  # Limit context
+                f"**{doc['title']}** (Score: {doc['score']:.3f})\\n{doc['content']}..."
+                for doc in state["retrieved_context"]  # Already trimmed by retrieve
             ])
         
         # Generate drafting prompt
-        prompt = DIFCPrompts.get_drafter_prompt(
+        prompt = get_drafter_prompt(
             plan=state.get("plan", "No plan provided"),
             retrieved_context=context_text,
             jurisdiction=state.get("jurisdiction", JurisdictionType.DIFC)
         )
         
-        # Call appropriate model
-        if provider == ModelProvider.OPENAI:
-            draft_response = await openai_client.complete(
-                model=model_name,
-                prompt=prompt,
-                max_tokens=4000,
-                temperature=0.2
-            )
-        else:
-            draft_response = await anthropic_client.complete(
-                model=model_name,
-                prompt=prompt,
-                max_tokens=4000,
-                temperature=0.2
-            )
+        # Stream from the appropriate model
+        client = openai_client if provider == ModelProvider.OPENAI else anthropic_client
+        draft_chunks = []
         
-        if not draft_response or not draft_response.get("content"):
-            return {**state, "error": "Failed to generate draft"}
+        async for event in client.stream_complete(
+            model=model_name,
+            prompt=prompt,
+            max_tokens=4000,
+            temperature=0.2
+        ):
+            if event["type"] == "error":
+                return {**update, "error": event["content"]}
+            
+            if event["type"] == "chunk" and event["content"]:
+                draft_chunks.append(event["content"])
+                if writer:
+                    writer({"type": "draft_progress", "delta": event["content"]})
         
-        draft_content = draft_response["content"]
+        draft_content = "".join(draft_chunks)
+        
+        if not draft_content:
+            return {**update, "error": "Failed to generate draft"}
         
         # Add appropriate legal disclaimer
         disclaimer = get_disclaimer_for_topic(state["prompt"])
         draft_with_disclaimer = f"{draft_content}\\n\\n{disclaimer}"
         
-        state = emit(state, "Draft generation completed")
+        emit("Draft generation completed", update)
         
-        return {**state, "draft": draft_with_disclaimer}
+        return {**update, "draft": draft_with_disclaimer}
         
     except Exception as e:
-        return {**state, "error": f"Drafting error: {str(e)}"}
+        return {**update, "error": f"Drafting error: {str(e)}"}
 
 
+@cached_node(CachePolicy(
+    key=lambda s: state_key(s.get("draft"), s.get("citations", [])),
+    fields=("verification_result", "verification_passed"),
+    ttl=3600
+), emit=emit)
 async def verify_citations(state: WorkflowState) -> WorkflowState:
     """
     Verify citations and content accuracy using verification model.
     
     Uses claude-3.7-sonnet for detailed verification.
     """
-    state = emit(state, "Verifying citations and content accuracy")
+    update = emit("Verifying citations and content accuracy")
     
     if state.get("error"):
-        return state
+        return update
     
     try:
         # Get verification model
-        model_name, provider = model_router.get_verifier_model()
-        state = emit(state, f"Using {model_name} for verification")
+        model_name, provider = routed_model(state, "verifier", get_model_router().get_verifier_model)
+        emit(f"Using {model_name} for verification", update)
         
         # Generate verification prompt
-        prompt = DIFCPrompts.get_verifier_prompt(
+        prompt = get_verifier_prompt(
             draft_content=state.get("draft", ""),
             citations=state.get("citations", [])
         )
@@ -281,7 +398,7 @@ async def verify_citations(state: WorkflowState) -> WorkflowState:
             )
         
         if not verify_response or not verify_response.get("content"):
-            return {**state, "error": "Failed to verify content"}
+            return {**update, "error": "Failed to verify content"}
         
         verification_result = verify_response["content"]
         
@@ -289,49 +406,140 @@ async def verify_citations(state: WorkflowState) -> WorkflowState:
         verification_passed = "approved" in verification_result.lower() or "verified" in verification_result.lower()
         
         if verification_passed:
-            state = emit(state, "Citation verification passed")
+            emit("Citation verification passed", update)
         else:
-            state = emit(state, "Citation verification flagged issues")
+            emit("Citation verification flagged issues", update)
             # In production, this could trigger revision loop
         
         return {
-            **state,
+            **update,
             "verification_result": verification_result,
             "verification_passed": verification_passed
         }
         
     except Exception as e:
-        return {**state, "error": f"Verification error: {str(e)}"}
+        return {**update, "error": f"Verification error: {str(e)}"}
 
 
-async def human_review(state: WorkflowState) -> WorkflowState:
+def _model_info(state: WorkflowState) -> Dict[str, str]:
+    """Summarize the models used by this run for review/export metadata."""
+    return {
+        "planner": routed_model(state, "planner", get_model_router().get_planner_model)[0],
+        "drafter": routed_model(state, "drafter", get_model_router().get_drafter_model)[0],
+        "verifier": routed_model(state, "verifier", get_model_router().get_verifier_model)[0]
+    }
+
+
+def _final_payload(state: WorkflowState) -> tuple:
     """
-    Prepare content for human review.
+    Build the reviewer and export payloads in one pass.
     
-    Formats output and provides review metadata.
+    The export package shares references (draft, citations, thinking,
+    model info) with the review payload rather than copying them.
     """
-    state = emit(state, "Preparing content for review")
+    draft_content = state.get("draft", "")
+    citations = state.get("citations", [])
+    thinking = state.get("thinking", [])
+    verification_passed = state.get("verification_passed", False)
+    model_info = _model_info(state)
+    jurisdiction = state.get("jurisdiction", JurisdictionType.DIFC)
+    jurisdiction = jurisdiction.value if hasattr(jurisdiction, 'value') else str(jurisdiction)
     
-    # Compile final output
     final_output = {
-        "draft": state.get("draft", ""),
+        "draft": draft_content,
         "plan": state.get("plan", ""),
-        "citations": state.get("citations", []),
+        "citations": citations,
         "verification_result": state.get("verification_result", ""),
-        "verification_passed": state.get("verification_passed", False),
+        "verification_passed": verification_passed,
         "retrieved_context_count": len(state.get("retrieved_context", [])),
-        "model_info": {
-            "planner": model_router.get_planner_model()[0],
-            "drafter": model_router.get_drafter_model()[0],
-            "verifier": model_router.get_verifier_model()[0]
+        "model_info": model_info,
+        "thinking_states": thinking,
+        "jurisdiction": jurisdiction
+    }
+    
+    export_data = {
+        "content": draft_content,
+        "metadata": {
+            "prompt": state.get("prompt", ""),
+            "jurisdiction": jurisdiction,
+            "citations_count": len(citations),
+            "verification_passed": verification_passed,
+            "generated_at": datetime.now().isoformat(),
+            "models_used": model_info
         },
-        "thinking_states": state.get("thinking", []),
-        "jurisdiction": state.get("jurisdiction", JurisdictionType.DIFC).value if hasattr(state.get("jurisdiction"), 'value') else str(state.get("jurisdiction", "DIFC"))
+        "citations": citations,
+        "thinking_states": thinking
+    }
+    
+    return final_output, export_data
+
+
+async def finalize(state: WorkflowState) -> WorkflowState:
+    """
+    Prepare content for human review and export in a single step.
+    
+    Replaces the separate human_review → export hop in the workflow graph.
+    """
+    update = emit("Preparing content for review and export")
+    
+    if state.get("error"):
+        return update
+    
+    final_output, export_data = _final_payload(state)
+    
+    emit("Export completed", update)
+    
+    return {**update, "final_output": final_output, "export_data": export_data}
+
+
+async def verify_and_finalize(state: WorkflowState) -> WorkflowState:
+    """
+    Verify citations while the review/export payloads are being prepared.
+    
+    The payloads depend on everything except the verification outcome, so
+    they are built alongside the verifier LLM call and patched afterwards.
+    """
+    verify_task = asyncio.create_task(verify_citations(state))
+    
+    update = emit("Preparing content for review and export")
+    final_output, export_data = _final_payload(state)
+    
+    verify_update = await verify_task
+    
+    # Reason: verifier thinking first, matching the old verify → finalize order
+    update["thinking"] = verify_update.get("thinking", []) + update["thinking"]
+    
+    if state.get("error") or verify_update.get("error"):
+        return {**verify_update, **update}
+    
+    verification_passed = verify_update.get("verification_passed", False)
+    final_output["verification_result"] = verify_update.get("verification_result", "")
+    final_output["verification_passed"] = verification_passed
+    export_data["metadata"]["verification_passed"] = verification_passed
+    
+    emit("Export completed", update)
+    
+    return {
+        **verify_update,
+        **update,
+        "final_output": final_output,
+        "export_data": export_data
     }
+
+
+async def human_review(state: WorkflowState) -> WorkflowState:
+    """
+    Prepare content for human review.
     
-    state = emit(state, "Content prepared for human review")
+    Formats output and provides review metadata.
+    """
+    update = emit("Preparing content for review")
+    
+    final_output, _ = _final_payload(state)
     
-    return {**state, "final_output": final_output}
+    emit("Content prepared for human review", update)
+    
+    return {**update, "final_output": final_output}
 
 
 async def export(state: WorkflowState) -> WorkflowState:
@@ -340,33 +548,16 @@ async def export(state: WorkflowState) -> WorkflowState:
     
     Handles different output formats and metadata.
     """
-    state = emit(state, "Exporting final content")
+    update = emit("Exporting final content")
     
     if state.get("error"):
-        return state
+        return update
     
-    # Create export package
-    export_data = {
-        "content": state.get("draft", ""),
-        "metadata": {
-            "prompt": state.get("prompt", ""),
-            "jurisdiction": state.get("jurisdiction", JurisdictionType.DIFC).value if hasattr(state.get("jurisdiction"), 'value') else str(state.get("jurisdiction", "DIFC")),
-            "citations_count": len(state.get("citations", [])),
-            "verification_passed": state.get("verification_passed", False),
-            "generated_at": datetime.now().isoformat(),
-            "models_used": {
-                "planner": model_router.get_planner_model()[0],
-                "drafter": model_router.get_drafter_model()[0], 
-                "verifier": model_router.get_verifier_model()[0]
-            }
-        },
-        "citations": state.get("citations", []),
-        "thinking_states": state.get("thinking", [])
-    }
+    _, export_data = _final_payload(state)
     
-    state = emit(state, "Export completed")
+    emit("Export completed", update)
     
-    return {**state, "export_data": export_data}
+    return {**update, "export_data": export_data}
 
 
 # Node registry for dynamic workflow construction
@@ -374,8 +565,11 @@ NODE_REGISTRY = {
     "preflight": preflight,
     "plan": plan,
     "retrieve": retrieve,
+    "plan_and_retrieve": plan_and_retrieve,
     "draft": draft,
     "verify_citations": verify_citations,
+    "finalize": finalize,
+    "verify_and_finalize": verify_and_finalize,
     "human_review": human_review,
     "export": export
 }
\ No newline at end of file
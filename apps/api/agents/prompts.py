@@ -5,18 +5,21 @@ Following PRP requirements:
 - DIFC-first prompts with legal disclaimers
 - Templates for planner, drafter, verifier roles
 - Non-legal-advice disclaimers in all outputs
+- Builders are plain module functions over precomputed constants;
+  DIFCPrompts remains as a namespace for existing callers
 """
 
 from __future__ import annotations
+import re
 from typing import Dict, Any, Optional
 from core.models import JurisdictionType, InstrumentType
 
+# Jurisdiction -> prompt label, resolved once instead of per prompt build
+_JURIS_STR = {jurisdiction: jurisdiction.value for jurisdiction in JurisdictionType}
 
-class DIFCPrompts:
-    """DIFC-focused prompt templates for legal AI workflows."""
-    
-    # Base system prompt with legal disclaimers
-    SYSTEM_BASE = """You are a legal AI assistant specializing in DIFC (Dubai International Financial Centre) law and regulations. You provide information and analysis to support legal professionals.
+
+# Base system prompt with legal disclaimers
+SYSTEM_BASE = """You are a legal AI assistant specializing in DIFC (Dubai International Financial Centre) law and regulations. You provide information and analysis to support legal professionals.
 
 CRITICAL DISCLAIMERS:
 - This is NOT legal advice and should NOT be relied upon as such
@@ -37,8 +40,8 @@ CITATION REQUIREMENTS:
 - Use format: [Document Title, Section X.Y, Jurisdiction]
 """
 
-    # Planner role prompt (for o1/reasoning models)
-    PLANNER_PROMPT = """You are a legal workflow planner specializing in DIFC law.
+# Planner role prompt (for o1/reasoning models)
+PLANNER_PROMPT = """You are a legal workflow planner specializing in DIFC law.
 
 Your role is to:
 1. Analyze the user's request and identify key legal issues
@@ -63,8 +66,8 @@ Provide a numbered plan with:
 Remember: This is planning for informational content, not legal advice.
 """
 
-    # Drafter role prompt (for gpt-4.1/generation models)
-    DRAFTER_PROMPT = """You are a legal content drafter specializing in DIFC law.
+# Drafter role prompt (for gpt-4.1/generation models)
+DRAFTER_PROMPT = """You are a legal content drafter specializing in DIFC law.
 
 Your role is to:
 1. Create well-structured legal content based on the plan
@@ -93,8 +96,8 @@ DIFC-FIRST APPROACH:
 Always conclude with: "This information is provided for educational purposes only and does not constitute legal advice. Consult qualified legal counsel for specific matters."
 """
 
-    # Verifier role prompt (for claude-3.7-sonnet/verification models)
-    VERIFIER_PROMPT = """You are a legal content verifier specializing in DIFC law and citation accuracy.
+# Verifier role prompt (for claude-3.7-sonnet/verification models)
+VERIFIER_PROMPT = """You are a legal content verifier specializing in DIFC law and citation accuracy.
 
 Your role is to:
 1. Verify all citations are accurate and current
@@ -126,98 +129,8 @@ FLAG FOR REVISION:
 OUTPUT: Provide verification status and specific recommendations for any issues found.
 """
 
-    @classmethod
-    def get_planner_prompt(
-        cls,
-        query: str,
-        jurisdiction: JurisdictionType = JurisdictionType.DIFC,
-        context: Optional[Dict[str, Any]] = None
-    ) -> str:
-        """Generate planner prompt with query context."""
-        base_prompt = f"{cls.SYSTEM_BASE}\n\n{cls.PLANNER_PROMPT}"
-        
-        query_section = f"""
-USER QUERY: {query}
-
-PRIMARY JURISDICTION: {jurisdiction.value}
-
-CONTEXT: {context if context else 'No additional context provided'}
-
-Create a comprehensive plan for addressing this query with DIFC-first legal research and analysis.
-"""
-        
-        return base_prompt + query_section
-
-    @classmethod
-    def get_drafter_prompt(
-        cls,
-        plan: str,
-        retrieved_context: Optional[str] = None,
-        jurisdiction: JurisdictionType = JurisdictionType.DIFC
-    ) -> str:
-        """Generate drafter prompt with plan and context."""
-        base_prompt = f"{cls.SYSTEM_BASE}\n\n{cls.DRAFTER_PROMPT}"
-        
-        drafting_section = f"""
-APPROVED PLAN:
-{plan}
-
-PRIMARY JURISDICTION: {jurisdiction.value}
-
-RETRIEVED CONTEXT:
-{retrieved_context if retrieved_context else 'No additional context retrieved'}
-
-Draft comprehensive content following the plan, with proper DIFC citations and legal disclaimers.
-"""
-        
-        return base_prompt + drafting_section
-
-    @classmethod
-    def get_verifier_prompt(
-        cls,
-        draft_content: str,
-        citations: Optional[list] = None
-    ) -> str:
-        """Generate verifier prompt with draft content."""
-        base_prompt = f"{cls.SYSTEM_BASE}\n\n{cls.VERIFIER_PROMPT}"
-        
-        verification_section = f"""
-CONTENT TO VERIFY:
-{draft_content}
-
-CITATIONS TO VERIFY:
-{str(citations) if citations else 'No citations provided separately'}
-
-Perform comprehensive verification and provide recommendations for improvement.
-"""
-        
-        return base_prompt + verification_section
-
-    @classmethod
-    def get_assistant_prompt(
-        cls,
-        mode: str,
-        query: str,
-        context: Optional[Dict[str, Any]] = None
-    ) -> str:
-        """Generate assistant prompt for direct query handling."""
-        if mode == "assist":
-            return cls._get_assist_mode_prompt(query, context)
-        elif mode == "draft":
-            return cls._get_draft_mode_prompt(query, context)
-        else:
-            return cls._get_assist_mode_prompt(query, context)
-
-    @classmethod
-    def _get_assist_mode_prompt(
-        cls,
-        query: str,
-        context: Optional[Dict[str, Any]] = None
-    ) -> str:
-        """Assist mode: quick answers, summaries, comparisons."""
-        return f"""{cls.SYSTEM_BASE}
-
-You are in ASSIST mode - provide quick, accurate answers with proper citations.
+# Mode guidelines for direct assistant queries
+ASSIST_MODE_PROMPT = """You are in ASSIST mode - provide quick, accurate answers with proper citations.
 
 ASSIST MODE GUIDELINES:
 - Provide concise but comprehensive responses
@@ -225,24 +138,9 @@ ASSIST MODE GUIDELINES:
 - Use bullet points or numbered lists for clarity  
 - Compare different legal provisions when applicable
 - Always include legal disclaimers
-
-USER QUERY: {query}
-
-CONTEXT: {context if context else 'No additional context provided'}
-
-Provide a helpful response focusing on DIFC law with proper citations and disclaimers.
 """
 
-    @classmethod
-    def _get_draft_mode_prompt(
-        cls,
-        query: str,
-        context: Optional[Dict[str, Any]] = None
-    ) -> str:
-        """Draft mode: structured outputs for documents."""
-        return f"""{cls.SYSTEM_BASE}
-
-You are in DRAFT mode - create structured documents with formal legal analysis.
+DRAFT_MODE_PROMPT = """You are in DRAFT mode - create structured documents with formal legal analysis.
 
 DRAFT MODE GUIDELINES:
 - Provide comprehensive, well-structured content
@@ -251,13 +149,124 @@ DRAFT MODE GUIDELINES:
 - Provide thorough analysis with practical implications
 - Structure with clear headings and sections
 - Include executive summary where appropriate
+"""
 
-USER QUERY: {query}
+# Reason: the static system + role preambles are joined once at import
+# instead of on every node invocation; only the query section is per-call
+PLANNER_BASE = f"{SYSTEM_BASE}\n\n{PLANNER_PROMPT}"
+DRAFTER_BASE = f"{SYSTEM_BASE}\n\n{DRAFTER_PROMPT}"
+VERIFIER_BASE = f"{SYSTEM_BASE}\n\n{VERIFIER_PROMPT}"
+ASSIST_MODE_BASE = f"{SYSTEM_BASE}\n\n{ASSIST_MODE_PROMPT}"
+DRAFT_MODE_BASE = f"{SYSTEM_BASE}\n\n{DRAFT_MODE_PROMPT}"
+
+
+def get_planner_prompt(
+    query: str,
+    jurisdiction: JurisdictionType = JurisdictionType.DIFC,
+    context: Optional[Dict[str, Any]] = None
+) -> str:
+    """Generate planner prompt with query context."""
+    return "".join((
+        PLANNER_BASE,
+        "\nUSER QUERY: ", query,
+        "\n\nPRIMARY JURISDICTION: ", _JURIS_STR[jurisdiction],
+        "\n\nCONTEXT: ", str(context) if context else "No additional context provided",
+        "\n\nCreate a comprehensive plan for addressing this query with DIFC-first legal research and analysis.\n"
+    ))
+
+
+def get_drafter_prompt(
+    plan: str,
+    retrieved_context: Optional[str] = None,
+    jurisdiction: JurisdictionType = JurisdictionType.DIFC
+) -> str:
+    """Generate drafter prompt with plan and context."""
+    return "".join((
+        DRAFTER_BASE,
+        "\nAPPROVED PLAN:\n", plan,
+        "\n\nPRIMARY JURISDICTION: ", _JURIS_STR[jurisdiction],
+        "\n\nRETRIEVED CONTEXT:\n", retrieved_context if retrieved_context else "No additional context retrieved",
+        "\n\nDraft comprehensive content following the plan, with proper DIFC citations and legal disclaimers.\n"
+    ))
+
+
+def get_verifier_prompt(
+    draft_content: str,
+    citations: Optional[list] = None
+) -> str:
+    """Generate verifier prompt with draft content."""
+    return "".join((
+        VERIFIER_BASE,
+        "\nCONTENT TO VERIFY:\n", draft_content,
+        "\n\nCITATIONS TO VERIFY:\n", str(citations) if citations else "No citations provided separately",
+        "\n\nPerform comprehensive verification and provide recommendations for improvement.\n"
+    ))
+
+
+def get_assistant_prompt(
+    mode: str,
+    query: str,
+    context: Optional[Dict[str, Any]] = None
+) -> str:
+    """Generate assistant prompt for direct query handling."""
+    builder = _MODE_BUILDERS.get(mode, _get_assist_mode_prompt)
+    return builder(query, context)
+
+
+def _get_assist_mode_prompt(
+    query: str,
+    context: Optional[Dict[str, Any]] = None
+) -> str:
+    """Assist mode: quick answers, summaries, comparisons."""
+    return "".join((
+        ASSIST_MODE_BASE,
+        "\nUSER QUERY: ", query,
+        "\n\nCONTEXT: ", str(context) if context else "No additional context provided",
+        "\n\nProvide a helpful response focusing on DIFC law with proper citations and disclaimers.\n"
+    ))
+
+
+def _get_draft_mode_prompt(
+    query: str,
+    context: Optional[Dict[str, Any]] = None
+) -> str:
+    """Draft mode: structured outputs for documents."""
+    return "".join((
+        DRAFT_MODE_BASE,
+        "\nUSER QUERY: ", query,
+        "\n\nCONTEXT: ", str(context) if context else "No additional context provided",
+        "\n\nCreate a structured legal document or analysis focusing on DIFC law with comprehensive citations and disclaimers.\n"
+    ))
+
+
+# Assistant mode -> prompt builder (unknown modes fall back to assist)
+_MODE_BUILDERS = {
+    "assist": _get_assist_mode_prompt,
+    "draft": _get_draft_mode_prompt
+}
 
-CONTEXT: {context if context else 'No additional context provided'}
 
-Create a structured legal document or analysis focusing on DIFC law with comprehensive citations and disclaimers.
-"""
+class DIFCPrompts:
+    """
+    DIFC-focused prompt templates for legal AI workflows.
+    
+    Namespace over the module-level constants and builders, kept for
+    callers that use DIFCPrompts.get_*_prompt().
+    """
+    
+    SYSTEM_BASE = SYSTEM_BASE
+    PLANNER_PROMPT = PLANNER_PROMPT
+    DRAFTER_PROMPT = DRAFTER_PROMPT
+    VERIFIER_PROMPT = VERIFIER_PROMPT
+    ASSIST_MODE_PROMPT = ASSIST_MODE_PROMPT
+    DRAFT_MODE_PROMPT = DRAFT_MODE_PROMPT
+    
+    get_planner_prompt = staticmethod(get_planner_prompt)
+    get_drafter_prompt = staticmethod(get_drafter_prompt)
+    get_verifier_prompt = staticmethod(get_verifier_prompt)
+    get_assistant_prompt = staticmethod(get_assistant_prompt)
+    _get_assist_mode_prompt = staticmethod(_get_assist_mode_prompt)
+    _get_draft_mode_prompt = staticmethod(_get_draft_mode_prompt)
 
 
 # Template for common DIFC legal disclaimers
@@ -279,13 +288,23 @@ This information relates to DIFC corporate and commercial law and is provided fo
 }
 
 
+# Topic keywords used to pick a disclaimer (substring match, case-insensitive)
+_FINANCIAL_TERMS = ("financial", "dfsa", "banking", "investment", "fund")
+_CORPORATE_TERMS = ("corporate", "company", "business", "commercial", "contract")
+_FINANCIAL_RE = re.compile("|".join(_FINANCIAL_TERMS), re.IGNORECASE)
+_CORPORATE_RE = re.compile("|".join(_CORPORATE_TERMS), re.IGNORECASE)
+
+
+def _disclaimer_key(topic: str) -> str:
+    """Resolve a topic to its LEGAL_DISCLAIMER_TEMPLATES key."""
+    if _FINANCIAL_RE.search(topic):
+        return "financial_services"
+    elif _CORPORATE_RE.search(topic):
+        return "corporate"
+    else:
+        return "standard"
+
+
 def get_disclaimer_for_topic(topic: str) -> str:
     """Get appropriate legal disclaimer based on topic."""
-    topic_lower = topic.lower()
-    
-    if any(term in topic_lower for term in ["financial", "dfsa", "banking", "investment", "fund"]):
-        return LEGAL_DISCLAIMER_TEMPLATES["financial_services"]
-    elif any(term in topic_lower for term in ["corporate", "company", "business", "commercial", "contract"]):
-        return LEGAL_DISCLAIMER_TEMPLATES["corporate"]
-    else:
-        return LEGAL_DISCLAIMER_TEMPLATES["standard"]
\ No newline at end of file
+    return LEGAL_DISCLAIMER_TEMPLATES[_disclaimer_key(topic)]
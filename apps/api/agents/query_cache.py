@@ -0,0 +1,192 @@
+"""
+Semantic response cache for assistant queries.
+
+Canonical DIFC questions repeat often, so finished responses are cached in
+two tiers before any retrieval or LLM call:
+- Exact tier: SHA-256 of the normalized prompt within its scope
+- Semantic tier (opt-in): cosine similarity of query embeddings within the
+  same scope; off by default because near-identical wording can still ask
+  a different legal question (employer vs employee, negations)
+- Scope covers mode, jurisdiction, vault project, attachments, model
+  override, DIFC boosting and the vector store generation, so differently
+  configured runs never mix and new documents invalidate old answers
+"""
+
+from __future__ import annotations
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from core.config import settings
+from core.models import AssistantQuery, Citation
+from agents.cache import state_key
+from agents.router import get_model_router
+from rag.embeddings import embeddings
+from rag.retrievers import get_difc_retriever
+
+
+@dataclass
+class CachedResponse:
+    """Completed assistant response."""
+    content: str
+    citations: List[Citation] = field(default_factory=list)
+
+
+@dataclass
+class QueryKey:
+    """Cache key for one query; the embedding is computed at most once."""
+    scope: str
+    prompt: str
+    embedding: Optional[Any] = None  # Unit-length numpy vector
+
+    @property
+    def digest(self) -> str:
+        """Exact-tier digest of scope and normalized prompt."""
+        return hashlib.sha256(f"{self.scope}|{self.prompt}".encode("utf-8")).hexdigest()
+
+
+class QueryCache:
+    """
+    Bounded LRU cache of assistant responses with TTL.
+
+    Args:
+        max_entries (int): Maximum cached responses before evicting the oldest.
+        ttl (Optional[float]): Seconds a response stays valid; None keeps it forever.
+        semantic (bool): Also serve responses to similar (not identical) prompts.
+        similarity_threshold (float): Minimum cosine similarity for a semantic hit.
+        embed (Optional[Callable]): Query embedder; defaults to the shared embeddings manager.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: Optional[float] = 3600.0,
+        semantic: bool = False,
+        similarity_threshold: float = 0.95,
+        embed: Optional[Callable[[str], Awaitable[List[float]]]] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.semantic = semantic
+        self.similarity_threshold = similarity_threshold
+        self._embed = embed or embeddings.embed_query
+        self._entries: "OrderedDict[str, Tuple[Optional[float], QueryKey, CachedResponse]]" = OrderedDict()
+
+    @staticmethod
+    def _normalize(prompt: str) -> str:
+        """Collapse case and whitespace so trivial variants share a key."""
+        return " ".join(prompt.lower().split())
+
+    def key_for(self, query: AssistantQuery, boost_difc: bool = True) -> QueryKey:
+        """Build the cache key for an assistant query."""
+        scope = state_key(
+            query.mode,
+            query.knowledge.jurisdiction,
+            query.vault_project_id,
+            sorted(query.attachments),
+            get_model_router().override_model,
+            boost_difc,
+            get_difc_retriever().vector_store.generation
+        )
+        return QueryKey(scope=scope, prompt=self._normalize(query.prompt))
+
+    async def _embedding(self, key: QueryKey) -> Optional[Any]:
+        """Embed the key's prompt once; the semantic tier is skipped if embedding fails."""
+        if key.embedding is None:
+            try:
+                import numpy as np
+                vector = np.asarray(await self._embed(key.prompt), dtype=np.float32)
+            except Exception:
+                return None
+            # Scale to unit length so cosine reduces to a dot product
+            norm = np.linalg.norm(vector)
+            key.embedding = vector / norm if norm else vector
+        return key.embedding
+
+    def _expired(self, expires_at: Optional[float]) -> bool:
+        return expires_at is not None and expires_at < time.monotonic()
+
+    async def lookup(self, key: QueryKey) -> Optional[CachedResponse]:
+        """
+        Find a cached response for the key.
+
+        Args:
+            key (QueryKey): Key from key_for().
+
+        Returns:
+            Optional[CachedResponse]: Cached response, or None on a miss.
+        """
+        entry = self._entries.get(key.digest)
+        if entry is not None:
+            expires_at, _, response = entry
+            if not self._expired(expires_at):
+                self._entries.move_to_end(key.digest)
+                return response
+            del self._entries[key.digest]
+
+        if not self.semantic:
+            return None
+
+        candidates = [
+            (digest, cached_key, response)
+            for digest, (expires_at, cached_key, response) in self._entries.items()
+            if cached_key.scope == key.scope
+            and cached_key.embedding is not None
+            and not self._expired(expires_at)
+        ]
+        if not candidates:
+            return None
+
+        embedding = await self._embedding(key)
+        if embedding is None:
+            return None
+
+        # Reason: one matrix-vector product over all candidates, computed off
+        # the event loop so concurrent streams keep flowing
+        scores = await asyncio.to_thread(
+            _similarities, embedding, [cached_key.embedding for _, cached_key, _ in candidates]
+        )
+        best = int(scores.argmax())
+        if float(scores[best]) < self.similarity_threshold:
+            return None
+
+        best_digest, _, best_response = candidates[best]
+        self._entries.move_to_end(best_digest)
+        return best_response
+
+    async def store(self, key: QueryKey, response: CachedResponse):
+        """Cache a completed response under the key."""
+        if self.semantic:
+            await self._embedding(key)
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[key.digest] = (expires_at, key, response)
+        self._entries.move_to_end(key.digest)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached responses."""
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """Get cache statistics."""
+        return {"cache_size": len(self._entries), "max_entries": self.max_entries}
+
+
+def _similarities(query: Any, vectors: List[Any]) -> Any:
+    """Cosine similarity of a unit query vector against unit cached vectors."""
+    import numpy as np
+    return np.stack(vectors) @ query
+
+
+# Global query cache instance
+query_cache = QueryCache(
+    max_entries=settings.query_cache_max_entries,
+    ttl=settings.query_cache_ttl,
+    semantic=settings.query_cache_semantic,
+    similarity_threshold=settings.query_cache_similarity
+)
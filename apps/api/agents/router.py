@@ -9,11 +9,12 @@ Following PRP specifications:
 """
 
 from __future__ import annotations
-from typing import Optional, Dict, Any, Literal
+import functools
+from types import MappingProxyType
+from typing import Final, FrozenSet, Mapping, Optional, Dict, Any, List, Literal, Tuple, Union
 from enum import Enum
 
 from core.config import settings
-from core.models import JurisdictionType
 
 
 class ModelProvider(str, Enum):
@@ -30,6 +31,66 @@ class ModelCapability(str, Enum):
     LONG_CONTEXT = "long_context"  # Large document processing
 
 
+# Reason: str-Enum members hash through a Python-level __hash__; routing
+# tables are keyed by these plain strings and enums are converted once
+_CAP_REASONING: Final[str] = ModelCapability.REASONING.value
+_CAP_GENERATION: Final[str] = ModelCapability.GENERATION.value
+_CAP_VERIFICATION: Final[str] = ModelCapability.VERIFICATION.value
+_CAP_LONG_CONTEXT: Final[str] = ModelCapability.LONG_CONTEXT.value
+
+
+def _as_key(capability: Union[ModelCapability, str]) -> str:
+    """Convert a capability to its plain-string routing key."""
+    return capability.value if isinstance(capability, ModelCapability) else capability
+
+
+def _index_by_value(mapping: Mapping[Any, Any]) -> Dict[str, List[Any]]:
+    """
+    Invert a key -> value(s) mapping into value -> [keys], preserving order.
+    
+    Used to build reverse lookups over the static routing tables.
+    """
+    index: Dict[str, List[Any]] = {}
+    for key, values in mapping.items():
+        for value in (values if isinstance(values, (list, tuple)) else (values,)):
+            index.setdefault(value, []).append(key)
+    return index
+
+
+# Default model assignments based on PRP specifications
+_DEFAULT_MODELS: Mapping[str, str] = MappingProxyType({
+    _CAP_REASONING: "o1",
+    _CAP_GENERATION: "gpt-4.1", 
+    _CAP_VERIFICATION: "claude-3.7-sonnet",
+    _CAP_LONG_CONTEXT: "claude-3.7-sonnet"
+})
+
+# Model provider mapping
+_MODEL_PROVIDERS: Mapping[str, ModelProvider] = MappingProxyType({
+    "o1": ModelProvider.OPENAI,
+    "o3": ModelProvider.OPENAI,
+    "gpt-4.1": ModelProvider.OPENAI,
+    "gpt-4-turbo": ModelProvider.OPENAI,
+    "claude-3.7-sonnet": ModelProvider.ANTHROPIC,
+    "claude-3-opus": ModelProvider.ANTHROPIC,
+    "claude-3-haiku": ModelProvider.ANTHROPIC
+})
+
+# Fallback models if primary choice unavailable
+_FALLBACK_MODELS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "o1": ("gpt-4.1", "claude-3.7-sonnet"),
+    "gpt-4.1": ("gpt-4-turbo", "claude-3.7-sonnet"),
+    "claude-3.7-sonnet": ("claude-3-opus", "gpt-4.1"),
+    "o3": ("o1", "gpt-4.1"),
+    "claude-3-opus": ("claude-3.7-sonnet", "gpt-4.1")
+})
+
+# Reverse indexes: model -> capabilities it is default for, and
+# fallback model -> primary models it backs up
+_DEFAULT_OF = _index_by_value(_DEFAULT_MODELS)
+_FALLBACK_OF = _index_by_value(_FALLBACK_MODELS)
+
+
 class ModelRouter:
     """
     Routes tasks to appropriate models based on capability requirements.
@@ -37,55 +98,63 @@ class ModelRouter:
     Implements the PRP routing strategy with fallbacks and manual overrides.
     """
     
-    # Default model assignments based on PRP specifications
-    DEFAULT_MODELS = {
-        ModelCapability.REASONING: "o1",
-        ModelCapability.GENERATION: "gpt-4.1", 
-        ModelCapability.VERIFICATION: "claude-3.7-sonnet",
-        ModelCapability.LONG_CONTEXT: "claude-3.7-sonnet"
-    }
-    
-    # Model provider mapping
-    MODEL_PROVIDERS = {
-        "o1": ModelProvider.OPENAI,
-        "o3": ModelProvider.OPENAI,
-        "gpt-4.1": ModelProvider.OPENAI,
-        "gpt-4-turbo": ModelProvider.OPENAI,
-        "claude-3.7-sonnet": ModelProvider.ANTHROPIC,
-        "claude-3-opus": ModelProvider.ANTHROPIC,
-        "claude-3-haiku": ModelProvider.ANTHROPIC
-    }
+    # Reason: fixed attribute layout; nothing assigns ad-hoc instance attributes
+    __slots__ = (
+        "override_model",
+        "_available_models",
+        "_available_order",
+        "_capability_routes",
+        "_model_info_cache",
+        "_validation_cache",
+        "_status_available",
+        "_status_defaults",
+        "_status_model_info"
+    )
     
-    # Fallback models if primary choice unavailable
-    FALLBACK_MODELS = {
-        "o1": ["gpt-4.1", "claude-3.7-sonnet"],
-        "gpt-4.1": ["gpt-4-turbo", "claude-3.7-sonnet"],
-        "claude-3.7-sonnet": ["claude-3-opus", "gpt-4.1"],
-        "o3": ["o1", "gpt-4.1"],
-        "claude-3-opus": ["claude-3.7-sonnet", "gpt-4.1"]
-    }
+    # Routing tables (read-only, shared with the module-level constants)
+    DEFAULT_MODELS = _DEFAULT_MODELS
+    MODEL_PROVIDERS = _MODEL_PROVIDERS
+    FALLBACK_MODELS = _FALLBACK_MODELS
+    _DEFAULT_OF = _DEFAULT_OF
+    _FALLBACK_OF = _FALLBACK_OF
     
     def __init__(self):
         self.override_model: Optional[str] = None
         self._available_models = self._get_available_models()
+        # Reason: frozenset has no order; iterate this for stable output/fallbacks
+        self._available_order: Tuple[str, ...] = tuple(
+            model for model in _MODEL_PROVIDERS if model in self._available_models
+        )
+        # Reason: availability is fixed at startup, so primary/fallback
+        # resolution happens once and routing is a single dict lookup
+        self._capability_routes: Dict[str, Optional[Tuple[str, ModelProvider]]] = {
+            capability.value: self._resolve_route(capability.value) for capability in ModelCapability
+        }
+        # Model metadata and validation depend only on the tables above
+        self._model_info_cache: Dict[str, Dict[str, Any]] = {
+            name: self._compute_model_info(name) for name in _MODEL_PROVIDERS
+        }
+        self._validation_cache: Optional[Dict[str, Any]] = None
+        # Routing status is static apart from the manual override
+        self._status_available: Dict[str, bool] = dict.fromkeys(self._available_order, True)
+        self._status_defaults: Dict[str, str] = dict(_DEFAULT_MODELS)
+        self._status_model_info: Dict[str, Dict[str, Any]] = {
+            name: self._model_info_cache[name] for name in self._available_order
+        }
     
-    def _get_available_models(self) -> Dict[str, bool]:
+    def _get_available_models(self) -> FrozenSet[str]:
         """Check which models are available based on API keys."""
-        available = {}
+        available = set()
         
         # Check OpenAI models
         if settings.openai_api_key:
-            openai_models = ["o1", "o3", "gpt-4.1", "gpt-4-turbo"]
-            for model in openai_models:
-                available[model] = True
+            available.update(["o1", "o3", "gpt-4.1", "gpt-4-turbo"])
         
         # Check Anthropic models  
         if settings.anthropic_api_key:
-            anthropic_models = ["claude-3.7-sonnet", "claude-3-opus", "claude-3-haiku"]
-            for model in anthropic_models:
-                available[model] = True
+            available.update(["claude-3.7-sonnet", "claude-3-opus", "claude-3-haiku"])
         
-        return available
+        return frozenset(available)
     
     def set_manual_override(self, model: Optional[str]):
         """Set manual model override from UI."""
@@ -96,9 +165,9 @@ class ModelRouter:
     
     def get_model_for_capability(
         self,
-        capability: ModelCapability,
+        capability: Union[ModelCapability, str],
         context_length: Optional[int] = None,
-        jurisdiction: JurisdictionType = JurisdictionType.DIFC
+        **_: Any
     ) -> tuple[str, ModelProvider]:
         """
         Get the best model for a specific capability.
@@ -106,56 +175,57 @@ class ModelRouter:
         Args:
             capability: The required model capability
             context_length: Estimated context length for the task
-            jurisdiction: Legal jurisdiction (may influence model choice)
+            **_: Ignored (accepts the former unused `jurisdiction` argument)
             
         Returns:
             tuple[str, ModelProvider]: (model_name, provider)
         """
         # Check for manual override first
         if self.override_model:
-            provider = self.MODEL_PROVIDERS.get(self.override_model, ModelProvider.OPENAI)
+            provider = _MODEL_PROVIDERS.get(self.override_model, ModelProvider.OPENAI)
             return self.override_model, provider
         
         # Special case for long context tasks
         if context_length and context_length > 32000:
-            capability = ModelCapability.LONG_CONTEXT
+            capability = _CAP_LONG_CONTEXT
         
-        # Get primary model choice
-        primary_model = self.DEFAULT_MODELS.get(capability, "gpt-4.1")
+        route = self._capability_routes.get(_as_key(capability))
+        if route is None:
+            raise ValueError("No models available - check API key configuration")
         
-        # Check if primary model is available
-        if primary_model in self._available_models:
-            provider = self.MODEL_PROVIDERS.get(primary_model, ModelProvider.OPENAI)
-            return primary_model, provider
+        return route
+    
+    def _resolve_route(self, capability: str) -> Optional[Tuple[str, ModelProvider]]:
+        """Resolve a capability to its primary, fallback or any available model."""
+        # Get primary model choice
+        primary_model = _DEFAULT_MODELS.get(capability, "gpt-4.1")
         
-        # Try fallback models
-        fallbacks = self.FALLBACK_MODELS.get(primary_model, [])
-        for fallback in fallbacks:
-            if fallback in self._available_models:
-                provider = self.MODEL_PROVIDERS.get(fallback, ModelProvider.OPENAI)
-                return fallback, provider
+        # Check if primary model is available, then try fallback models
+        candidates = [primary_model, *_FALLBACK_MODELS.get(primary_model, [])]
+        for model in candidates:
+            if model in self._available_models:
+                return model, _MODEL_PROVIDERS.get(model, ModelProvider.OPENAI)
         
         # Last resort: return any available model
-        for model in self._available_models:
-            if self._available_models[model]:
-                provider = self.MODEL_PROVIDERS.get(model, ModelProvider.OPENAI)
-                return model, provider
+        if self._available_order:
+            model = self._available_order[0]
+            return model, _MODEL_PROVIDERS.get(model, ModelProvider.OPENAI)
         
-        raise ValueError("No models available - check API key configuration")
+        return None
     
     def get_planner_model(self) -> tuple[str, ModelProvider]:
         """Get model for planning/reasoning tasks."""
-        return self.get_model_for_capability(ModelCapability.REASONING)
+        return self.get_model_for_capability(_CAP_REASONING)
     
     def get_drafter_model(self, context_length: Optional[int] = None) -> tuple[str, ModelProvider]:
         """Get model for content generation/drafting."""
         if context_length and context_length > 32000:
-            return self.get_model_for_capability(ModelCapability.LONG_CONTEXT)
-        return self.get_model_for_capability(ModelCapability.GENERATION)
+            return self.get_model_for_capability(_CAP_LONG_CONTEXT)
+        return self.get_model_for_capability(_CAP_GENERATION)
     
     def get_verifier_model(self) -> tuple[str, ModelProvider]:
         """Get model for verification/review tasks."""
-        return self.get_model_for_capability(ModelCapability.VERIFICATION)
+        return self.get_model_for_capability(_CAP_VERIFICATION)
     
     def get_assistant_model(
         self,
@@ -165,39 +235,42 @@ class ModelRouter:
         """Get model for direct assistant queries."""
         if mode == "assist":
             # Quick responses - use generation model
-            return self.get_model_for_capability(ModelCapability.GENERATION)
+            return self.get_model_for_capability(_CAP_GENERATION)
         elif mode == "draft":
             # Structured documents - use reasoning for planning + generation
             if context_length and context_length > 32000:
-                return self.get_model_for_capability(ModelCapability.LONG_CONTEXT)
-            return self.get_model_for_capability(ModelCapability.REASONING)
+                return self.get_model_for_capability(_CAP_LONG_CONTEXT)
+            return self.get_model_for_capability(_CAP_REASONING)
         else:
-            return self.get_model_for_capability(ModelCapability.GENERATION)
+            return self.get_model_for_capability(_CAP_GENERATION)
     
     def get_model_info(self, model_name: str) -> Dict[str, Any]:
-        """Get information about a specific model."""
-        provider = self.MODEL_PROVIDERS.get(model_name, ModelProvider.OPENAI)
-        available = self._available_models.get(model_name, False)
+        """Get information about a specific model (precomputed for known models)."""
+        info = self._model_info_cache.get(model_name)
+        if info is None:
+            info = self._compute_model_info(model_name)
+        return info
+    
+    def _compute_model_info(self, model_name: str) -> Dict[str, Any]:
+        """Build model metadata from the routing tables."""
+        provider = _MODEL_PROVIDERS.get(model_name, ModelProvider.OPENAI)
+        available = model_name in self._available_models
         
         # Determine capabilities
-        capabilities = []
-        for capability, default_model in self.DEFAULT_MODELS.items():
-            if default_model == model_name:
-                capabilities.append(capability.value)
+        capabilities = list(_DEFAULT_OF.get(model_name, []))
         
         # Add as fallback capability
-        for primary, fallbacks in self.FALLBACK_MODELS.items():
-            if model_name in fallbacks:
-                for capability, default_model in self.DEFAULT_MODELS.items():
-                    if default_model == primary and capability.value not in capabilities:
-                        capabilities.append(f"fallback_{capability.value}")
+        for primary in _FALLBACK_OF.get(model_name, []):
+            for capability in _DEFAULT_OF.get(primary, []):
+                if capability not in capabilities:
+                    capabilities.append(f"fallback_{capability}")
         
         return {
             "name": model_name,
             "provider": provider.value,
             "available": available,
             "capabilities": capabilities,
-            "is_default": model_name in self.DEFAULT_MODELS.values(),
+            "is_default": model_name in _DEFAULT_OF,
             "context_limit": self._get_context_limit(model_name)
         }
     
@@ -217,32 +290,31 @@ class ModelRouter:
     def get_routing_status(self) -> Dict[str, Any]:
         """Get current routing configuration and status."""
         return {
-            "available_models": {
-                name: available for name, available in self._available_models.items()
-            },
-            "default_routing": {
-                capability.value: model for capability, model in self.DEFAULT_MODELS.items()
-            },
+            "available_models": self._status_available,
+            "default_routing": self._status_defaults,
             "manual_override": self.override_model,
-            "model_info": {
-                name: self.get_model_info(name) 
-                for name in self._available_models.keys()
-            }
+            "model_info": self._status_model_info
         }
     
     def validate_model_availability(self) -> Dict[str, Any]:
-        """Validate that required models are available."""
+        """Validate that required models are available (computed once)."""
+        if self._validation_cache is None:
+            self._validation_cache = self._compute_validation()
+        return self._validation_cache
+    
+    def _compute_validation(self) -> Dict[str, Any]:
+        """Check primary/fallback coverage for every capability."""
         issues = []
         warnings = []
         
         # Check if we have at least one model from each provider
         has_openai = any(
-            self.MODEL_PROVIDERS.get(model) == ModelProvider.OPENAI and available
-            for model, available in self._available_models.items()
+            _MODEL_PROVIDERS.get(model) == ModelProvider.OPENAI
+            for model in self._available_models
         )
         has_anthropic = any(
-            self.MODEL_PROVIDERS.get(model) == ModelProvider.ANTHROPIC and available  
-            for model, available in self._available_models.items()
+            _MODEL_PROVIDERS.get(model) == ModelProvider.ANTHROPIC
+            for model in self._available_models
         )
         
         if not has_openai and not has_anthropic:
@@ -253,25 +325,39 @@ class ModelRouter:
             warnings.append("Anthropic models unavailable - limited to OpenAI models")
         
         # Check primary model availability
-        for capability, model in self.DEFAULT_MODELS.items():
-            if not self._available_models.get(model, False):
-                fallbacks = self.FALLBACK_MODELS.get(model, [])
+        for capability, model in _DEFAULT_MODELS.items():
+            if model not in self._available_models:
+                fallbacks = _FALLBACK_MODELS.get(model, ())
                 has_fallback = any(
-                    self._available_models.get(fb, False) for fb in fallbacks
+                    fb in self._available_models for fb in fallbacks
                 )
                 if not has_fallback:
-                    issues.append(f"No available model for {capability.value} capability")
+                    issues.append(f"No available model for {capability} capability")
                 else:
-                    warnings.append(f"Primary {capability.value} model ({model}) unavailable, using fallback")
+                    warnings.append(f"Primary {capability} model ({model}) unavailable, using fallback")
         
         return {
             "valid": len(issues) == 0,
             "issues": issues,
             "warnings": warnings,
-            "available_count": sum(self._available_models.values()),
+            "available_count": len(self._available_models),
             "total_count": len(self._available_models)
         }
 
 
-# Global router instance
-model_router = ModelRouter()
\ No newline at end of file
+@functools.cache
+def get_model_router() -> ModelRouter:
+    """
+    Get the shared router, built on first use.
+    
+    Defers API-key/settings inspection and routing-table construction until
+    a caller actually needs routing (prompt-only imports and tests skip it).
+    """
+    return ModelRouter()
+
+
+def __getattr__(name: str) -> Any:
+    """Back-compat: resolve the old module-level `model_router` lazily."""
+    if name == "model_router":
+        return get_model_router()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -8,14 +8,16 @@ Following examples/assistant_run.py patterns:
 """
 
 from __future__ import annotations
-import json
 import asyncio
-from typing import Dict, Any, Optional
+import logging
+import time
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import StreamingResponse
-from sse_starlette.sse import EventSourceResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
 
 from core.models import (
     AssistantQuery, 
@@ -23,46 +25,171 @@ from core.models import (
     TextChunk, 
     Citation, 
     StreamDone,
-    JurisdictionType,
+    StreamError,
     AssistantMode
 )
+from core.config import settings
 from core.database import get_db
 from agents.graph import simple_assistant, qaai_workflow
-from agents.router import model_router
-from rag.retrievers import difc_retriever, RetrievalContext
+from agents.query_cache import CachedResponse, query_cache
+from agents.router import get_model_router
+from rag.retrievers import get_difc_retriever
 
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Characters per assist-mode text chunk
+STREAM_CHUNK_CHARS = 512
+
+# SSE comment line; clients ignore it but proxies see traffic
+KEEP_ALIVE_FRAME = b": keep-alive\n\n"
+
+
+class _TTLValue:
+    """
+    Single endpoint response reused for a short TTL.
+    
+    Args:
+        ttl (float): Seconds the value stays valid.
+    """
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entry: Optional[Tuple[float, Any, Any]] = None  # (expires_at, version, value)
+    
+    def get(self, load: Callable[[], Any], version: Any = None) -> Any:
+        """Return the cached value, reloading it once expired or when version changes."""
+        now = time.monotonic()
+        if self._entry is not None:
+            expires_at, cached_version, value = self._entry
+            if expires_at > now and cached_version == version:
+                return value
+        
+        value = load()
+        self._entry = (now + self.ttl, version, value)
+        return value
+    
+    def invalidate(self):
+        """Drop the cached value so the next request recomputes it."""
+        self._entry = None
+
+
+_models_status = _TTLValue(settings.metadata_cache_ttl)
+_knowledge_sources = _TTLValue(settings.metadata_cache_ttl)
 
 
 async def stream_assistant_response(query: AssistantQuery):
     """
-    Stream assistant response with thinking states and content.
+    Stream assistant response through a bounded queue.
+    
+    The workflow produces frames into a queue of SSE_MAX_QUEUE_SIZE; if the
+    client stops draining it for SSE_QUEUE_TIMEOUT seconds the stream is
+    closed instead of buffering the rest of the response in memory. While
+    the workflow is thinking, a keep-alive comment is sent every
+    SSE_PING_INTERVAL seconds so proxies do not time the stream out.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=settings.sse_max_queue_size)
+    closed = asyncio.Event()
+    producer = asyncio.create_task(_produce_events(query, queue, closed))
+    
+    try:
+        while True:
+            try:
+                frame = await asyncio.wait_for(queue.get(), timeout=settings.sse_ping_interval)
+            except asyncio.TimeoutError:
+                yield KEEP_ALIVE_FRAME
+                continue
+            if frame is None:
+                break
+            yield frame
+    finally:
+        # Reason: client disconnects cancel this generator; stop the workflow too
+        closed.set()
+        producer.cancel()
+
+
+async def _produce_events(query: AssistantQuery, queue: asyncio.Queue, closed: asyncio.Event) -> None:
+    """Pump assistant events into the queue, always ending with a None sentinel."""
+    delivered = False
+    events = _assistant_events(query)
+    try:
+        async for frame in events:
+            await asyncio.wait_for(queue.put(frame), timeout=settings.sse_queue_timeout)
+            # Reason: wait_for drops a cancel that races a completed put
+            # (bpo-42130), so also stop once the client has gone
+            if closed.is_set():
+                return
+        await asyncio.wait_for(queue.put(None), timeout=settings.sse_queue_timeout)
+        delivered = True
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Slow SSE client: queue full for {settings.sse_queue_timeout}s, closing stream"
+        )
+        _replace_pending(queue, _error(StreamError(
+            error="Stream closed: client did not keep up with the response"
+        )))
+    except Exception as e:
+        logger.error(f"Assistant stream producer failed: {e}")
+        _replace_pending(queue, _error(StreamError(error=f"Assistant error: {str(e)}")))
+    finally:
+        # Reason: close the workflow stream now rather than at garbage
+        # collection, so a disconnected client stops model calls promptly
+        await events.aclose()
+        # Reason: the consumer blocks on queue.get() until it sees the sentinel
+        if not delivered:
+            if queue.full():
+                _replace_pending(queue)
+            queue.put_nowait(None)
+
+
+def _replace_pending(queue: asyncio.Queue, frame: Optional[bytes] = None) -> None:
+    """Drop undelivered frames, optionally leaving a final frame in their place."""
+    while not queue.empty():
+        queue.get_nowait()
+    if frame is not None:
+        queue.put_nowait(frame)
+
+
+async def _assistant_events(query: AssistantQuery):
+    """
+    Generate assistant SSE frames with thinking states and content.
     
     Following examples/assistant_run.py SSE format.
     """
+    # Reason: one clock read per response; thinking states share its timestamp
+    started = datetime.now()
+    
     try:
         # Emit initial thinking state
-        yield {
-            "event": "message",
-            "data": json.dumps({
-                "type": "thinking_state",
-                "label": f"Processing {query.mode} request for {query.knowledge.jurisdiction.value}",
-                "timestamp": datetime.now().isoformat()
-            })
-        }
+        yield _message(ThinkingState(
+            label=f"Processing {query.mode} request for {query.knowledge.jurisdiction.value}",
+            timestamp=started
+        ))
+        
+        # Serve repeat and near-duplicate questions without retrieval or generation
+        cache_key = query_cache.key_for(query) if settings.query_cache_enabled else None
+        cached = await query_cache.lookup(cache_key) if cache_key else None
+        if cached is not None:
+            yield _message(ThinkingState(label="Reusing cached DIFC response", timestamp=started))
+            citation_json = [to_json(citation) for citation in cached.citations]
+            for data in citation_json:
+                yield sse(data)
+            for chunk in _chunk_text(cached.content, STREAM_CHUNK_CHARS):
+                yield _message(TextChunk(text=chunk))
+            yield _done(citation_json)
+            return
+        
+        citations: List[Citation] = []
+        citation_json: List[bytes] = []
         
         # Choose execution path based on mode
         if query.mode == AssistantMode.DRAFT:
             # Use full workflow for draft mode
-            yield {
-                "event": "message", 
-                "data": json.dumps({
-                    "type": "thinking_state",
-                    "label": "Initializing draft workflow",
-                    "timestamp": datetime.now().isoformat()
-                })
-            }
+            yield _message(ThinkingState(label="Initializing draft workflow", timestamp=started))
+            
+            draft_parts: List[str] = []
+            final_draft: Optional[str] = None
             
             # Stream workflow execution
             async for event in qaai_workflow.stream_run(
@@ -71,103 +198,40 @@ async def stream_assistant_response(query: AssistantQuery):
                 model_override=None  # Could be passed from query
             ):
                 if event.get("type") == "thinking_state":
-                    yield {
-                        "event": "message",
-                        "data": json.dumps({
-                            "type": "thinking_state", 
-                            "label": event.get("label", "Processing..."),
-                            "timestamp": datetime.now().isoformat()
-                        })
-                    }
+                    yield _message(ThinkingState(label=event.get("label", "Processing..."), timestamp=started))
                 elif event.get("type") == "draft_progress":
-                    # Stream draft content as it's generated
-                    content = event.get("content", "")
-                    for chunk in _chunk_text(content, 50):  # Stream in small chunks
-                        yield {
-                            "event": "message",
-                            "data": json.dumps({
-                                "type": "chunk",
-                                "text": chunk
-                            })
-                        }
-                        await asyncio.sleep(0.1)  # Simulate streaming
+                    # Forward model tokens as they are generated
+                    delta = event.get("delta", "")
+                    draft_parts.append(delta)
+                    yield _message(TextChunk(text=delta))
                         
                 elif event.get("type") == "citation":
-                    yield {
-                        "event": "message",
-                        "data": json.dumps({
-                            "type": "citation",
-                            **event.get("citation", {})
-                        })
-                    }
+                    citation = Citation.model_validate(event.get("citation", {}))
+                    citations.append(citation)
+                    citation_json.append(to_json(citation))
+                    yield sse(citation_json[-1])
                 elif event.get("type") == "error":
-                    yield {
-                        "event": "error",
-                        "data": json.dumps({
-                            "error": event.get("error", "Unknown error"),
-                            "node": event.get("node", "unknown")
-                        })
-                    }
+                    yield _error(StreamError(
+                        error=event.get("error", "Unknown error"),
+                        node=event.get("node", "unknown")
+                    ))
                     return
+                elif event.get("type") == "done":
+                    final_draft = event.get("draft")
+            
+            streamed = "".join(draft_parts)
+            content = final_draft or streamed
+            # Reason: the drafter appends the legal disclaimer after the
+            # streamed tokens; send the tail so the client receives it too
+            if len(content) > len(streamed) and content.startswith(streamed):
+                yield _message(TextChunk(text=content[len(streamed):]))
             
         else:
             # Use simple assistant for assist mode
-            yield {
-                "event": "message",
-                "data": json.dumps({
-                    "type": "thinking_state",
-                    "label": "Retrieving relevant DIFC sources",
-                    "timestamp": datetime.now().isoformat()
-                })
-            }
-            
-            # Get retrieval context
-            retrieval_context = RetrievalContext(
-                query=query.prompt,
-                jurisdiction=query.knowledge.jurisdiction,
-                max_results=5,
-                include_citations=True,
-                boost_difc=True,
-                hybrid_search=True
-            )
-            
-            # Perform retrieval
-            matches, citations = await difc_retriever.retrieve_with_citations(retrieval_context)
-            
-            yield {
-                "event": "message",
-                "data": json.dumps({
-                    "type": "thinking_state",
-                    "label": f"Found {len(matches)} relevant documents",
-                    "timestamp": datetime.now().isoformat()
-                })
-            }
-            
-            # Emit citations
-            for citation in citations:
-                yield {
-                    "event": "message",
-                    "data": json.dumps({
-                        "type": "citation",
-                        "title": citation.title,
-                        "section": citation.section,
-                        "url": citation.url,
-                        "instrument_type": citation.instrument_type.value,
-                        "jurisdiction": citation.jurisdiction.value
-                    })
-                }
-            
-            # Generate response
-            yield {
-                "event": "message",
-                "data": json.dumps({
-                    "type": "thinking_state",
-                    "label": "Generating response with DIFC legal analysis",
-                    "timestamp": datetime.now().isoformat()
-                })
-            }
+            yield _message(ThinkingState(label="Retrieving relevant DIFC sources", timestamp=started))
             
-            # Use simple assistant to generate response
+            # Reason: the assistant graph retrieves once and drafts from those
+            # matches; stream its citations rather than searching again here
             result = await simple_assistant.run(
                 prompt=query.prompt,
                 mode=query.mode,
@@ -176,55 +240,69 @@ async def stream_assistant_response(query: AssistantQuery):
             )
             
             if not result["success"]:
-                yield {
-                    "event": "error",
-                    "data": json.dumps({
-                        "error": result["error"]
-                    })
-                }
+                yield _error(StreamError(error=result["error"]))
                 return
             
+            for label in result.get("thinking_states") or []:
+                yield _message(ThinkingState(label=label, timestamp=started))
+            
+            # Emit citations, serialized once and reused by the done event
+            citations = [Citation.model_validate(citation) for citation in result.get("citations") or []]
+            citation_json = [to_json(citation) for citation in citations]
+            for data in citation_json:
+                yield sse(data)
+            
             # Stream the response content
             content = result.get("content") or result.get("draft", "No response generated")
-            for chunk in _chunk_text(content, 100):
-                yield {
-                    "event": "message",
-                    "data": json.dumps({
-                        "type": "chunk",
-                        "text": chunk
-                    })
-                }
-                await asyncio.sleep(0.05)  # Simulate typing
+            for chunk in _chunk_text(content, STREAM_CHUNK_CHARS):
+                yield _message(TextChunk(text=chunk))
         
         # Final done event
-        yield {
-            "event": "message",
-            "data": json.dumps({
-                "type": "done",
-                "final_response": "Response completed",
-                "citations": [c.dict() if hasattr(c, 'dict') else c for c in citations] if 'citations' in locals() else []
-            })
-        }
+        yield _done(citation_json)
+        
+        if cache_key:
+            await query_cache.store(cache_key, CachedResponse(content=content, citations=citations))
         
     except Exception as e:
-        yield {
-            "event": "error",
-            "data": json.dumps({
-                "error": f"Assistant error: {str(e)}"
-            })
-        }
+        yield _error(StreamError(error=f"Assistant error: {str(e)}"))
 
 
-def _chunk_text(text: str, chunk_size: int) -> list[str]:
-    """Split text into chunks for streaming."""
-    words = text.split()
-    chunks = []
-    
-    for i in range(0, len(words), chunk_size):
-        chunk_words = words[i:i + chunk_size]
-        chunks.append(" ".join(chunk_words))
+def sse(data: bytes) -> bytes:
+    """Frame serialized JSON as an SSE message (the default "message" event)."""
+    return b"data: " + data + b"\n\n"
+
+
+def _message(event: BaseModel) -> bytes:
+    """Encode a stream event model as an SSE message frame."""
+    # Reason: pydantic-core serializes straight to UTF-8 bytes, so frames
+    # reach the socket without an intermediate dict or str re-encode
+    return sse(to_json(event))
+
+
+def _done(citation_json: List[bytes]) -> bytes:
+    """
+    Encode the StreamDone frame around citations serialized when emitted.
     
-    return chunks
+    Produces the same JSON as StreamDone.model_dump_json() without
+    re-serializing every citation.
+    """
+    return sse(
+        b'{"type":"done","final_response":"Response completed","citations":['
+        + b",".join(citation_json)
+        + b"]}"
+    )
+
+
+def _error(event: StreamError) -> bytes:
+    """Encode a stream error as an SSE error frame."""
+    return b"event: error\ndata: " + to_json(event, exclude_none=True) + b"\n\n"
+
+
+def _chunk_text(text: str, chunk_size: int) -> Iterator[str]:
+    """Slice text into fixed-size character chunks for streaming."""
+    # Reason: slicing avoids split/join copies and keeps original whitespace
+    for i in range(0, len(text), chunk_size):
+        yield text[i:i + chunk_size]
 
 
 @router.post("/query")
@@ -239,16 +317,15 @@ async def query_assistant(query: AssistantQuery):
         if not query.prompt or len(query.prompt.strip()) == 0:
             raise HTTPException(status_code=400, detail="Prompt cannot be empty")
         
-        # Validate jurisdiction
-        if query.knowledge.jurisdiction not in JurisdictionType:
-            raise HTTPException(status_code=400, detail="Invalid jurisdiction")
-        
-        # Return SSE stream
-        return EventSourceResponse(
+        # Return SSE stream of pre-framed bytes
+        return StreamingResponse(
             stream_assistant_response(query),
+            media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
+                # Reason: stop Nginx-style proxies buffering the stream until it ends
+                "X-Accel-Buffering": "no",
                 "Access-Control-Allow-Origin": "*",
                 "Access-Control-Allow-Headers": "*"
             }
@@ -268,6 +345,17 @@ async def query_assistant_sync(query: AssistantQuery):
     Returns complete response without streaming.
     """
     try:
+        cache_key = query_cache.key_for(query) if settings.query_cache_enabled else None
+        cached = await query_cache.lookup(cache_key) if cache_key else None
+        if cached is not None:
+            return {
+                "success": True,
+                "content": cached.content,
+                "citations": [citation.model_dump() for citation in cached.citations],
+                "thinking_states": ["Reusing cached DIFC response"],
+                "error": None
+            }
+        
         if query.mode == AssistantMode.DRAFT:
             # Use workflow
             result = await qaai_workflow.run(
@@ -275,7 +363,7 @@ async def query_assistant_sync(query: AssistantQuery):
                 jurisdiction=query.knowledge.jurisdiction
             )
             
-            return {
+            result = {
                 "success": result["success"],
                 "content": result["output"].get("content", "") if result["output"] else "",
                 "citations": result["citations"],
@@ -290,8 +378,14 @@ async def query_assistant_sync(query: AssistantQuery):
                 jurisdiction=query.knowledge.jurisdiction,
                 vault_project_id=query.vault_project_id
             )
-            
-            return result
+        
+        if cache_key and result["success"] and not result["error"]:
+            await query_cache.store(cache_key, CachedResponse(
+                content=result["content"],
+                citations=[Citation.model_validate(citation) for citation in result["citations"]]
+            ))
+        
+        return result
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Query error: {str(e)}")
@@ -301,7 +395,7 @@ async def query_assistant_sync(query: AssistantQuery):
 async def get_available_models():
     """Get information about available models and routing."""
     try:
-        return model_router.get_routing_status()
+        return _models_status.get(get_model_router().get_routing_status)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Model info error: {str(e)}")
 
@@ -310,7 +404,8 @@ async def get_available_models():
 async def set_model_override(model_name: Optional[str] = None):
     """Set manual model override."""
     try:
-        model_router.set_manual_override(model_name)
+        get_model_router().set_manual_override(model_name)
+        _models_status.invalidate()
         return {
             "success": True,
             "override_model": model_name,
@@ -324,6 +419,11 @@ async def set_model_override(model_name: Optional[str] = None):
 async def get_knowledge_sources():
     """Get available knowledge sources and statistics."""
     try:
-        return difc_retriever.get_knowledge_sources_summary()
+        # Reason: keyed on the vector store generation so ingestion shows up immediately
+        retriever = get_difc_retriever()
+        return _knowledge_sources.get(
+            retriever.get_knowledge_sources_summary,
+            version=retriever.vector_store.generation
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Knowledge sources error: {str(e)}")
\ No newline at end of file
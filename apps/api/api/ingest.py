@@ -9,37 +9,159 @@ Following PRP requirements:
 """
 
 from __future__ import annotations
-import json
 import uuid
-import asyncio
-from typing import List, Optional, Dict, Any
+import time
+from collections import Counter, OrderedDict
+from itertools import islice
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
-from pathlib import Path
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends
 from fastapi.responses import StreamingResponse
-from sse_starlette.sse import EventSourceResponse
+from pydantic_core import to_json
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.models import (
     JurisdictionType,
     InstrumentType,
-    DocumentMetadata,
     IngestionJob,
     IngestionStatus
 )
 from core.config import settings
 from core.database import get_db
 from core.storage import storage
-from rag.embeddings import embeddings as embedding_provider
+from rag.pipeline import BatchedEmbedder, ingest_file
 from rag.vector_store import vector_store
 
 
 router = APIRouter()
 
 
-# In-memory job storage (production would use database)
-ingestion_jobs: Dict[str, IngestionJob] = {}
+class JobStore:
+    """
+    Bounded in-memory ingestion job table (production would use database).
+    
+    Keeps jobs in creation order and maintains per-status and document/error
+    totals as jobs change, so statistics never rescan the table. When full,
+    the oldest finished jobs are evicted first.
+    """
+    
+    _FINISHED = (IngestionStatus.COMPLETED, IngestionStatus.FAILED)
+    
+    def __init__(self, max_jobs: int):
+        self.max_jobs = max_jobs
+        self._jobs: OrderedDict[str, IngestionJob] = OrderedDict()
+        self.status_counts: Counter = Counter()
+        self.total_documents = 0
+        self.total_errors = 0
+    
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+    
+    def __getitem__(self, job_id: str) -> IngestionJob:
+        return self._jobs[job_id]
+    
+    def __len__(self) -> int:
+        return len(self._jobs)
+    
+    def values(self):
+        """Jobs in creation order (reversible)."""
+        return self._jobs.values()
+    
+    def _count(self, job: IngestionJob, sign: int):
+        self.status_counts[job.status] += sign
+        self.total_documents += sign * len(job.document_ids)
+        self.total_errors += sign * job.error_count
+    
+    def create(self, job: IngestionJob):
+        """Add a job, evicting the oldest finished jobs if over capacity."""
+        self._jobs[job.id] = job
+        self._count(job, 1)
+        
+        excess = len(self._jobs) - self.max_jobs
+        if excess > 0:
+            # Reason: walk from the oldest end and stop once enough finished
+            # jobs are found, rather than listing every finished job per insert
+            finished = []
+            for job_id, existing in self._jobs.items():
+                if existing.status in self._FINISHED:
+                    finished.append(job_id)
+                    if len(finished) == excess:
+                        break
+            for job_id in finished:
+                self.delete(job_id)
+    
+    def update(self, job_id: str, **changes):
+        """Apply field changes to a job, if it is still stored."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        self._count(job, -1)
+        for field, value in changes.items():
+            setattr(job, field, value)
+        self._count(job, 1)
+    
+    def delete(self, job_id: str):
+        """Remove a job."""
+        self._count(self._jobs.pop(job_id), -1)
+
+
+# In-memory job storage
+ingestion_jobs = JobStore(settings.max_ingestion_jobs)
+
+# Embedding progress is reported at most once per interval (seconds) unless
+# at least this many percent of the job's files have finished since
+PROGRESS_MIN_INTERVAL = 0.5
+PROGRESS_MIN_STEP = 1.0
+
+# Form values resolved with one dict lookup; unknown instrument names map to OTHER
+_JURISDICTION_BY_VALUE: Dict[str, JurisdictionType] = {j.value: j for j in JurisdictionType}
+_INSTRUMENT_BY_NAME: Dict[str, InstrumentType] = {i.name: i for i in InstrumentType}
+
+
+def _resolve_form_enums(jurisdiction: str, instrument_type: str) -> Tuple[JurisdictionType, InstrumentType]:
+    """
+    Resolve the jurisdiction and instrument type form fields.
+    
+    Raises:
+        HTTPException: 400 if the jurisdiction is not recognised
+    """
+    jurisdiction_enum = _JURISDICTION_BY_VALUE.get(jurisdiction)
+    if jurisdiction_enum is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid jurisdiction or instrument type: {jurisdiction!r} is not a valid JurisdictionType"
+        )
+    return jurisdiction_enum, _INSTRUMENT_BY_NAME.get(instrument_type, InstrumentType.OTHER)
+
+
+class _JobFrames:
+    """
+    SSE message frames for one ingestion job.
+    
+    The leading `data: {"type":...,"job_id":...` bytes of each event type
+    are encoded once per job, so each event only encodes its own fields.
+    """
+    
+    def __init__(self, job_id: str):
+        self._job_id = to_json(job_id)
+        self._prefixes: Dict[str, bytes] = {}
+    
+    def message(self, event_type: str, fields: Dict[str, Any]) -> bytes:
+        """Encode an ingestion event as an SSE message frame."""
+        prefix = self._prefixes.get(event_type)
+        if prefix is None:
+            prefix = b'data: {"type":' + to_json(event_type) + b',"job_id":' + self._job_id
+            self._prefixes[event_type] = prefix
+        # Reason: pydantic-core serializes straight to UTF-8 bytes in C; splice
+        # the fields object's members in after the job-constant prefix
+        body = to_json(fields)
+        return prefix + (b"," + body[1:] if len(body) > 2 else b"}") + b"\n\n"
+
+
+def _error(payload: Dict[str, Any]) -> bytes:
+    """Encode an ingestion failure as an SSE error frame."""
+    return b"event: error\ndata: " + to_json(payload) + b"\n\n"
 
 
 async def stream_ingestion_progress(
@@ -54,238 +176,190 @@ async def stream_ingestion_progress(
     
     Following SSE patterns for batch processing visibility.
     """
+    frames = _JobFrames(job_id)
     try:
         # Update job status
-        if job_id in ingestion_jobs:
-            ingestion_jobs[job_id].status = IngestionStatus.PROCESSING
-            ingestion_jobs[job_id].started_at = datetime.now()
+        started_at = datetime.now()
+        ingestion_jobs.update(job_id, status=IngestionStatus.PROCESSING, started_at=started_at)
         
         # Emit job start
-        yield {
-            "event": "message",
-            "data": json.dumps({
-                "type": "ingestion_start",
-                "job_id": job_id,
-                "total_files": len(files),
-                "timestamp": datetime.now().isoformat()
-            })
-        }
+        yield frames.message("ingestion_start", {
+            "total_files": len(files),
+            "timestamp": started_at.isoformat()
+        })
         
         processed_count = 0
         errors = []
         document_ids = []
+        pending = BatchedEmbedder(settings.ingest_embedding_batch_size)
+        file_names: Dict[str, str] = {}
+        file_chunk_counts: Dict[str, int] = {}
+        
+        last_progress_time = float("-inf")
+        last_progress_pct = float("-inf")
+        last_progress_indexed = 0
+        
+        def flush_events(
+            completed: List[str],
+            failed: Dict[str, str],
+            final: bool = False
+        ) -> List[bytes]:
+            """Record a flush's outcome and build the frames reporting it."""
+            nonlocal processed_count, last_progress_time, last_progress_pct, last_progress_indexed
+            events = []
+            now_iso = datetime.now().isoformat()
+            
+            # Reason: a UI only needs coarse progress; throttle the events to
+            # one per interval or percent of files finished, plus the last one
+            now = time.monotonic()
+            files_done = processed_count + len(errors) + len(completed) + len(failed)
+            pct = 100 * files_done / len(files)
+            if pending.indexed_count != last_progress_indexed and (
+                final
+                or now - last_progress_time >= PROGRESS_MIN_INTERVAL
+                or pct - last_progress_pct >= PROGRESS_MIN_STEP
+            ):
+                last_progress_time, last_progress_pct = now, pct
+                last_progress_indexed = pending.indexed_count
+                events.append(frames.message("embedding_progress", {
+                    "processed_chunks": pending.indexed_count,
+                    "total_chunks": pending.queued_count,
+                    "timestamp": now_iso
+                }))
+            
+            for file_id in completed:
+                document_ids.append(file_id)
+                processed_count += 1
+                events.append(frames.message("file_complete", {
+                    "file_id": file_id,
+                    "filename": file_names[file_id],
+                    "chunk_count": file_chunk_counts[file_id],
+                    "timestamp": now_iso
+                }))
+            
+            for file_id, error in failed.items():
+                error_msg = f"Error processing {file_names[file_id]}: {error}"
+                errors.append(error_msg)
+                events.append(frames.message("file_error", {
+                    "filename": file_names[file_id],
+                    "error": error_msg,
+                    "timestamp": now_iso
+                }))
+            
+            return events
+        
+        # Store every upload in one batch before processing
+        stored_uploads = await storage.store_uploads(files, project_id)
         
         # Process each file
         for i, file in enumerate(files):
+            # Reason: events of one processing step share a timestamp instead
+            # of formatting a fresh one per event
+            now = datetime.now()
+            now_iso = now.isoformat()
+            file_events: List[bytes] = []
             try:
                 # Emit file processing start
-                yield {
-                    "event": "message",
-                    "data": json.dumps({
-                        "type": "file_processing",
-                        "job_id": job_id,
-                        "file_index": i,
-                        "filename": file.filename,
-                        "progress": f"{i + 1}/{len(files)}",
-                        "timestamp": datetime.now().isoformat()
-                    })
-                }
-                
-                # Store file
-                file_id, stored_path, metadata = await storage.store_upload(file, project_id)
-                
-                # Extract text content (simplified - for text files only in this demo)
-                yield {
-                    "event": "message", 
-                    "data": json.dumps({
-                        "type": "text_extraction",
-                        "job_id": job_id,
-                        "file_id": file_id,
-                        "filename": file.filename,
-                        "timestamp": datetime.now().isoformat()
-                    })
-                }
+                yield frames.message("file_processing", {
+                    "file_index": i,
+                    "filename": file.filename,
+                    "progress": f"{i + 1}/{len(files)}",
+                    "timestamp": now_iso
+                })
                 
-                # Simple text extraction for demo purposes
-                if metadata["content_type"].startswith("text/"):
-                    try:
-                        with open(stored_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                    except Exception as e:
-                        content = f"Sample content for {file.filename}"  # Fallback for demo
-                else:
-                    content = f"Sample content for {file.filename} (binary file not processed in demo)"
+                # File was stored with the rest of the batch
+                stored_upload = stored_uploads[i]
+                if isinstance(stored_upload, Exception):
+                    raise stored_upload
+                file_id, stored_path, metadata = stored_upload
                 
-                if not content or len(content.strip()) == 0:
-                    errors.append(f"No text content extracted from {file.filename}")
-                    continue
-                
-                # Create document metadata
-                doc_metadata = DocumentMetadata(
-                    id=file_id,
+                # Extract, chunk and queue the file; full batches are embedded
+                # across file boundaries
+                result = await ingest_file(
+                    file_id,
+                    stored_path,
+                    metadata,
+                    jurisdiction,
+                    instrument_type,
                     project_id=project_id,
-                    filename=metadata["filename"],
-                    title=metadata["filename"].rsplit('.', 1)[0].replace('_', ' ').title(),
-                    file_path=metadata["stored_path"],
-                    content_type=metadata["content_type"],
-                    size_bytes=metadata["size_bytes"],
-                    jurisdiction=jurisdiction,
-                    instrument_type=instrument_type,
-                    upload_date=datetime.now()
+                    progress_cb=lambda event: file_events.append(
+                        frames.message(event.pop("type"), event)
+                    ),
+                    embedder=pending,
+                    started_at=now
                 )
+                for event in file_events:
+                    yield event
+                file_events.clear()
                 
-                # Chunk document (simplified chunking for demo)
-                yield {
-                    "event": "message",
-                    "data": json.dumps({
-                        "type": "chunking",
-                        "job_id": job_id,
-                        "file_id": file_id,
-                        "filename": file.filename,
-                        "timestamp": datetime.now().isoformat()
-                    })
-                }
-                
-                # Simple chunking - split by sentences/paragraphs
-                from rag.embeddings import EmbeddingChunk
-                chunks = []
-                
-                # Split content into chunks of ~500 words
-                words = content.split()
-                chunk_size = 500
-                
-                for i in range(0, len(words), chunk_size):
-                    chunk_words = words[i:i + chunk_size]
-                    chunk_content = " ".join(chunk_words)
-                    
-                    chunk = EmbeddingChunk(
-                        id=f"{file_id}_chunk_{i // chunk_size}",
-                        doc_id=file_id,
-                        content=chunk_content,
-                        chunk_index=i // chunk_size,
-                        metadata=doc_metadata.dict()
-                    )
-                    chunks.append(chunk)
-                
-                yield {
-                    "event": "message",
-                    "data": json.dumps({
-                        "type": "chunking_complete",
-                        "job_id": job_id,
-                        "file_id": file_id,
-                        "chunk_count": len(chunks),
-                        "timestamp": datetime.now().isoformat()
-                    })
-                }
-                
-                # Generate embeddings
-                yield {
-                    "event": "message",
-                    "data": json.dumps({
-                        "type": "embedding_generation",
-                        "job_id": job_id,
-                        "file_id": file_id,
-                        "chunk_count": len(chunks),
-                        "timestamp": datetime.now().isoformat()
-                    })
-                }
-                
-                # Process chunks in batches for efficiency
-                batch_size = 10
-                for batch_start in range(0, len(chunks), batch_size):
-                    batch_chunks = chunks[batch_start:batch_start + batch_size]
-                    
-                    # Generate embeddings for batch
-                    texts = [chunk.content for chunk in batch_chunks]
-                    embeddings = await embedding_provider.embed_texts(texts)
-                    
-                    # Add to vector store
-                    await vector_store.add_chunks_with_embeddings(batch_chunks, embeddings)
-                    
-                    # Emit batch progress
-                    yield {
-                        "event": "message",
-                        "data": json.dumps({
-                            "type": "embedding_progress",
-                            "job_id": job_id,
-                            "file_id": file_id,
-                            "processed_chunks": min(batch_start + batch_size, len(chunks)),
-                            "total_chunks": len(chunks),
-                            "timestamp": datetime.now().isoformat()
-                        })
-                    }
+                if not result["chunk_count"]:
+                    errors.append(f"No text content extracted from {file.filename}")
+                    continue
                 
-                document_ids.append(file_id)
-                processed_count += 1
+                file_names[file_id] = file.filename
+                file_chunk_counts[file_id] = result["chunk_count"]
                 
-                # Emit file completion
-                yield {
-                    "event": "message",
-                    "data": json.dumps({
-                        "type": "file_complete",
-                        "job_id": job_id,
-                        "file_id": file_id,
-                        "filename": file.filename,
-                        "chunk_count": len(chunks),
-                        "timestamp": datetime.now().isoformat()
-                    })
-                }
+                if pending.ready():
+                    for event in flush_events(*await pending.flush()):
+                        yield event
                 
             except Exception as e:
+                # Report the steps the file got through before it failed
+                for event in file_events:
+                    yield event
+                
                 error_msg = f"Error processing {file.filename}: {str(e)}"
                 errors.append(error_msg)
                 
-                yield {
-                    "event": "message",
-                    "data": json.dumps({
-                        "type": "file_error",
-                        "job_id": job_id,
-                        "filename": file.filename,
-                        "error": error_msg,
-                        "timestamp": datetime.now().isoformat()
-                    })
-                }
+                yield frames.message("file_error", {
+                    "filename": file.filename,
+                    "error": error_msg,
+                    "timestamp": datetime.now().isoformat()
+                })
+        
+        # Embed whatever is left over from the last files, wait for the
+        # background vector store writes and report the final progress
+        for event in flush_events(*await pending.flush(final=True), final=True):
+            yield event
         
         # Update job with final results
-        if job_id in ingestion_jobs:
-            ingestion_jobs[job_id].status = IngestionStatus.COMPLETED if not errors else IngestionStatus.FAILED
-            ingestion_jobs[job_id].completed_at = datetime.now()
-            ingestion_jobs[job_id].processed_count = processed_count
-            ingestion_jobs[job_id].error_count = len(errors)
-            ingestion_jobs[job_id].document_ids = document_ids
-            ingestion_jobs[job_id].errors = errors
+        completed_at = datetime.now()
+        ingestion_jobs.update(
+            job_id,
+            status=IngestionStatus.COMPLETED if not errors else IngestionStatus.FAILED,
+            completed_at=completed_at,
+            processed_count=processed_count,
+            error_count=len(errors),
+            document_ids=document_ids,
+            errors=errors
+        )
         
         # Emit completion
-        yield {
-            "event": "message",
-            "data": json.dumps({
-                "type": "ingestion_complete",
-                "job_id": job_id,
-                "success": len(errors) == 0,
-                "processed_count": processed_count,
-                "error_count": len(errors),
-                "document_ids": document_ids,
-                "errors": errors,
-                "timestamp": datetime.now().isoformat()
-            })
-        }
+        yield frames.message("ingestion_complete", {
+            "success": len(errors) == 0,
+            "processed_count": processed_count,
+            "error_count": len(errors),
+            "document_ids": document_ids,
+            "errors": errors,
+            "timestamp": completed_at.isoformat()
+        })
         
     except Exception as e:
         # Update job with error
-        if job_id in ingestion_jobs:
-            ingestion_jobs[job_id].status = IngestionStatus.FAILED
-            ingestion_jobs[job_id].completed_at = datetime.now()
-            ingestion_jobs[job_id].errors = [f"Ingestion job error: {str(e)}"]
-        
-        yield {
-            "event": "error",
-            "data": json.dumps({
-                "type": "ingestion_error",
-                "job_id": job_id,
-                "error": f"Ingestion job failed: {str(e)}",
-                "timestamp": datetime.now().isoformat()
-            })
-        }
+        failed_at = datetime.now()
+        ingestion_jobs.update(
+            job_id,
+            status=IngestionStatus.FAILED,
+            completed_at=failed_at,
+            errors=[f"Ingestion job error: {str(e)}"]
+        )
+        
+        yield _error({
+            "type": "ingestion_error",
+            "job_id": job_id,
+            "error": f"Ingestion job failed: {str(e)}",
+            "timestamp": failed_at.isoformat()
+        })
 
 
 @router.post("/batch")
@@ -310,11 +384,7 @@ async def ingest_documents_batch(
             raise HTTPException(status_code=400, detail="Too many files (max 50)")
         
         # Validate jurisdiction and instrument type
-        try:
-            jurisdiction_enum = JurisdictionType(jurisdiction)
-            instrument_enum = InstrumentType(getattr(InstrumentType, instrument_type, InstrumentType.OTHER))
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=f"Invalid jurisdiction or instrument type: {e}")
+        jurisdiction_enum, instrument_enum = _resolve_form_enums(jurisdiction, instrument_type)
         
         # Generate job ID
         job_id = str(uuid.uuid4())
@@ -334,10 +404,10 @@ async def ingest_documents_batch(
             created_at=datetime.now()
         )
         
-        ingestion_jobs[job_id] = ingestion_job
+        ingestion_jobs.create(ingestion_job)
         
         # Return SSE stream
-        return EventSourceResponse(
+        return StreamingResponse(
             stream_ingestion_progress(
                 job_id=job_id,
                 files=files,
@@ -345,9 +415,12 @@ async def ingest_documents_batch(
                 instrument_type=instrument_enum,
                 project_id=project_id
             ),
+            media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
+                # Reason: stop Nginx-style proxies buffering the stream until it ends
+                "X-Accel-Buffering": "no",
                 "Access-Control-Allow-Origin": "*",
                 "Access-Control-Allow-Headers": "*"
             }
@@ -378,74 +451,31 @@ async def ingest_single_document(
             raise HTTPException(status_code=400, detail="No filename provided")
         
         # Validate jurisdiction and instrument type
-        try:
-            jurisdiction_enum = JurisdictionType(jurisdiction)
-            instrument_enum = InstrumentType(getattr(InstrumentType, instrument_type, InstrumentType.OTHER))
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=f"Invalid jurisdiction or instrument type: {e}")
+        jurisdiction_enum, instrument_enum = _resolve_form_enums(jurisdiction, instrument_type)
         
         # Store file
         file_id, stored_path, metadata = await storage.store_upload(file, project_id)
         
-        # Extract text content (simplified)
-        if metadata["content_type"].startswith("text/"):
-            try:
-                with open(stored_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-            except Exception as e:
-                content = f"Sample content for {file.filename}"  # Fallback for demo
-        else:
-            content = f"Sample content for {file.filename} (binary file not processed in demo)"
-        
-        if not content or len(content.strip()) == 0:
-            raise HTTPException(status_code=400, detail="No text content could be extracted from file")
-        
-        # Create document metadata
-        doc_metadata = DocumentMetadata(
-            id=file_id,
-            project_id=project_id,
-            filename=metadata["filename"],
-            title=metadata["filename"].rsplit('.', 1)[0].replace('_', ' ').title(),
-            file_path=metadata["stored_path"],
-            content_type=metadata["content_type"],
-            size_bytes=metadata["size_bytes"],
-            jurisdiction=jurisdiction_enum,
-            instrument_type=instrument_enum,
-            upload_date=datetime.now()
+        # Reason: indexed through the shared batched embedder, so concurrent
+        # single uploads coalesce into the same embedding calls
+        result = await ingest_file(
+            file_id,
+            stored_path,
+            metadata,
+            jurisdiction_enum,
+            instrument_enum,
+            project_id=project_id
         )
         
-        # Simple chunking
-        from rag.embeddings import EmbeddingChunk
-        chunks = []
-        
-        # Split content into chunks of ~500 words
-        words = content.split()
-        chunk_size = 500
-        
-        for i in range(0, len(words), chunk_size):
-            chunk_words = words[i:i + chunk_size]
-            chunk_content = " ".join(chunk_words)
-            
-            chunk = EmbeddingChunk(
-                id=f"{file_id}_chunk_{i // chunk_size}",
-                doc_id=file_id,
-                content=chunk_content,
-                chunk_index=i // chunk_size,
-                metadata=doc_metadata.dict()
-            )
-            chunks.append(chunk)
-        
-        # Generate embeddings and add to vector store
-        texts = [chunk.content for chunk in chunks]
-        embeddings = await embedding_provider.embed_texts(texts)
-        await vector_store.add_chunks_with_embeddings(chunks, embeddings)
+        if not result["chunk_count"]:
+            raise HTTPException(status_code=400, detail="No text content could be extracted from file")
         
         return {
             "success": True,
             "document_id": file_id,
             "filename": metadata["filename"],
-            "chunk_count": len(chunks),
-            "content_length": len(content),
+            "chunk_count": result["chunk_count"],
+            "content_length": result["content_length"],
             "jurisdiction": jurisdiction,
             "instrument_type": instrument_type,
             "message": "Document ingested successfully"
@@ -496,19 +526,22 @@ async def list_ingestion_jobs(
 ):
     """List ingestion jobs with filtering and pagination."""
     try:
-        # Filter jobs
-        filtered_jobs = []
-        for job in ingestion_jobs.values():
-            if status and job.status.value != status:
-                continue
-            filtered_jobs.append(job)
-        
-        # Sort by creation time (newest first)
-        filtered_jobs.sort(key=lambda x: x.created_at, reverse=True)
-        
-        # Apply pagination
-        total_count = len(filtered_jobs)
-        paginated_jobs = filtered_jobs[offset:offset + limit]
+        # Reason: jobs are stored in creation order, so newest-first is a
+        # reverse walk with no sort
+        newest_first = reversed(ingestion_jobs.values())
+        if status:
+            # Reason: the total comes from the running counts, so the walk can
+            # stop as soon as the page is full
+            try:
+                wanted = IngestionStatus(status)
+            except ValueError:
+                wanted = None
+            total_count = ingestion_jobs.status_counts[wanted] if wanted else 0
+            matching = (job for job in newest_first if job.status == wanted)
+            paginated_jobs = list(islice(matching, offset, offset + limit))
+        else:
+            total_count = len(ingestion_jobs)
+            paginated_jobs = list(islice(newest_first, offset, offset + limit))
         
         # Convert to response format
         jobs_data = []
@@ -544,15 +577,14 @@ async def get_ingestion_stats():
         # Vector store stats
         vector_stats = vector_store.get_stats()
         
-        # Job statistics
+        # Job and document statistics from the running totals
+        status_counts = ingestion_jobs.status_counts
         total_jobs = len(ingestion_jobs)
-        completed_jobs = sum(1 for job in ingestion_jobs.values() if job.status == IngestionStatus.COMPLETED)
-        failed_jobs = sum(1 for job in ingestion_jobs.values() if job.status == IngestionStatus.FAILED)
-        processing_jobs = sum(1 for job in ingestion_jobs.values() if job.status == IngestionStatus.PROCESSING)
-        
-        # Document statistics
-        total_documents = sum(len(job.document_ids) for job in ingestion_jobs.values())
-        total_errors = sum(job.error_count for job in ingestion_jobs.values())
+        completed_jobs = status_counts[IngestionStatus.COMPLETED]
+        failed_jobs = status_counts[IngestionStatus.FAILED]
+        processing_jobs = status_counts[IngestionStatus.PROCESSING]
+        total_documents = ingestion_jobs.total_documents
+        total_errors = ingestion_jobs.total_errors
         
         return {
             "vector_store": {
@@ -595,9 +627,12 @@ async def cancel_ingestion_job(job_id: str):
         
         if job.status == IngestionStatus.PROCESSING:
             # In a real implementation, this would signal the processing to stop
-            job.status = IngestionStatus.FAILED
-            job.completed_at = datetime.now()
-            job.errors.append("Job cancelled by user")
+            ingestion_jobs.update(
+                job_id,
+                status=IngestionStatus.FAILED,
+                completed_at=datetime.now(),
+                errors=job.errors + ["Job cancelled by user"]
+            )
             
             return {
                 "success": True,
@@ -605,7 +640,7 @@ async def cancel_ingestion_job(job_id: str):
             }
         else:
             # Delete completed/failed job
-            del ingestion_jobs[job_id]
+            ingestion_jobs.delete(job_id)
             
             return {
                 "success": True,
@@ -0,0 +1,22 @@
+"""
+Shared response classes for the QaAI API.
+
+JSON bodies are rendered with pydantic-core's Rust serializer, which is
+several times faster than the stdlib json module on the large list and
+search payloads and handles datetime and UUID values natively.
+"""
+
+from __future__ import annotations
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by pydantic-core instead of json.dumps."""
+
+    def render(self, content: Any) -> bytes:
+        # Reason: same compact, non-ASCII-escaped output as JSONResponse, and
+        # any datetime/UUID/model left unencoded is serialized directly
+        return to_json(content)
@@ -8,13 +8,16 @@ Following PRP requirements:
 """
 
 from __future__ import annotations
+import asyncio
+import hashlib
+import logging
 import uuid
 from typing import List, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, update, delete
+from sqlalchemy import select, func, exists, insert, update, delete
 
 from core.models import (
     VaultProject,
@@ -24,14 +27,103 @@ from core.models import (
     UploadResponse,
     SearchRequest,
     SearchResponse,
-    JurisdictionType
+    JurisdictionType,
+    InstrumentType,
+    RetrievalResult,
+    EmbeddingDocument
 )
+from core.config import settings
 from core.database import get_db, VaultProject as VaultProjectDB
 from core.storage import storage
-from rag.retrievers import difc_retriever
+from rag.embeddings import embeddings
+from rag.retrievers import get_difc_retriever
+from rag.semantic_cache import semantic_search_cache
+from agents.query_cache import query_cache
 
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Storage deletions in flight at once when a project is deleted
+STORAGE_CLEANUP_CONCURRENCY = 32
+
+# Project rows fetched from the database per batch when listing
+PROJECT_FETCH_BATCH = 50
+
+# Cache-Control for read endpoints; clients revalidate with If-None-Match after it
+READ_CACHE_CONTROL = "private, max-age=5"
+
+
+def _etag(*parts) -> str:
+    """Weak ETag for a response derived from the given values."""
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _not_modified(request: Optional[Request], response: Optional[Response], etag: str) -> Optional[Response]:
+    """
+    Attach caching headers, answering 304 when the client already holds this version.
+    
+    Returns:
+        Optional[Response]: 304 response to return as is, or None to build the body
+    """
+    headers = {"ETag": etag, "Cache-Control": READ_CACHE_CONTROL}
+    if response is not None:
+        response.headers.update(headers)
+    if request is not None:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            # Reason: If-None-Match uses weak comparison, so W/ prefixes are ignored
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if "*" in tags or etag.removeprefix("W/") in tags:
+                return Response(status_code=304, headers=headers)
+    return None
+
+
+async def _delete_project_files(project_id: str):
+    """Delete a project's stored files concurrently; one failure does not stop the rest."""
+    files = await storage.list_project_files(project_id)
+    semaphore = asyncio.Semaphore(STORAGE_CLEANUP_CONCURRENCY)
+    
+    async def delete_one(file_info: dict):
+        async with semaphore:
+            await storage.delete_file(file_info["file_id"], project_id)
+    
+    results = await asyncio.gather(*(delete_one(f) for f in files), return_exceptions=True)
+    for file_info, result in zip(files, results):
+        if isinstance(result, Exception):
+            # Log but don't fail on storage cleanup errors
+            logger.warning(
+                "Storage cleanup failed for file %s in project %s",
+                file_info["file_id"], project_id, exc_info=result
+            )
+
+
+# Columns read back for project responses
+# Reason: selecting columns returns plain rows, skipping ORM object
+# construction and identity-map bookkeeping per project
+PROJECT_COLUMNS = (
+    VaultProjectDB.id,
+    VaultProjectDB.name,
+    VaultProjectDB.visibility,
+    VaultProjectDB.document_count,
+    VaultProjectDB.created_at,
+    VaultProjectDB.updated_at,
+    VaultProjectDB.owner
+)
+
+
+def _project_from_row(db_project) -> VaultProject:
+    """Response model for a PROJECT_COLUMNS row; database rows are trusted, so field validation is skipped."""
+    return VaultProject.model_construct(
+        id=db_project.id,
+        name=db_project.name,
+        visibility=db_project.visibility,
+        document_count=db_project.document_count,
+        created_at=db_project.created_at,
+        updated_at=db_project.updated_at,
+        owner=db_project.owner
+    )
 
 
 @router.post("/projects", response_model=ProjectResponse)
@@ -43,32 +135,24 @@ async def create_project(
     try:
         # Generate project ID
         project_id = str(uuid.uuid4())
+        # Reason: one clock read, so a new project's created_at equals its updated_at
+        now = datetime.now()
         
-        # Create project in database
-        db_project = VaultProjectDB(
+        project = VaultProject(
             id=project_id,
             name=request.name,
             visibility=request.visibility,
             document_count=0,
             owner="default_user",  # In production, get from auth
-            created_at=datetime.now(),
-            updated_at=datetime.now()
+            created_at=now,
+            updated_at=now
         )
         
-        db.add(db_project)
+        # Create project in database
+        # Reason: every column is known here, so a plain INSERT skips the ORM
+        # unit of work and needs neither RETURNING nor a refresh
+        await db.execute(insert(VaultProjectDB).values(project.model_dump()))
         await db.commit()
-        await db.refresh(db_project)
-        
-        # Convert to response model
-        project = VaultProject(
-            id=db_project.id,
-            name=db_project.name,
-            visibility=db_project.visibility,
-            document_count=db_project.document_count,
-            created_at=db_project.created_at,
-            updated_at=db_project.updated_at,
-            owner=db_project.owner
-        )
         
         return ProjectResponse(
             project=project,
@@ -86,12 +170,14 @@ async def list_projects(
     limit: int = 20,
     offset: int = 0,
     visibility: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    request: Request = None,
+    response: Response = None
 ):
     """List Vault projects with pagination."""
     try:
-        # Build query
-        query = select(VaultProjectDB)
+        # Build query; every row also carries the total match count
+        query = select(*PROJECT_COLUMNS, func.count().over().label("total"))
         
         if visibility:
             query = query.where(VaultProjectDB.visibility == visibility)
@@ -99,34 +185,33 @@ async def list_projects(
         # Apply pagination
         query = query.offset(offset).limit(limit).order_by(VaultProjectDB.updated_at.desc())
         
-        # Execute query
-        result = await db.execute(query)
-        db_projects = result.scalars().all()
-        
-        # Get total count
-        count_query = select(func.count(VaultProjectDB.id))
-        if visibility:
-            count_query = count_query.where(VaultProjectDB.visibility == visibility)
-        
-        count_result = await db.execute(count_query)
-        total_count = count_result.scalar() or 0
-        
-        # Convert to response models
-        projects = []
-        for db_project in db_projects:
-            project = VaultProject(
-                id=db_project.id,
-                name=db_project.name,
-                visibility=db_project.visibility,
-                document_count=db_project.document_count,
-                created_at=db_project.created_at,
-                updated_at=db_project.updated_at,
-                owner=db_project.owner
-            )
-            projects.append(project)
+        # Execute query, collecting the plain column rows as batches arrive
+        # Reason: the result is not buffered whole, and response models are
+        # built only once the ETag shows the client needs a body
+        query = query.execution_options(yield_per=PROJECT_FETCH_BATCH)
+        rows = []
+        total_count = None
+        async for db_project in await db.stream(query):
+            total_count = db_project.total
+            rows.append(db_project)
+        
+        if total_count is None and offset:
+            # Reason: a page past the end has no row to carry the total
+            count_query = select(func.count(VaultProjectDB.id))
+            if visibility:
+                count_query = count_query.where(VaultProjectDB.visibility == visibility)
+            total_count = (await db.execute(count_query)).scalar() or 0
+        elif total_count is None:
+            total_count = 0
+        
+        versions = [(row.id, row.updated_at, row.document_count) for row in rows]
+        etag = _etag(visibility, limit, offset, total_count, versions)
+        not_modified = _not_modified(request, response, etag)
+        if not_modified is not None:
+            return not_modified
         
         return {
-            "projects": projects,
+            "projects": [_project_from_row(row) for row in rows],
             "total_count": total_count,
             "limit": limit,
             "offset": offset,
@@ -140,28 +225,27 @@ async def list_projects(
 @router.get("/projects/{project_id}")
 async def get_project(
     project_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    request: Request = None,
+    response: Response = None
 ):
     """Get a specific project by ID."""
     try:
         # Query project
-        query = select(VaultProjectDB).where(VaultProjectDB.id == project_id)
+        query = select(*PROJECT_COLUMNS).where(VaultProjectDB.id == project_id)
         result = await db.execute(query)
-        db_project = result.scalar_one_or_none()
+        db_project = result.one_or_none()
         
         if not db_project:
             raise HTTPException(status_code=404, detail="Project not found")
         
+        etag = _etag(project_id, db_project.updated_at, db_project.document_count)
+        not_modified = _not_modified(request, response, etag)
+        if not_modified is not None:
+            return not_modified
+        
         # Convert to response model
-        project = VaultProject(
-            id=db_project.id,
-            name=db_project.name,
-            visibility=db_project.visibility,
-            document_count=db_project.document_count,
-            created_at=db_project.created_at,
-            updated_at=db_project.updated_at,
-            owner=db_project.owner
-        )
+        project = _project_from_row(db_project)
         
         return {"project": project}
         
@@ -179,15 +263,7 @@ async def update_project(
 ):
     """Update a project."""
     try:
-        # Check if project exists
-        query = select(VaultProjectDB).where(VaultProjectDB.id == project_id)
-        result = await db.execute(query)
-        db_project = result.scalar_one_or_none()
-        
-        if not db_project:
-            raise HTTPException(status_code=404, detail="Project not found")
-        
-        # Update project
+        # Update project; a missing project updates no row
         update_query = (
             update(VaultProjectDB)
             .where(VaultProjectDB.id == project_id)
@@ -196,24 +272,21 @@ async def update_project(
                 visibility=request.visibility,
                 updated_at=datetime.now()
             )
+            .returning(*PROJECT_COLUMNS)
+            # Reason: nothing is loaded in the session to keep in sync, and
+            # "fetch" synchronization would cost a SELECT where RETURNING is unsupported
+            .execution_options(synchronize_session=False)
         )
         
-        await db.execute(update_query)
-        await db.commit()
+        result = await db.execute(update_query)
+        updated_project = result.one_or_none()
         
-        # Get updated project
-        result = await db.execute(query)
-        updated_project = result.scalar_one()
+        if not updated_project:
+            raise HTTPException(status_code=404, detail="Project not found")
         
-        project = VaultProject(
-            id=updated_project.id,
-            name=updated_project.name,
-            visibility=updated_project.visibility,
-            document_count=updated_project.document_count,
-            created_at=updated_project.created_at,
-            updated_at=updated_project.updated_at,
-            owner=updated_project.owner
-        )
+        await db.commit()
+        
+        project = _project_from_row(updated_project)
         
         return ProjectResponse(
             project=project,
@@ -235,27 +308,25 @@ async def delete_project(
 ):
     """Delete a project and all its documents."""
     try:
-        # Check if project exists
-        query = select(VaultProjectDB).where(VaultProjectDB.id == project_id)
-        result = await db.execute(query)
-        db_project = result.scalar_one_or_none()
+        # Delete project from database; a missing project deletes no row
+        delete_query = (
+            delete(VaultProjectDB)
+            .where(VaultProjectDB.id == project_id)
+            .returning(VaultProjectDB.id)
+        )
+        result = await db.execute(delete_query)
         
-        if not db_project:
+        if result.scalar_one_or_none() is None:
             raise HTTPException(status_code=404, detail="Project not found")
         
+        await db.commit()
+        
         # Delete project files from storage
         try:
-            files = await storage.list_project_files(project_id)
-            for file_info in files:
-                await storage.delete_file(file_info["file_id"], project_id)
-        except Exception as e:
+            await _delete_project_files(project_id)
+        except OSError as e:
             # Log but don't fail on storage cleanup errors
-            print(f"Storage cleanup warning: {e}")
-        
-        # Delete project from database
-        delete_query = delete(VaultProjectDB).where(VaultProjectDB.id == project_id)
-        await db.execute(delete_query)
-        await db.commit()
+            logger.warning("Storage cleanup failed for project %s", project_id, exc_info=e)
         
         return {
             "success": True,
@@ -278,21 +349,21 @@ async def upload_document(
     db: AsyncSession = Depends(get_db)
 ):
     """Upload a document to a project."""
+    file_id = None
     try:
-        # Verify project exists
-        query = select(VaultProjectDB).where(VaultProjectDB.id == project_id)
-        result = await db.execute(query)
-        db_project = result.scalar_one_or_none()
-        
-        if not db_project:
-            raise HTTPException(status_code=404, detail="Project not found")
-        
         # Validate file
         if not file.filename:
             raise HTTPException(status_code=400, detail="No filename provided")
+        jurisdiction_type = JurisdictionType(jurisdiction)
+        
+        # Verify project exists; a plain read takes no row lock
+        query = select(exists().where(VaultProjectDB.id == project_id))
+        if not (await db.execute(query)).scalar():
+            raise HTTPException(status_code=404, detail="Project not found")
         
-        # Store file
+        # Store file before touching the project row
         file_id, stored_path, metadata = await storage.store_upload(file, project_id)
+        now = datetime.now()
         
         # Create document metadata
         document = DocumentMetadata(
@@ -303,23 +374,34 @@ async def upload_document(
             file_path=metadata["stored_path"],
             content_type=metadata["content_type"],
             size_bytes=metadata["size_bytes"],
-            jurisdiction=JurisdictionType(jurisdiction),
-            instrument_type=getattr(__import__('..core.models', fromlist=['InstrumentType']).InstrumentType, instrument_type, 
-                                  __import__('..core.models', fromlist=['InstrumentType']).InstrumentType.OTHER),
-            upload_date=datetime.now()
+            jurisdiction=jurisdiction_type,
+            instrument_type=getattr(InstrumentType, instrument_type, InstrumentType.OTHER),
+            upload_date=now
         )
         
-        # Update project document count
+        # Reason: the row lock taken by the count update is held only until
+        # the commit right after it, never across the file write
         update_query = (
             update(VaultProjectDB)
             .where(VaultProjectDB.id == project_id)
             .values(
                 document_count=VaultProjectDB.document_count + 1,
-                updated_at=datetime.now()
+                updated_at=now
             )
+            .returning(VaultProjectDB.id)
+            .execution_options(synchronize_session=False)
         )
-        await db.execute(update_query)
+        result = await db.execute(update_query)
+        
+        if result.scalar_one_or_none() is None:
+            # Project was deleted while the file was being stored
+            raise HTTPException(status_code=404, detail="Project not found")
+        
         await db.commit()
+        file_id = None
+        
+        # Reason: cached answers may predate this document
+        query_cache.clear()
         
         return UploadResponse(
             document=document,
@@ -328,9 +410,14 @@ async def upload_document(
         )
         
     except HTTPException:
+        if file_id is not None:
+            await db.rollback()
+            await storage.delete_file(file_id, project_id)
         raise
     except Exception as e:
         await db.rollback()
+        if file_id is not None:
+            await storage.delete_file(file_id, project_id)
         raise HTTPException(status_code=500, detail=f"Upload error: {str(e)}")
 
 
@@ -339,16 +426,15 @@ async def list_documents(
     project_id: str,
     limit: int = 20,
     offset: int = 0,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    request: Request = None,
+    response: Response = None
 ):
     """List documents in a project."""
     try:
         # Verify project exists
-        query = select(VaultProjectDB).where(VaultProjectDB.id == project_id)
-        result = await db.execute(query)
-        db_project = result.scalar_one_or_none()
-        
-        if not db_project:
+        query = select(exists().where(VaultProjectDB.id == project_id))
+        if not (await db.execute(query)).scalar():
             raise HTTPException(status_code=404, detail="Project not found")
         
         # Get documents from storage
@@ -358,6 +444,14 @@ async def list_documents(
         total_count = len(files)
         paginated_files = files[offset:offset + limit]
         
+        etag = _etag(
+            project_id, limit, offset, total_count,
+            [(f["file_id"], f["modified_at"], f["size_bytes"]) for f in paginated_files]
+        )
+        not_modified = _not_modified(request, response, etag)
+        if not_modified is not None:
+            return not_modified
+        
         return {
             "documents": paginated_files,
             "total_count": total_count,
@@ -372,6 +466,44 @@ async def list_documents(
         raise HTTPException(status_code=500, detail=f"Document listing error: {str(e)}")
 
 
+def _abandon(task: asyncio.Task):
+    """Cancel a task whose result is no longer needed without leaving its error unretrieved."""
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+async def _search_matches(project_id: str, query: str, limit: int):
+    """
+    Project matches for a query, served from the semantic cache when a
+    near-identical query was searched before.
+    
+    The query is embedded once here and reused by the retriever on a miss.
+    """
+    retriever = get_difc_retriever()
+    if not settings.vault_search_cache_enabled:
+        return await retriever.search_vault_project(query=query, project_id=project_id, limit=limit)
+    
+    query_vector = await embeddings.embed_query(query)
+    if not query_vector:
+        return await retriever.search_vault_project(query=query, project_id=project_id, limit=limit)
+    
+    generation = retriever.vector_store.generation
+    cached = await semantic_search_cache.lookup(query_vector, project_id, limit, generation)
+    if cached is not None:
+        return cached
+    
+    # Reason: fetching the larger top-k lets later, wider searches hit the cache
+    fetch = max(limit, semantic_search_cache.stored_top_k)
+    matches = await retriever.search_vault_project(
+        query=query,
+        project_id=project_id,
+        limit=fetch,
+        query_vector=query_vector
+    )
+    await semantic_search_cache.set(query_vector, project_id, matches, fetch, generation)
+    return matches[:limit]
+
+
 @router.post("/projects/{project_id}/search", response_model=SearchResponse)
 async def search_project(
     project_id: str,
@@ -380,45 +512,54 @@ async def search_project(
 ):
     """Search documents within a project using RAG."""
     try:
-        # Verify project exists
-        query = select(VaultProjectDB).where(VaultProjectDB.id == project_id)
-        result = await db.execute(query)
-        db_project = result.scalar_one_or_none()
+        # Perform search using RAG retriever
+        # Reason: embedding and vector search don't depend on the existence
+        # check, so they run while the database answers it
+        search = asyncio.create_task(_search_matches(project_id, request.query, request.limit))
         
-        if not db_project:
+        # Verify project exists
+        try:
+            query = select(exists().where(VaultProjectDB.id == project_id))
+            found = (await db.execute(query)).scalar()
+        except BaseException:
+            _abandon(search)
+            raise
+        
+        if not found:
+            _abandon(search)
             raise HTTPException(status_code=404, detail="Project not found")
         
-        # Perform search using RAG retriever
-        matches = await difc_retriever.search_vault_project(
-            query=request.query,
-            project_id=project_id,
-            limit=request.limit
-        )
+        matches = await search
         
         # Convert matches to retrieval results
+        # Reason: fields shared by every result are built once per search, and
+        # metadata from the index is trusted, so it skips validation
+        shared = {
+            "project_id": project_id,
+            "jurisdiction": JurisdictionType.DIFC,
+            "instrument_type": InstrumentType.OTHER,
+            "upload_date": datetime.now()
+        }
         results = []
         for match in matches:
-            from core.models import RetrievalResult, EmbeddingDocument
-            
+            chunk = match.chunk
+            md = chunk.metadata or {}
             result = RetrievalResult(
                 document=EmbeddingDocument(
-                    id=match.chunk.id,
-                    content=match.chunk.content,
-                    metadata=DocumentMetadata(
-                        id=match.chunk.doc_id,
-                        project_id=project_id,
-                        filename=match.chunk.metadata.get("filename", "Unknown") if match.chunk.metadata else "Unknown",
-                        title=match.chunk.metadata.get("title", "Unknown") if match.chunk.metadata else "Unknown",
-                        file_path=match.chunk.metadata.get("file_path", "") if match.chunk.metadata else "",
-                        content_type=match.chunk.metadata.get("content_type", "") if match.chunk.metadata else "",
-                        size_bytes=match.chunk.metadata.get("size_bytes", 0) if match.chunk.metadata else 0,
-                        jurisdiction=JurisdictionType.DIFC,
-                        instrument_type=getattr(__import__('..core.models', fromlist=['InstrumentType']).InstrumentType, 'OTHER'),
-                        upload_date=datetime.now()
+                    id=chunk.id,
+                    content=chunk.content,
+                    metadata=DocumentMetadata.model_construct(
+                        id=chunk.doc_id,
+                        filename=md.get("filename", "Unknown"),
+                        title=md.get("title", "Unknown"),
+                        file_path=md.get("file_path", ""),
+                        content_type=md.get("content_type", ""),
+                        size_bytes=md.get("size_bytes", 0),
+                        **shared
                     )
                 ),
                 score=match.score,
-                chunk_index=match.chunk.chunk_index
+                chunk_index=chunk.chunk_index
             )
             results.append(result)
         
@@ -438,27 +579,37 @@ async def search_project(
 @router.get("/projects/{project_id}/stats")
 async def get_project_stats(
     project_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    request: Request = None,
+    response: Response = None
 ):
     """Get project statistics."""
     try:
         # Verify project exists
-        query = select(VaultProjectDB).where(VaultProjectDB.id == project_id)
+        query = select(
+            VaultProjectDB.created_at, VaultProjectDB.updated_at, VaultProjectDB.visibility
+        ).where(VaultProjectDB.id == project_id)
         result = await db.execute(query)
-        db_project = result.scalar_one_or_none()
+        db_project = result.one_or_none()
         
         if not db_project:
             raise HTTPException(status_code=404, detail="Project not found")
         
         # Get storage statistics
-        storage_stats = storage.get_storage_stats()
-        files = await storage.list_project_files(project_id)
+        aggregate = await storage.get_project_aggregate(project_id)
+        project_size = aggregate["total_size"]
         
-        project_size = sum(f.get("size_bytes", 0) for f in files)
+        etag = _etag(
+            project_id, aggregate["count"], project_size,
+            db_project.created_at, db_project.updated_at, db_project.visibility
+        )
+        not_modified = _not_modified(request, response, etag)
+        if not_modified is not None:
+            return not_modified
         
         return {
             "project_id": project_id,
-            "document_count": len(files),
+            "document_count": aggregate["count"],
             "total_size_bytes": project_size,
             "total_size_mb": round(project_size / (1024 * 1024), 2),
             "created_at": db_project.created_at.isoformat(),
@@ -92,6 +92,7 @@ async def stream_workflow_execution(
                         "run_id": run_id,
                         "node": event.get("node", "unknown"),
                         "progress": "Drafting in progress...",
+                        "delta": event.get("delta", ""),
                         "timestamp": datetime.now().isoformat()
                     })
                 }
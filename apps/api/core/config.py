@@ -31,6 +31,8 @@ class Settings(BaseSettings):
     
     # Storage & Database
     storage_path: Path = Field(Path("./data/files"), env="STORAGE_PATH")
+    storage_listing_cache_ttl: float = Field(30.0, env="STORAGE_LISTING_CACHE_TTL")
+    storage_listing_cache_max_projects: int = Field(1024, env="STORAGE_LISTING_CACHE_MAX_PROJECTS")
     db_url: str = Field("sqlite+aiosqlite:///./data/qaai.db", env="DB_URL")
     vector_store: str = Field("faiss", env="VECTOR_STORE")
     index_dir: Path = Field(Path("./data/index"), env="INDEX_DIR")
@@ -40,6 +42,11 @@ class Settings(BaseSettings):
     embeddings_model: str = Field("all-MiniLM-L6-v2", env="EMBEDDINGS_MODEL")
     chunk_size: int = Field(800, env="CHUNK_SIZE")
     chunk_overlap: int = Field(120, env="CHUNK_OVERLAP")
+    ingest_embedding_batch_size: int = Field(64, env="INGEST_EMBEDDING_BATCH_SIZE")
+    ingest_embedding_token_budget: int = Field(30_000, env="INGEST_EMBEDDING_TOKEN_BUDGET")
+    ingest_embedding_concurrency: int = Field(8, env="INGEST_EMBEDDING_CONCURRENCY")
+    ingest_embedding_linger: float = Field(0.02, env="INGEST_EMBEDDING_LINGER")
+    max_ingestion_jobs: int = Field(10_000, env="MAX_INGESTION_JOBS")
     
     # DIFC Configuration - jurisdiction-first approach
     default_jurisdiction: str = Field("DIFC", env="DEFAULT_JURISDICTION")
@@ -48,8 +55,36 @@ class Settings(BaseSettings):
     # Application
     app_env: str = Field("dev", env="APP_ENV")
     log_level: str = Field("INFO", env="LOG_LEVEL")
+    # Worker threads for blocking work (uploads, file scans, index search);
+    # unset means max(32, 4 x CPU count)
+    worker_threads: Optional[int] = Field(None, env="WORKER_THREADS")
     backend_url: str = Field("http://localhost:8000", env="BACKEND_URL")
     
+    # SSE Streaming - bounded buffer between workflow and slow clients
+    sse_max_queue_size: int = Field(64, env="SSE_MAX_QUEUE_SIZE")
+    sse_queue_timeout: float = Field(5.0, env="SSE_QUEUE_TIMEOUT")
+    sse_ping_interval: float = Field(15.0, env="SSE_PING_INTERVAL")
+    
+    # Node cache - reused workflow node outputs
+    node_cache_max_entries: int = Field(1024, env="NODE_CACHE_MAX_ENTRIES")
+    
+    # Query Cache - exact + semantic reuse of completed assistant responses
+    query_cache_enabled: bool = Field(True, env="QUERY_CACHE_ENABLED")
+    query_cache_max_entries: int = Field(256, env="QUERY_CACHE_MAX_ENTRIES")
+    query_cache_ttl: float = Field(3600.0, env="QUERY_CACHE_TTL")
+    query_cache_semantic: bool = Field(False, env="QUERY_CACHE_SEMANTIC")
+    query_cache_similarity: float = Field(0.95, env="QUERY_CACHE_SIMILARITY")
+    
+    # Vault search cache - reuse project matches for near-identical queries
+    vault_search_cache_enabled: bool = Field(True, env="VAULT_SEARCH_CACHE_ENABLED")
+    vault_search_cache_max_entries: int = Field(1024, env="VAULT_SEARCH_CACHE_MAX_ENTRIES")
+    vault_search_cache_similarity: float = Field(0.95, env="VAULT_SEARCH_CACHE_SIMILARITY")
+    vault_search_cache_top_k: int = Field(20, env="VAULT_SEARCH_CACHE_TOP_K")
+    vault_search_cache_lsh_bits: int = Field(8, env="VAULT_SEARCH_CACHE_LSH_BITS")
+    
+    # Metadata endpoints (/models, /knowledge-sources) - refresh interval
+    metadata_cache_ttl: float = Field(30.0, env="METADATA_CACHE_TTL")
+    
     # Optional: Supabase integration
     supabase_url: Optional[str] = Field(None, env="SUPABASE_URL")
     supabase_anon_key: Optional[str] = Field(None, env="SUPABASE_ANON_KEY")
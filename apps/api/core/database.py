@@ -2,7 +2,7 @@
 Async SQLite database management for QaAI.
 
 Following 2025 best practices:
-- Use aiosqlite driver for async operations
+- Use aiosqlite driver for async operations (asyncpg for PostgreSQL)
 - Proper session management with dependency injection
 - expire_on_commit=False for async sessions
 - Prevent sync/async mixing as specified in gotchas
@@ -13,10 +13,10 @@ import sqlite3
 import aiosqlite
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import AsyncGenerator, Optional
+from typing import Any, AsyncGenerator, Dict, Optional, Tuple
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Index, desc
 from sqlalchemy.sql import func
 
 from .config import settings
@@ -51,6 +51,18 @@ class VaultProject(Base):
     owner = Column(String, nullable=False)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    # Reason: list_projects filters by visibility and pages newest first;
+    # these let it range-scan the index instead of sorting the table
+    __table_args__ = (
+        Index(
+            "ix_vault_projects_vis_updated",
+            "visibility",
+            desc("updated_at"),
+            postgresql_include=["name", "owner", "document_count"]
+        ),
+        Index("ix_vault_projects_updated", desc("updated_at")),
+    )
 
 
 class Chunk(Base):
@@ -63,11 +75,40 @@ class Chunk(Base):
     section_ref = Column(String, nullable=True)
 
 
+# Sync PostgreSQL driver prefixes that are swapped for the native async driver
+_SYNC_POSTGRES_PREFIXES = ("postgresql://", "postgres://", "postgresql+psycopg2://")
+
+
+def _engine_options(db_url: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Resolve the async driver URL and driver-specific engine options.
+    
+    PostgreSQL URLs always use asyncpg, which is natively async instead of
+    running each query through a thread pool. JIT is turned off because it
+    slows the short metadata queries the API issues. SQLite URLs are used as is.
+    
+    Returns:
+        Tuple[str, Dict[str, Any]]: (engine URL, extra create_async_engine kwargs)
+    """
+    for prefix in _SYNC_POSTGRES_PREFIXES:
+        if db_url.startswith(prefix):
+            db_url = "postgresql+asyncpg://" + db_url[len(prefix):]
+            break
+    
+    if db_url.startswith("postgresql+asyncpg://"):
+        # Reason: the async engine pools asyncpg connections with
+        # AsyncAdaptedQueuePool by default; only the server settings differ
+        return db_url, {"connect_args": {"server_settings": {"jit": "off"}}}
+    return db_url, {}
+
+
 # Async engine and session factory
+_engine_url, _engine_kwargs = _engine_options(settings.db_url)
 engine = create_async_engine(
-    settings.db_url,
+    _engine_url,
     echo=settings.app_env == "dev",  # Log SQL in development
-    future=True
+    future=True,
+    **_engine_kwargs
 )
 
 # Session factory with expire_on_commit=False for async compatibility
@@ -93,6 +134,15 @@ async def init_database():
     async with engine.begin() as conn:
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+        # create_all skips existing tables, so add indexes introduced since
+        await conn.run_sync(_create_missing_indexes)
+
+
+def _create_missing_indexes(conn):
+    """Create model indexes missing from tables that already existed."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -6,8 +6,9 @@ Includes all models for Assistant, Vault, RAG, and LangGraph workflow state.
 """
 
 from __future__ import annotations
+import operator
 from pydantic import BaseModel, Field
-from typing import List, Optional, Literal, Dict, Any, TypedDict
+from typing import List, Optional, Literal, Dict, Any, TypedDict, Annotated
 from datetime import datetime
 from enum import Enum
 
@@ -86,6 +87,12 @@ class StreamDone(BaseModel):
     citations: List[Citation] = Field(default_factory=list)
 
 
+class StreamError(BaseModel):
+    """Error event terminating the stream."""
+    error: str = Field(..., description="Error message")
+    node: Optional[str] = Field(None, description="Workflow node that failed")
+
+
 # Vault Models
 class VaultProject(BaseModel):
     """Vault project for document organization."""
@@ -119,6 +126,9 @@ class WorkflowState(TypedDict, total=False):
     
     Using TypedDict with total=False for partial updates as specified in gotchas.
     All node functions must return state updates, not modify in place.
+    Nodes return only the keys they change. `thinking` and `citations` are
+    append-only reducer channels: nodes return just the new entries and
+    LangGraph concatenates them.
     """
     prompt: str
     template_doc_id: Optional[str]
@@ -126,11 +136,17 @@ class WorkflowState(TypedDict, total=False):
     jurisdiction: JurisdictionType
     plan: str
     retrieved_context: List[Dict[str, Any]]
-    citations: List[Citation]
+    citations: Annotated[List[Citation], operator.add]
     draft: str
-    thinking: List[str]  # For emit() pattern
+    verification_result: str
+    verification_passed: bool
+    final_output: Dict[str, Any]
+    export_data: Dict[str, Any]
+    thinking: Annotated[List[str], operator.add]  # For emit() pattern
     error: Optional[str]
     model_override: Optional[str]  # Manual model selection
+    models_validated: bool  # Set by the graph once model routing has been validated
+    model_routing: Dict[str, str]  # Role -> model name, resolved once per run
 
 
 # RAG Models
@@ -8,7 +8,10 @@ the local-first approach specified in requirements.
 from __future__ import annotations
 import asyncio
 import hashlib
+import os
 import shutil
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, BinaryIO, AsyncGenerator, Union
 from datetime import datetime
@@ -17,17 +20,47 @@ from uuid import uuid4
 from .config import settings
 
 
+# Bytes copied per read when streaming an upload to disk
+UPLOAD_BLOCK_SIZE = 1 << 20
+
+
+class _HashingReader:
+    """File-like wrapper that hashes and counts bytes as they are read."""
+    
+    def __init__(self, source: BinaryIO):
+        self._source = source
+        self.hasher = hashlib.sha256()
+        self.size = 0
+    
+    def read(self, size: int = -1) -> bytes:
+        block = self._source.read(size)
+        self.hasher.update(block)
+        self.size += len(block)
+        return block
+
+
 class StorageManager:
     """
     Local filesystem storage manager.
     
     Organizes files by project and type, handles deduplication,
     and provides secure file operations.
+    
+    Project file listings are cached per process for
+    storage_listing_cache_ttl seconds. Writes and deletes made through this
+    manager invalidate their project at once; with several workers or nodes
+    sharing the storage, other processes see changes after the TTL (a shared
+    invalidation channel such as Redis pub/sub would be needed to tighten that).
     """
     
     def __init__(self, base_path: Optional[Path] = None):
         self.base_path = base_path or settings.storage_path
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self.listing_ttl = settings.storage_listing_cache_ttl
+        self.listing_max_projects = settings.storage_listing_cache_max_projects
+        # project_id -> (expires_at, files newest first, total size in bytes)
+        self._project_files: "OrderedDict[str, tuple[float, list[dict], int]]" = OrderedDict()
+        self._listing_invalidations = 0
     
     def _get_file_hash(self, file_path: Path) -> str:
         """Calculate SHA-256 hash of file for deduplication."""
@@ -62,6 +95,16 @@ class StorageManager:
         Returns:
             tuple[str, Path]: (file_id, stored_path)
         """
+        # Reason: disk writes block; keep them off the event loop
+        return await asyncio.to_thread(self._write_file, file_content, filename, project_id)
+    
+    def _write_file(
+        self,
+        file_content: Union[bytes, BinaryIO],
+        filename: str,
+        project_id: str
+    ) -> tuple[str, Path]:
+        """Write file content to the project directory (blocking)."""
         # Generate unique file ID
         file_id = str(uuid4())
         
@@ -72,20 +115,53 @@ class StorageManager:
         safe_filename = self._sanitize_filename(filename)
         stored_path = project_path / f"{file_id}_{safe_filename}"
         
-        # Write file content
-        if isinstance(file_content, bytes):
-            stored_path.write_bytes(file_content)
-        else:
-            # Handle file-like object
-            with open(stored_path, 'wb') as dest:
-                if hasattr(file_content, 'read'):
-                    while chunk := file_content.read(8192):
-                        dest.write(chunk)
-                else:
-                    dest.write(file_content)
+        # Reason: invalidating before stops scans already running from being
+        # cached; invalidating after drops any listing cached mid-write
+        self._invalidate_listing(project_id)
+        try:
+            # Write file content
+            if isinstance(file_content, bytes):
+                stored_path.write_bytes(file_content)
+            else:
+                # Handle file-like object
+                with open(stored_path, 'wb') as dest:
+                    if hasattr(file_content, 'read'):
+                        while chunk := file_content.read(UPLOAD_BLOCK_SIZE):
+                            dest.write(chunk)
+                    else:
+                        dest.write(file_content)
+        finally:
+            self._invalidate_listing(project_id)
         
         return file_id, stored_path
     
+    def _upload_metadata(self, upload_file, reader: _HashingReader, stored_path: Path) -> dict:
+        """Metadata recorded for a stored upload."""
+        return {
+            "filename": upload_file.filename,
+            "content_type": upload_file.content_type,
+            "size_bytes": reader.size,
+            "file_hash": reader.hasher.hexdigest(),
+            "stored_path": stored_path.relative_to(self.base_path).as_posix()
+        }
+    
+    def _write_upload(self, upload_file, project_id: str) -> tuple[str, Path, dict]:
+        """
+        Stream an upload to the project directory (blocking).
+        
+        The upload is copied in blocks straight from its spooled file, and
+        hashed and measured in the same pass, so it is never held in memory
+        whole.
+        """
+        source = upload_file.file
+        source.seek(0)
+        reader = _HashingReader(source)
+        try:
+            file_id, stored_path = self._write_file(reader, upload_file.filename, project_id)
+        finally:
+            source.seek(0)  # Reset for potential re-reading
+        return file_id, stored_path, self._upload_metadata(upload_file, reader, stored_path)
+    
     async def store_upload(
         self,
         upload_file,  # FastAPI UploadFile
@@ -97,28 +173,32 @@ class StorageManager:
         Returns:
             tuple[str, Path, dict]: (file_id, stored_path, metadata)
         """
-        # Read file content
-        content = await upload_file.read()
-        await upload_file.seek(0)  # Reset for potential re-reading
-        
-        # Store file
-        file_id, stored_path = await self.store_file(
-            content,
-            upload_file.filename,
-            project_id,
-            upload_file.content_type or "application/octet-stream"
-        )
-        
-        # Extract metadata
-        metadata = {
-            "filename": upload_file.filename,
-            "content_type": upload_file.content_type,
-            "size_bytes": len(content),
-            "file_hash": hashlib.sha256(content).hexdigest(),
-            "stored_path": stored_path.relative_to(self.base_path).as_posix()
-        }
+        # Reason: reading the spooled upload and writing it both block
+        return await asyncio.to_thread(self._write_upload, upload_file, project_id)
+    
+    async def store_uploads(
+        self,
+        upload_files: list,  # FastAPI UploadFiles
+        project_id: str
+    ) -> list:
+        """
+        Store a batch of uploads with a single worker thread hop.
         
-        return file_id, stored_path, metadata
+        Returns:
+            list: (file_id, stored_path, metadata) per upload, in order, or
+            the exception raised while storing that upload
+        """
+        return await asyncio.to_thread(self._write_uploads, upload_files, project_id)
+    
+    def _write_uploads(self, upload_files: list, project_id: str) -> list:
+        """Stream a batch of uploads to disk, collecting per-file failures (blocking)."""
+        results = []
+        for upload_file in upload_files:
+            try:
+                results.append(self._write_upload(upload_file, project_id))
+            except Exception as e:
+                results.append(e)
+        return results
     
     def get_file_path(self, file_id: str, project_id: str) -> Optional[Path]:
         """Get path to stored file."""
@@ -160,14 +240,90 @@ class StorageManager:
     
     async def delete_file(self, file_id: str, project_id: str) -> bool:
         """Delete stored file."""
+        # Reason: the directory scan and unlink block; concurrent deletes
+        # then run in parallel worker threads
+        return await asyncio.to_thread(self._delete_file, file_id, project_id)
+    
+    def _delete_file(self, file_id: str, project_id: str) -> bool:
+        """Delete stored file (blocking)."""
         file_path = self.get_file_path(file_id, project_id)
         if file_path and file_path.exists():
-            file_path.unlink()
+            # Reason: same before/after invalidation as _write_file
+            self._invalidate_listing(project_id)
+            try:
+                file_path.unlink()
+            finally:
+                self._invalidate_listing(project_id)
             return True
         return False
     
     async def list_project_files(self, project_id: str) -> list[dict]:
-        """List all files in project."""
+        """List all files in project, newest first."""
+        files, _ = await self.project_files_summary(project_id)
+        return list(files)
+    
+    async def project_files_summary(self, project_id: str) -> tuple[list[dict], int]:
+        """
+        List a project's files together with their total size.
+        
+        Returns:
+            tuple[list[dict], int]: (files newest first, total size in bytes);
+            the list is shared with the cache and must not be modified
+        """
+        entry = self._project_files.get(project_id)
+        if entry is not None:
+            expires_at, files, total_size = entry
+            if expires_at >= time.monotonic():
+                self._project_files.move_to_end(project_id)
+                return files, total_size
+            self._project_files.pop(project_id, None)
+        
+        # Reason: the directory scan and per-file stats block
+        invalidations = self._listing_invalidations
+        files = await asyncio.to_thread(self._scan_project_files, project_id)
+        total_size = sum(f["size_bytes"] for f in files)
+        if invalidations != self._listing_invalidations:
+            # A write or delete landed mid-scan; don't cache a possibly stale listing
+            return files, total_size
+        self._project_files[project_id] = (time.monotonic() + self.listing_ttl, files, total_size)
+        self._project_files.move_to_end(project_id)
+        while len(self._project_files) > self.listing_max_projects:
+            self._project_files.popitem(last=False)
+        return files, total_size
+    
+    async def get_project_aggregate(self, project_id: str) -> dict:
+        """
+        Count a project's files and their total size without listing them.
+        
+        Returns:
+            dict: {"count": int, "total_size": int}
+        """
+        entry = self._project_files.get(project_id)
+        if entry is not None and entry[0] >= time.monotonic():
+            _, files, total_size = entry
+            return {"count": len(files), "total_size": total_size}
+        return await asyncio.to_thread(self._scan_project_aggregate, project_id)
+    
+    def _scan_project_aggregate(self, project_id: str) -> dict:
+        """Count and size a project's files in one scandir pass (blocking)."""
+        count = 0
+        total_size = 0
+        # Reason: DirEntry.is_file() uses the type from the directory read and
+        # stat() is cached on the entry, so each file costs at most one syscall
+        with os.scandir(self._get_project_path(project_id)) as entries:
+            for entry in entries:
+                if "_" in entry.name and entry.is_file():
+                    count += 1
+                    total_size += entry.stat().st_size
+        return {"count": count, "total_size": total_size}
+    
+    def _invalidate_listing(self, project_id: str):
+        """Forget a project's cached file listing."""
+        self._listing_invalidations += 1
+        self._project_files.pop(project_id, None)
+    
+    def _scan_project_files(self, project_id: str) -> list[dict]:
+        """List all files in project (blocking)."""
         project_path = self._get_project_path(project_id)
         files = []
         
@@ -9,22 +9,28 @@ Following PRP requirements:
 """
 
 from __future__ import annotations
+import asyncio
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from typing import Dict, Any
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import anyio.to_thread
 import uvicorn
 
 from core.config import settings
 from core.database import init_database, close_database, health_check
+from api.responses import FastJSONResponse
 from api.assistant import router as assistant_router
 from api.vault import router as vault_router  
 from api.workflows import router as workflows_router
 from api.ingest import router as ingest_router
-from agents.router import model_router
+from agents.router import get_model_router
+from rag.retrievers import get_difc_retriever
 from rag.vector_store import vector_store
 
 
@@ -36,6 +42,27 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def configure_worker_threads() -> int:
+    """
+    Size the thread pools that blocking work is offloaded to.
+    
+    asyncio.to_thread (upload writes and hashing, file scans, index search)
+    runs on the loop's default executor, whose stock size of
+    min(32, CPU count + 4) serializes concurrent uploads on small machines.
+    Starlette's threadpool (UploadFile reads, sync dependencies) is sized
+    to match.
+    
+    Returns:
+        int: Number of worker threads
+    """
+    workers = settings.worker_threads or max(32, (os.cpu_count() or 1) * 4)
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=workers, thread_name_prefix="qaai-worker")
+    )
+    anyio.to_thread.current_default_thread_limiter().total_tokens = workers
+    return workers
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -47,17 +74,23 @@ async def lifespan(app: FastAPI):
     logger.info("Starting QaAI application")
     
     try:
+        workers = configure_worker_threads()
+        logger.info(f"Worker threads: {workers}")
+        
         # Initialize database
         await init_database()
         logger.info("Database initialized")
         
         # Validate model availability
-        validation = model_router.validate_model_availability()
+        validation = get_model_router().validate_model_availability()
         if not validation["valid"]:
             logger.warning(f"Model availability issues: {validation['issues']}")
         else:
             logger.info(f"Models available: {validation['available_count']}/{validation['total_count']}")
         
+        # Warm retrieval so the first /query does not pay index loading
+        await get_difc_retriever().warmup()
+        
         # Check vector store
         vector_stats = vector_store.get_stats()
         logger.info(f"Vector store status: {vector_stats}")
@@ -83,6 +116,7 @@ app = FastAPI(
     description="Harvey-style legal AI assistant with DIFC focus",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     docs_url="/docs" if settings.app_env == "dev" else None,
     redoc_url="/redoc" if settings.app_env == "dev" else None
 )
@@ -106,7 +140,7 @@ async def health_check_endpoint():
         db_healthy = await health_check()
         
         # Model router health
-        model_validation = model_router.validate_model_availability()
+        model_validation = get_model_router().validate_model_availability()
         
         # Vector store health
         vector_stats = vector_store.get_stats()
@@ -150,7 +184,7 @@ async def api_status():
                 "sse_streaming": True,
                 "citation_verification": True
             },
-            "model_routing": model_router.get_routing_status(),
+            "model_routing": get_model_router().get_routing_status(),
             "vector_store": vector_store.get_stats(),
             "rate_limits": {
                 "openai": "50 requests/minute",
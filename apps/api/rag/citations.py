@@ -8,6 +8,7 @@ Extends examples/citations_check.py with:
 """
 
 from __future__ import annotations
+import functools
 import re
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
@@ -62,14 +63,8 @@ def jaccard_similarity(text1: str, text2: str) -> float:
     
     Following examples/citations_check.py implementation.
     """
-    norm1 = normalize_text(text1)
-    norm2 = normalize_text(text2)
-    
-    if not norm1 or not norm2:
-        return 0.0
-    
-    set1 = set(norm1.split())
-    set2 = set(norm2.split())
+    set1 = _token_set(text1)
+    set2 = _token_set(text2)
     
     if not set1 or not set2:
         return 0.0
@@ -80,24 +75,43 @@ def jaccard_similarity(text1: str, text2: str) -> float:
     return intersection / union if union > 0 else 0.0
 
 
-def extract_legal_terms(text: str) -> set[str]:
-    """Extract legal terms and phrases for enhanced matching."""
-    legal_patterns = [
-        r'\b(article|section|part|chapter|clause|paragraph|subsection)\s+\d+[a-z]?\b',
-        r'\b(law|regulation|rule|act|code|statute|ordinance)\b',
-        r'\b(difc|dfsa|uae|dubai|emirates)\b',
-        r'\b(employment|data\s+protection|commercial|corporate|financial)\b',
-        r'\b(shall|must|may|required|prohibited|permitted)\b'
-    ]
+@functools.lru_cache(maxsize=1024)
+def _token_set(text: str) -> frozenset[str]:
+    """
+    Normalized word set for a text, cached by the raw string.
     
+    Reason: a query is scored against every retrieved candidate and titles
+    repeat across chunks of one document, so each distinct text is
+    tokenized once instead of three times per candidate.
+    """
+    return frozenset(normalize_text(text).split())
+
+
+_LEGAL_PATTERNS = [
+    re.compile(r'\b(article|section|part|chapter|clause|paragraph|subsection)\s+\d+[a-z]?\b'),
+    re.compile(r'\b(law|regulation|rule|act|code|statute|ordinance)\b'),
+    re.compile(r'\b(difc|dfsa|uae|dubai|emirates)\b'),
+    re.compile(r'\b(employment|data\s+protection|commercial|corporate|financial)\b'),
+    re.compile(r'\b(shall|must|may|required|prohibited|permitted)\b')
+]
+
+
+@functools.lru_cache(maxsize=1024)
+def _legal_terms(text: str) -> frozenset[str]:
+    """Cached, immutable legal terms for a text."""
     terms = set()
     text_lower = text.lower()
     
-    for pattern in legal_patterns:
-        matches = re.findall(pattern, text_lower)
-        terms.update(matches)
+    for pattern in _LEGAL_PATTERNS:
+        terms.update(pattern.findall(text_lower))
     
-    return terms
+    return frozenset(terms)
+
+
+def extract_legal_terms(text: str) -> set[str]:
+    """Extract legal terms and phrases for enhanced matching."""
+    # Return a copy so callers cannot mutate the cached terms
+    return set(_legal_terms(text))
 
 
 def enhanced_similarity(claim: str, candidate: CitationCandidate) -> float:
@@ -115,8 +129,8 @@ def enhanced_similarity(claim: str, candidate: CitationCandidate) -> float:
     combined_score = jaccard_similarity(claim, f"{candidate.title} {candidate.section or ''}")
     
     # Legal term matching bonus
-    claim_terms = extract_legal_terms(claim)
-    candidate_terms = extract_legal_terms(f"{candidate.title} {candidate.section or ''}")
+    claim_terms = _legal_terms(claim)
+    candidate_terms = _legal_terms(f"{candidate.title} {candidate.section or ''}")
     
     term_overlap = len(claim_terms & candidate_terms) / len(claim_terms | candidate_terms) if claim_terms or candidate_terms else 0.0
     
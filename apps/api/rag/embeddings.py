@@ -10,11 +10,14 @@ Following 2025 best practices:
 from __future__ import annotations
 import asyncio
 import time
-from typing import List, Optional, Union
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Optional, Set, Tuple, Union
 from abc import ABC, abstractmethod
 
 from core.config import settings
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 class EmbeddingProvider(ABC):
     """Abstract base class for embedding providers."""
@@ -29,6 +32,12 @@ class EmbeddingProvider(ABC):
         """Generate embedding for single query."""
         pass
     
+    async def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings as one float32 matrix of shape (len(texts), dimension)."""
+        import numpy as np
+        
+        return np.asarray(await self.embed_texts(texts), dtype=np.float32)
+    
     @property
     @abstractmethod
     def dimension(self) -> int:
@@ -76,6 +85,17 @@ class SentenceTransformerProvider(EmbeddingProvider):
         
         return embeddings.tolist()
     
+    async def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        """Generate normalized embeddings as a float32 matrix, without list conversion."""
+        import numpy as np
+        
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        
+        self._load_model()
+        embeddings = await asyncio.to_thread(self._model.encode, texts, normalize_embeddings=True)
+        return np.asarray(embeddings, dtype=np.float32)
+    
     async def embed_query(self, query: str) -> List[float]:
         """Generate single query embedding."""
         results = await self.embed_texts([query])
@@ -189,6 +209,70 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
         return self._dimension
 
 
+class QueryBatcher:
+    """
+    Micro-batches concurrent query embeddings into single provider calls.
+    
+    Queries submitted within max_delay_ms of each other (or until
+    batch_size is reached) are embedded together, so concurrent
+    retrievals share one model/API round-trip.
+    """
+    
+    def __init__(
+        self,
+        embed_texts: Callable[[List[str]], Awaitable[List[List[float]]]],
+        batch_size: int = 32,
+        max_delay_ms: float = 10.0
+    ):
+        self._embed_texts = embed_texts
+        self.batch_size = batch_size
+        self.max_delay = max_delay_ms / 1000
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Reason: the event loop only weakly references tasks; hold in-flight
+        # batches so one cannot be collected while its callers wait
+        self._tasks: Set[asyncio.Task] = set()
+    
+    async def embed(self, query: str) -> List[float]:
+        """Queue a query and wait for its batch to be embedded."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((query, future))
+        
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        
+        return await future
+    
+    def _flush(self):
+        """Hand the pending queries to a background embedding task."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]):
+        """Embed one batch and resolve each caller's future."""
+        try:
+            vectors = await self._embed_texts([query for query, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for index, (_, future) in enumerate(batch):
+            if not future.done():
+                future.set_result(vectors[index] if index < len(vectors) else [])
+
+
 class EmbeddingManager:
     """
     Manages embedding providers and provides unified interface.
@@ -198,6 +282,7 @@ class EmbeddingManager:
     
     def __init__(self):
         self._provider: Optional[EmbeddingProvider] = None
+        self._query_batcher: Optional[QueryBatcher] = None
     
     def _get_provider(self) -> EmbeddingProvider:
         """Get or create embedding provider based on settings."""
@@ -214,10 +299,16 @@ class EmbeddingManager:
         provider = self._get_provider()
         return await provider.embed_texts(texts)
     
-    async def embed_query(self, query: str) -> List[float]:
-        """Generate embedding for single query."""
+    async def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings for multiple texts as one float32 matrix."""
         provider = self._get_provider()
-        return await provider.embed_query(query)
+        return await provider.embed_matrix(texts)
+    
+    async def embed_query(self, query: str) -> List[float]:
+        """Generate embedding for single query, batched with concurrent queries."""
+        if self._query_batcher is None:
+            self._query_batcher = QueryBatcher(self.embed_texts)
+        return await self._query_batcher.embed(query)
     
     @property
     def dimension(self) -> int:
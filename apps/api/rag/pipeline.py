@@ -0,0 +1,533 @@
+"""
+Document ingestion pipeline for QaAI RAG system.
+
+Shared by the batch and single-document ingestion endpoints:
+- Stream stored text into overlapping word windows
+- Build chunks that share their document's metadata
+- Embed chunks in token-packed batches shared across documents
+- Index each flush with one vector store write
+"""
+
+from __future__ import annotations
+import re
+import asyncio
+import logging
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+from core.config import settings
+from core.models import DocumentMetadata, InstrumentType, JurisdictionType
+from rag.embeddings import embeddings as embedding_provider
+from rag.vector_store import vector_store, DocumentChunk
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# Words per chunk for the simple ingestion chunker; adjacent chunks share
+# a quarter of their words so text at a boundary keeps its context
+WORDS_PER_CHUNK = 500
+WORDS_OVERLAP = WORDS_PER_CHUNK // 4
+
+_WORD_PATTERN = re.compile(r"\S+")
+
+# Characters read per block when streaming uploaded text
+TEXT_BLOCK_CHARS = 64 * 1024
+
+def _chunk_words(content: str, chunk_size: int, overlap: int = 0) -> List[Tuple[str, int]]:
+    """
+    Split text into windows of chunk_size words, overlap words apart.
+    
+    Each window is sliced straight from content between its first and last
+    word, so words are never copied out and re-joined. The last window may
+    be shorter than chunk_size.
+    
+    Returns:
+        List[Tuple[str, int]]: (window text, word count) per window
+    """
+    starts = []
+    ends = []
+    for match in _WORD_PATTERN.finditer(content):
+        starts.append(match.start())
+        ends.append(match.end())
+    
+    windows = []
+    stride = max(1, chunk_size - overlap)
+    for first in range(0, len(starts), stride):
+        last = min(first + chunk_size, len(starts)) - 1
+        windows.append((content[starts[first]:ends[last]], last - first + 1))
+        if last == len(starts) - 1:
+            break
+    return windows
+
+
+def _build_chunks(
+    file_id: str,
+    windows: List[Tuple[str, int]],
+    doc_metadata: DocumentMetadata
+) -> List[DocumentChunk]:
+    """Turn a document's chunk windows into chunks for embedding."""
+    # Reason: every chunk of a document shares one read-only metadata mapping
+    # instead of carrying its own copy
+    metadata = MappingProxyType(doc_metadata.model_dump())
+    return [
+        DocumentChunk(
+            id=f"{file_id}_chunk_{chunk_index}",
+            doc_id=file_id,
+            content=chunk_content,
+            chunk_index=chunk_index,
+            metadata=metadata,
+            token_count=word_count
+        )
+        for chunk_index, (chunk_content, word_count) in enumerate(windows)
+    ]
+
+
+class _WindowChunker:
+    """
+    Incremental _chunk_words for text that arrives in blocks.
+    
+    Produces the same windows as _chunk_words over the whole text while
+    only buffering the words of the window in progress.
+    """
+    
+    def __init__(self, chunk_size: int, overlap: int = 0):
+        self.chunk_size = chunk_size
+        self.stride = max(1, chunk_size - overlap)
+        self.buffer = ""
+        self.covered = 0  # Leading buffered words already in an emitted window
+    
+    def feed(self, text: str, final: bool = False) -> List[Tuple[str, int]]:
+        """Add a block of text and return the windows it completes."""
+        self.buffer += text
+        spans = [match.span() for match in _WORD_PATTERN.finditer(self.buffer)]
+        keep_from = len(self.buffer)
+        if not final and spans and spans[-1][1] == len(self.buffer):
+            # Reason: the last word may continue in the next block
+            keep_from = spans.pop()[0]
+        
+        windows = []
+        first = 0
+        last_emitted = -1
+        while first < len(spans):
+            last = min(first + self.chunk_size, len(spans)) - 1
+            if (not final and last - first + 1 < self.chunk_size) or last < self.covered:
+                break
+            windows.append((self.buffer[spans[first][0]:spans[last][1]], last - first + 1))
+            last_emitted = last
+            if final and last == len(spans) - 1:
+                break
+            first += self.stride
+        
+        if first < len(spans):
+            if last_emitted >= 0:
+                self.covered = max(0, last_emitted - first + 1)
+            self.buffer = self.buffer[spans[first][0]:]
+        else:
+            self.covered = 0
+            self.buffer = self.buffer[keep_from:]
+        return windows
+
+
+def _read_and_chunk(f, chunker: _WindowChunker) -> Tuple[int, List[Tuple[str, int]]]:
+    """
+    Read the next block of a text file and chunk it (blocking).
+    
+    Returns:
+        Tuple[int, List[Tuple[str, int]]]: (characters read, completed windows);
+        zero characters means the file is exhausted and the windows are final
+    """
+    block = f.read(TEXT_BLOCK_CHARS)
+    return len(block), chunker.feed(block, final=not block)
+
+
+async def _extract_windows(
+    stored_path: Path,
+    filename: str,
+    content_type: Optional[str]
+) -> Tuple[List[Tuple[str, int]], int]:
+    """
+    Stream a stored upload's text into chunk windows (text files only in this demo).
+    
+    The file is read and chunked block by block off the event loop, so
+    neither the whole text nor its word offsets are held in memory at once.
+    
+    Returns:
+        Tuple[List[Tuple[str, int]], int]: (windows, characters of text)
+    """
+    if (content_type or "").startswith("text/"):
+        try:
+            chunker = _WindowChunker(WORDS_PER_CHUNK, WORDS_OVERLAP)
+            windows = []
+            length = 0
+            f = await asyncio.to_thread(open, Path(stored_path), 'r', encoding='utf-8')
+            try:
+                while True:
+                    # Reason: reading and chunking both block; do each block's
+                    # share of both in one worker thread hop
+                    block_length, block_windows = await asyncio.to_thread(_read_and_chunk, f, chunker)
+                    windows.extend(block_windows)
+                    length += block_length
+                    if not block_length:
+                        break
+            finally:
+                f.close()
+            return windows, length
+        except Exception:
+            fallback = f"Sample content for {filename}"  # Fallback for demo
+    else:
+        fallback = f"Sample content for {filename} (binary file not processed in demo)"
+    
+    return _chunk_words(fallback, WORDS_PER_CHUNK, WORDS_OVERLAP), len(fallback)
+
+
+def _is_batch_too_large(error: Exception) -> bool:
+    """Whether an embedding error looks like the batch exceeded a size limit."""
+    if isinstance(error, MemoryError):
+        return True
+    message = str(error).lower()
+    return any(hint in message for hint in ("out of memory", "too large", "too many tokens", "maximum context"))
+
+
+def _token_count(chunk: DocumentChunk) -> int:
+    """Tokens in a chunk, counted by the chunker when it built the chunk."""
+    if chunk.token_count is not None:
+        return chunk.token_count
+    return len(chunk.content.split())
+
+
+def _pack_by_tokens(chunks: List[DocumentChunk], max_batch: int, token_budget: int) -> List[List[int]]:
+    """
+    Group chunks of similar size into embedding batches.
+    
+    Chunks are taken largest first and packed greedily until a batch reaches
+    max_batch chunks or token_budget tokens. A chunk over the budget gets a
+    batch of its own.
+    
+    Returns:
+        List[List[int]]: Positions into chunks, one list per batch
+    """
+    counts = [_token_count(chunk) for chunk in chunks]
+    order = sorted(range(len(chunks)), key=counts.__getitem__, reverse=True)
+    packs: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    
+    for position in order:
+        tokens = counts[position]
+        if current and (len(current) >= max_batch or current_tokens + tokens > token_budget):
+            packs.append(current)
+            current, current_tokens = [], 0
+        current.append(position)
+        current_tokens += tokens
+    
+    if current:
+        packs.append(current)
+    return packs
+
+
+async def _embed_batches(batches: List[List[str]]) -> List[np.ndarray]:
+    """
+    Embed text batches concurrently.
+    
+    A batch rejected as too large is retried one text at a time.
+    
+    Args:
+        batches: Texts to embed, one list per embedding call
+        
+    Returns:
+        List[np.ndarray]: One float32 embedding matrix per batch, in input order
+    """
+    import numpy as np
+    
+    # Reason: embedding calls are I/O bound; cap how many are in flight
+    semaphore = asyncio.Semaphore(settings.ingest_embedding_concurrency)
+    
+    async def embed_batch(texts: List[str]) -> np.ndarray:
+        async with semaphore:
+            try:
+                return await embedding_provider.embed_matrix(texts)
+            except Exception as e:
+                if len(texts) == 1 or not _is_batch_too_large(e):
+                    raise
+                return np.concatenate([await embedding_provider.embed_matrix([text]) for text in texts])
+    
+    return await asyncio.gather(*(embed_batch(texts) for texts in batches))
+
+
+class BatchedEmbedder:
+    """
+    Chunks waiting to be embedded, accumulated across documents.
+    
+    Small documents share embedding calls instead of each making its own
+    undersized request. A batch ingestion job drives its own instance with
+    add() and flush(); concurrent single-document requests share
+    batched_embedder through index().
+    """
+    
+    def __init__(self, batch_size: Optional[int] = None):
+        self._batch_size = batch_size
+        self.chunks: List[DocumentChunk] = []
+        self.remaining: Dict[str, int] = {}  # doc_id -> chunks not yet indexed
+        self.queued_count = 0
+        self.indexed_count = 0
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._writes: List[asyncio.Task] = []  # Background vector store writes, oldest first
+        self._failed_docs: Set[str] = set()
+    
+    @property
+    def batch_size(self) -> int:
+        """Chunks per embedding call; the shared instance follows settings."""
+        return self._batch_size or settings.ingest_embedding_batch_size
+    
+    def add(self, chunks: List[DocumentChunk]):
+        """Queue a document's chunks."""
+        for chunk in chunks:
+            self.remaining[chunk.doc_id] = self.remaining.get(chunk.doc_id, 0) + 1
+        self.chunks.extend(chunks)
+        self.queued_count += len(chunks)
+    
+    def ready(self, final: bool = False) -> bool:
+        """Whether a flush would embed anything."""
+        return len(self.chunks) >= (1 if final else self.batch_size)
+    
+    async def flush(self, final: bool = False) -> tuple[List[str], Dict[str, str]]:
+        """
+        Embed every full batch, or everything queued when final.
+        
+        The embedded batch is written to the vector store by a background
+        task, so the write overlaps the embedding calls of the next flush.
+        
+        Returns:
+            tuple[List[str], Dict[str, str]]: (doc_ids now fully indexed,
+            doc_id -> error for documents whose batch failed), from the
+            writes finished so far; a final flush waits for every write
+        """
+        import numpy as np
+        
+        batch_size = self.batch_size
+        cut = len(self.chunks) if final else len(self.chunks) - len(self.chunks) % batch_size
+        ready, self.chunks = self.chunks[:cut], self.chunks[cut:]
+        failed: Dict[str, str] = {}
+        
+        if ready:
+            packs = _pack_by_tokens(ready, batch_size, settings.ingest_embedding_token_budget)
+            try:
+                pack_embeddings = await _embed_batches(
+                    [[ready[position].content for position in pack] for pack in packs]
+                )
+            except Exception as e:
+                failed = self._fail(ready, e)
+            else:
+                # Put vectors back in chunk order before indexing, as one matrix
+                matrix = np.concatenate(pack_embeddings)
+                vectors = np.empty_like(matrix)
+                vectors[[position for pack in packs for position in pack]] = matrix
+                
+                # Reason: one bulk write per flush, chained after the previous
+                # write so vectors land in queue order
+                previous = self._writes[-1] if self._writes else None
+                self._writes.append(asyncio.create_task(self._write(previous, ready, vectors)))
+        
+        if final and self._writes:
+            await asyncio.wait(self._writes)
+        if final:
+            # Reason: writes only append in memory; save once per job
+            await self._persist()
+        
+        completed = []
+        while self._writes and self._writes[0].done():
+            write_completed, write_failed = self._writes.pop(0).result()
+            completed.extend(write_completed)
+            failed.update(write_failed)
+        if not self._writes:
+            self._failed_docs.clear()
+        
+        self._settle(completed, failed)
+        return completed, failed
+    
+    async def _write(
+        self,
+        previous: Optional[asyncio.Task],
+        chunks: List[DocumentChunk],
+        vectors: np.ndarray
+    ) -> tuple[List[str], Dict[str, str]]:
+        """Index one embedded flush once the previous write has finished."""
+        if previous is not None:
+            await asyncio.wait([previous])
+        
+        # Skip documents that failed while this batch waited its turn
+        keep = [i for i, chunk in enumerate(chunks) if chunk.doc_id not in self._failed_docs]
+        if len(keep) < len(chunks):
+            chunks, vectors = [chunks[i] for i in keep], vectors[keep]
+        
+        try:
+            await vector_store.add_chunks_with_embeddings(chunks, vectors)
+        except Exception as e:
+            return [], self._fail(chunks, e)
+        
+        self.indexed_count += len(chunks)
+        # Reason: a later batch of a document may have failed while this
+        # write ran; that document is already reported and no longer counted
+        for chunk in chunks:
+            if chunk.doc_id in self.remaining:
+                self.remaining[chunk.doc_id] -= 1
+        completed = [
+            doc_id for doc_id in dict.fromkeys(chunk.doc_id for chunk in chunks)
+            if self.remaining.get(doc_id) == 0
+        ]
+        for doc_id in completed:
+            del self.remaining[doc_id]
+        return completed, {}
+    
+    async def _persist(self):
+        """Save the vector store; a failed save is retried by the next final flush."""
+        try:
+            await vector_store.persist()
+        except Exception as e:
+            logger.warning("Saving the vector store failed: %s", e, exc_info=e)
+    
+    def _fail(self, chunks: List[DocumentChunk], error: Exception) -> Dict[str, str]:
+        """
+        Fail every document with chunks in a failed batch.
+        
+        Their queued and not yet written chunks are dropped; chunks already
+        written by an earlier flush stay in the vector store.
+        """
+        failed = dict.fromkeys(chunk.doc_id for chunk in chunks if chunk.doc_id not in self._failed_docs)
+        self._failed_docs.update(failed)
+        self.chunks = [chunk for chunk in self.chunks if chunk.doc_id not in failed]
+        for doc_id in failed:
+            self.remaining.pop(doc_id, None)
+        return {doc_id: str(error) for doc_id in failed}
+    
+    async def index(self, chunks: List[DocumentChunk]):
+        """
+        Queue one document's chunks and wait until they are indexed.
+        
+        Callers that queue chunks within the linger interval of each other
+        share one flush, and so share embedding calls.
+        
+        Raises:
+            RuntimeError: If the document's embedding batch failed
+        """
+        if not chunks:
+            return
+        
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[chunks[0].doc_id] = waiter
+        self.add(chunks)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_soon())
+        await waiter
+    
+    async def _flush_soon(self):
+        """Flush everything queued once concurrent callers have had a chance to join."""
+        # Reason: linger briefly so concurrent requests share the embedding
+        # calls, unless a full batch is already waiting
+        if not self.ready():
+            await asyncio.sleep(settings.ingest_embedding_linger)
+        self._flush_task = None
+        pending = list(self._waiters)
+        try:
+            await self.flush(final=True)
+        except Exception as e:
+            # Reason: callers must not wait forever on a flush that died
+            for doc_id in pending:
+                self.remaining.pop(doc_id, None)
+            self._settle([], {doc_id: str(e) for doc_id in pending})
+    
+    def _settle(self, completed: List[str], failed: Dict[str, str]):
+        """Wake index() callers whose documents finished."""
+        for doc_id in completed:
+            waiter = self._waiters.pop(doc_id, None)
+            if waiter is not None and not waiter.done():
+                waiter.set_result(None)
+        for doc_id, error in failed.items():
+            waiter = self._waiters.pop(doc_id, None)
+            if waiter is not None and not waiter.done():
+                waiter.set_exception(RuntimeError(error))
+
+
+async def ingest_file(
+    file_id: str,
+    stored_path: Path,
+    metadata: Dict[str, Any],
+    jurisdiction: JurisdictionType,
+    instrument_type: InstrumentType,
+    project_id: Optional[str] = None,
+    progress_cb: Optional[Callable[[Dict[str, Any]], None]] = None,
+    embedder: Optional[BatchedEmbedder] = None,
+    started_at: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Extract, chunk and queue one stored upload for indexing.
+    
+    Args:
+        file_id: Document ID assigned when the upload was stored
+        stored_path: Where the upload was stored
+        metadata: Upload metadata from storage
+        jurisdiction: Jurisdiction of the document
+        instrument_type: Instrument type of the document
+        project_id: Optional Vault project the document belongs to
+        progress_cb: Called with each progress event (type, file_id and timestamp included)
+        embedder: Batched embedder to queue chunks on; the caller flushes it.
+            Without one, chunks are indexed through batched_embedder before returning
+        started_at: When processing of the file started, for the first event
+        
+    Returns:
+        Dict[str, Any]: document_id, filename, chunk_count and content_length;
+        a chunk_count of 0 means no text was extracted and nothing was queued
+    """
+    filename = metadata["filename"]
+    
+    def report(event_type: str, timestamp: datetime, **fields):
+        if progress_cb is not None:
+            progress_cb({"type": event_type, "file_id": file_id, **fields, "timestamp": timestamp.isoformat()})
+    
+    report("text_extraction", started_at or datetime.now(), filename=filename)
+    windows, content_length = await _extract_windows(stored_path, filename, metadata["content_type"])
+    result = {
+        "document_id": file_id,
+        "filename": filename,
+        "chunk_count": len(windows),
+        "content_length": content_length
+    }
+    if not windows:
+        return result
+    
+    now = datetime.now()
+    
+    # Create document metadata
+    doc_metadata = DocumentMetadata(
+        id=file_id,
+        project_id=project_id,
+        filename=filename,
+        title=filename.rsplit('.', 1)[0].replace('_', ' ').title(),
+        file_path=metadata["stored_path"],
+        content_type=metadata["content_type"],
+        size_bytes=metadata["size_bytes"],
+        jurisdiction=jurisdiction,
+        instrument_type=instrument_type,
+        upload_date=now
+    )
+    
+    report("chunking", now, filename=filename)
+    chunks = await asyncio.to_thread(_build_chunks, file_id, windows, doc_metadata)
+    report("chunking_complete", now, chunk_count=len(chunks))
+    
+    report("embedding_generation", now, chunk_count=len(chunks))
+    if embedder is None:
+        await batched_embedder.index(chunks)
+    else:
+        embedder.add(chunks)
+    return result
+
+
+# Shared embedder for requests outside a batch job
+batched_embedder = BatchedEmbedder()
@@ -5,6 +5,8 @@ Combines vector search with citation verification and jurisdiction filtering.
 """
 
 from __future__ import annotations
+import functools
+import logging
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass
 
@@ -13,6 +15,9 @@ from rag.vector_store import vector_store, RetrievalMatch
 from rag.citations import CitationCandidate, citation_verifier, create_verified_citation
 
 
+logger = logging.getLogger(__name__)
+
+
 @dataclass
 class RetrievalContext:
     """Context for retrieval operations."""
@@ -100,18 +105,21 @@ class DIFCRetriever:
         self,
         query: str,
         project_id: str,
-        limit: int = 10
+        limit: int = 10,
+        query_vector: Optional[List[float]] = None
     ) -> List[RetrievalMatch]:
         """
         Search within specific Vault project.
         
         Filters results to only include documents from the specified project.
+        A precomputed query_vector skips embedding the query again.
         """
         # Get all matches first
         matches = await self.vector_store.search(
             query=query,
             limit=limit * 2,  # Get more to account for filtering
-            boost_difc=True
+            boost_difc=True,
+            query_vector=query_vector
         )
         
         # Filter by project
@@ -183,6 +191,23 @@ class DIFCRetriever:
         
         return filtered_matches
     
+    async def warmup(self):
+        """
+        Pay first-request costs at startup.
+        
+        Loads the FAISS index and metadata, then runs one throwaway
+        retrieval so the embedding provider and search structures are
+        initialized before the first /query. Failures are logged, not raised.
+        """
+        await self.vector_store.warmup()
+        if not self.vector_store.is_loaded:
+            return
+        
+        try:
+            await self.retrieve_with_citations(RetrievalContext(query="difc law", max_results=1))
+        except Exception as e:
+            logger.warning(f"Retriever warmup query failed: {e}")
+    
     def get_knowledge_sources_summary(self) -> Dict[str, Any]:
         """
         Get summary of available knowledge sources.
@@ -254,5 +279,19 @@ async def search_legal_instruments(
     return all_matches[:limit]
 
 
-# Global retriever instance
-difc_retriever = DIFCRetriever()
\ No newline at end of file
+@functools.cache
+def get_difc_retriever() -> DIFCRetriever:
+    """
+    Get the shared retriever, built on first use.
+    
+    Mirrors get_model_router(): importing retrieval helpers (prompts,
+    tests, CLI scripts) no longer constructs the retriever.
+    """
+    return DIFCRetriever()
+
+
+def __getattr__(name: str) -> Any:
+    """Back-compat: resolve the old module-level `difc_retriever` lazily."""
+    if name == "difc_retriever":
+        return get_difc_retriever()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
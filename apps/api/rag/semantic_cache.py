@@ -0,0 +1,189 @@
+"""
+Semantic cache for Vault project searches.
+
+Legal users re-ask near-identical questions, and every search pays for an
+embedding plus a vector search. Matches are cached per project and reused
+when a new query embedding is close enough to a cached one:
+- Random-projection LSH buckets queries by the sign bits of W @ embedding,
+  so a lookup only compares against a handful of cached queries
+- Within a bucket (and its one-bit neighbours) a full cosine similarity
+  must reach the threshold before cached matches are served
+- Each entry keeps a larger top-k than most requests ask for, so a later
+  query with a bigger limit can still be answered from the cache
+- Entries are keyed by project, so results never leak across projects, and
+  the whole cache is dropped when the vector store generation changes
+"""
+
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from core.config import settings
+
+if TYPE_CHECKING:
+    import numpy as np
+    from rag.vector_store import RetrievalMatch
+
+
+@dataclass
+class _CachedSearch:
+    """Matches for one query embedding."""
+    embedding: "np.ndarray"  # Unit-length float32 vector
+    matches: List["RetrievalMatch"]
+    complete: bool  # True when the search returned fewer matches than requested
+
+
+class SemanticSearchCache:
+    """
+    Bounded LRU cache of project search matches with LSH bucketing.
+
+    Args:
+        max_entries (int): Maximum cached searches before evicting the least recently used buckets.
+        similarity_threshold (float): Minimum cosine similarity for a hit.
+        stored_top_k (int): Matches fetched and cached per search.
+        lsh_bits (int): Random hyperplanes used for bucketing.
+        seed (int): Seed for the random hyperplanes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        similarity_threshold: float = 0.95,
+        stored_top_k: int = 20,
+        lsh_bits: int = 8,
+        seed: int = 0
+    ):
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.stored_top_k = stored_top_k
+        self.lsh_bits = lsh_bits
+        self.seed = seed
+        self._planes: Optional["np.ndarray"] = None
+        self._generation: Optional[int] = None
+        self._size = 0
+        self._buckets: "OrderedDict[Tuple[str, int], List[_CachedSearch]]" = OrderedDict()
+
+    def _unit(self, query_embedding: Sequence[float]) -> "np.ndarray":
+        """Query embedding as a unit float32 vector, so cosine is a dot product."""
+        import numpy as np
+
+        vector = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _signature(self, vector: "np.ndarray") -> int:
+        """LSH bucket of a vector: one sign bit per random hyperplane."""
+        import numpy as np
+
+        if self._planes is None or self._planes.shape[1] != vector.shape[0]:
+            # Reason: a new embedding dimension means a new model; old buckets are meaningless
+            rng = np.random.default_rng(self.seed)
+            self._planes = rng.standard_normal((self.lsh_bits, vector.shape[0]), dtype=np.float32)
+            self.clear()
+        bits = (self._planes @ vector) > 0
+        return int(bits @ (1 << np.arange(self.lsh_bits, dtype=np.int64)))
+
+    def _check_generation(self, generation: int):
+        """Drop every entry once the vector store has changed."""
+        if generation != self._generation:
+            self.clear()
+            self._generation = generation
+
+    async def lookup(
+        self,
+        query_embedding: Sequence[float],
+        project_id: str,
+        top_k: int,
+        generation: int = 0
+    ) -> Optional[List["RetrievalMatch"]]:
+        """
+        Find cached matches for a query similar to this one.
+
+        Args:
+            query_embedding (Sequence[float]): Embedding of the new query.
+            project_id (str): Project the search is scoped to.
+            top_k (int): Matches the caller needs.
+            generation (int): Current vector store generation.
+
+        Returns:
+            Optional[List[RetrievalMatch]]: Up to top_k matches, or None on a miss.
+        """
+        self._check_generation(generation)
+        if not self._buckets:
+            return None
+
+        vector = self._unit(query_embedding)
+        signature = self._signature(vector)
+        # Reason: near-duplicates can straddle one hyperplane; probing the
+        # one-bit neighbours catches them for lsh_bits extra dict lookups
+        probes = [signature] + [signature ^ (1 << bit) for bit in range(self.lsh_bits)]
+
+        best: Optional[Tuple[float, Tuple[str, int], _CachedSearch]] = None
+        for probe in probes:
+            key = (project_id, probe)
+            for entry in self._buckets.get(key, ()):
+                if len(entry.matches) < top_k and not entry.complete:
+                    continue
+                score = float(entry.embedding @ vector)
+                if score >= self.similarity_threshold and (best is None or score > best[0]):
+                    best = (score, key, entry)
+
+        if best is None:
+            return None
+        _, key, entry = best
+        self._buckets.move_to_end(key)
+        return entry.matches[:top_k]
+
+    async def set(
+        self,
+        query_embedding: Sequence[float],
+        project_id: str,
+        matches: List["RetrievalMatch"],
+        requested: int,
+        generation: int = 0
+    ):
+        """
+        Cache the matches of a search.
+
+        Args:
+            query_embedding (Sequence[float]): Embedding of the searched query.
+            project_id (str): Project the search was scoped to.
+            matches (List[RetrievalMatch]): Matches returned, best first.
+            requested (int): Limit the search was run with.
+            generation (int): Vector store generation the search ran against.
+        """
+        self._check_generation(generation)
+        vector = self._unit(query_embedding)
+        key = (project_id, self._signature(vector))
+        self._buckets.setdefault(key, []).append(
+            _CachedSearch(embedding=vector, matches=list(matches), complete=len(matches) < requested)
+        )
+        self._buckets.move_to_end(key)
+        self._size += 1
+
+        while self._size > self.max_entries:
+            _, evicted = self._buckets.popitem(last=False)
+            self._size -= len(evicted)
+
+    def clear(self):
+        """Drop all cached searches."""
+        self._buckets.clear()
+        self._size = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "cache_size": self._size,
+            "buckets": len(self._buckets),
+            "max_entries": self.max_entries
+        }
+
+
+# Global Vault search cache instance
+semantic_search_cache = SemanticSearchCache(
+    max_entries=settings.vault_search_cache_max_entries,
+    similarity_threshold=settings.vault_search_cache_similarity,
+    stored_top_k=settings.vault_search_cache_top_k,
+    lsh_bits=settings.vault_search_cache_lsh_bits
+)
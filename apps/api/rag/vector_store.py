@@ -12,9 +12,11 @@ import json
 import os
 import uuid
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import TYPE_CHECKING, List, Dict, Any, Mapping, Optional, Tuple, Union
 import sqlite3
 import asyncio
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
@@ -22,6 +24,9 @@ from core.config import settings
 from core.models import JurisdictionType, InstrumentType, DocumentMetadata
 from rag.embeddings import embeddings
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 @dataclass
 class DocumentChunk:
@@ -31,7 +36,8 @@ class DocumentChunk:
     content: str
     chunk_index: int
     section_ref: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[Mapping[str, Any]] = None
+    token_count: Optional[int] = None  # Words counted by the chunker, if known
 
 
 @dataclass
@@ -42,6 +48,50 @@ class RetrievalMatch:
     document_metadata: Optional[DocumentMetadata] = None
 
 
+class _ReadWriteLock:
+    """
+    Thread lock admitting many readers or one writer.
+    
+    A waiting writer holds back new readers, so a steady search load cannot
+    starve ingestion.
+    """
+    
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+    
+    @contextmanager
+    def read(self):
+        with self._condition:
+            while self._writing or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+    
+    @contextmanager
+    def write(self):
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
 class VectorStore:
     """
     FAISS-based vector store with hybrid retrieval capabilities.
@@ -59,6 +109,13 @@ class VectorStore:
         self._index = None
         self._metadata = None
         self._chunks = {}  # chunk_id -> DocumentChunk mapping
+        # Bumped on every write so result caches keyed on it go stale
+        self.generation = 0
+        # Reason: index appends and searches run in worker threads; an append
+        # may reallocate the index storage a concurrent search is reading
+        self._index_lock = _ReadWriteLock()
+        # True while appended vectors exist only in memory
+        self._dirty = False
     
     def _load_index(self):
         """Lazy load FAISS index."""
@@ -92,6 +149,21 @@ class VectorStore:
                 print(f"Error loading metadata: {e}")
                 self._metadata = {}
     
+    def _load_all(self):
+        """Load the index and metadata together (blocking disk reads)."""
+        self._load_index()
+        self._load_metadata()
+    
+    async def warmup(self):
+        """Load the index and metadata off the event loop."""
+        if self._index is None or self._metadata is None:
+            await asyncio.to_thread(self._load_all)
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Whether both the index and its metadata are in memory."""
+        return bool(self._index) and bool(self._metadata)
+    
     async def build_index(
         self,
         corpus_dir: Path,
@@ -233,12 +305,115 @@ class VectorStore:
         print(f"Index built successfully: {len(embedding_vectors)} vectors")
         return True
     
+    async def add_chunks_with_embeddings(
+        self,
+        chunks: List[DocumentChunk],
+        vectors: Union[List[List[float]], np.ndarray]
+    ) -> int:
+        """
+        Append pre-embedded chunks to the in-memory index.
+        
+        The vectors are searchable at once; call persist() to save the
+        index and metadata to disk.
+        
+        Args:
+            chunks: Chunks to add, in the same order as vectors
+            vectors: One embedding per chunk; a contiguous float32 matrix
+                is added to the index without copying
+            
+        Returns:
+            int: Number of vectors added
+        """
+        if len(chunks) != len(vectors):
+            raise ValueError(f"Got {len(vectors)} embeddings for {len(chunks)} chunks")
+        if not chunks:
+            return 0
+        
+        await self.warmup()
+        # Reason: FAISS add is blocking
+        await asyncio.to_thread(self._append_vectors, chunks, vectors)
+        await self._store_chunks_in_db(chunks)
+        return len(chunks)
+    
+    def _append_vectors(self, chunks: List[DocumentChunk], vectors: Union[List[List[float]], np.ndarray]):
+        """Add vectors to the FAISS index and metadata in memory (blocking)."""
+        try:
+            import faiss
+            import numpy as np
+        except ImportError as e:
+            raise ImportError(f"Required library not installed: {e}")
+        
+        matrix = np.ascontiguousarray(vectors, dtype='float32')
+        
+        with self._index_lock.write():
+            if self._index is None:
+                self._index = faiss.IndexFlatIP(matrix.shape[1])
+            if not self._metadata:
+                self._metadata = {"vectors": [], "build_info": {}}
+            
+            self._index.add(matrix)
+            
+            self._metadata.setdefault("vectors", []).extend(
+                {
+                    "chunk_id": chunk.id,
+                    "doc_id": chunk.doc_id,
+                    "chunk_index": chunk.chunk_index
+                }
+                for chunk in chunks
+            )
+            build_info = self._metadata.setdefault("build_info", {})
+            build_info["total_chunks"] = len(self._metadata["vectors"])
+            build_info["dimension"] = self._index.d
+            build_info["index_type"] = self._index.__class__.__name__
+            self._dirty = True
+    
+    async def persist(self) -> bool:
+        """
+        Save appended vectors to disk.
+        
+        Ingestion calls this once per job rather than per write, so disk
+        I/O stays linear in corpus size.
+        
+        Returns:
+            bool: Whether anything was written
+        """
+        if not self._dirty:
+            return False
+        # Reason: serializing the index and metadata is blocking
+        return await asyncio.to_thread(self._save)
+    
+    def _save(self) -> bool:
+        """Write the index and metadata to disk (blocking)."""
+        import faiss
+        
+        # Reason: a read lock keeps appends out while searches carry on
+        with self._index_lock.read():
+            if not self._dirty:
+                return False
+            self._dirty = False
+            try:
+                self.index_dir.mkdir(parents=True, exist_ok=True)
+                faiss.write_index(self._index, str(self.index_path))
+                with open(self.metadata_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._metadata, f, ensure_ascii=False, indent=2)
+            except Exception:
+                self._dirty = True
+                raise
+        return True
+    
+    def _search_index(self, query_array: np.ndarray, limit: int) -> tuple:
+        """Search the FAISS index while no append is running (blocking)."""
+        with self._index_lock.read():
+            # Search with larger limit for filtering
+            return self._index.search(query_array, min(limit, self._index.ntotal))
+    
     async def search(
         self,
         query: str,
         limit: int = 10,
         jurisdiction: Optional[JurisdictionType] = None,
-        boost_difc: bool = True
+        boost_difc: bool = True,
+        query_vector: Optional[List[float]] = None
     ) -> List[RetrievalMatch]:
         """
         Search vector store with DIFC-first boosting.
@@ -248,16 +423,19 @@ class VectorStore:
             limit: Maximum results to return
             jurisdiction: Filter by jurisdiction
             boost_difc: Apply DIFC jurisdiction boosting
+            query_vector: Precomputed query embedding, if the caller has one
         """
-        self._load_index()
-        self._load_metadata()
+        # Reason: the first search reads the index and metadata from disk;
+        # keep that off the event loop so concurrent streams keep flowing
+        await self.warmup()
         
-        if not self._index or not self._metadata:
+        if not self.is_loaded:
             return []
         
         try:
             # Generate query embedding
-            query_vector = await embeddings.embed_query(query)
+            if query_vector is None:
+                query_vector = await embeddings.embed_query(query)
             
             if not query_vector:
                 return []
@@ -266,9 +444,8 @@ class VectorStore:
             import numpy as np
             query_array = np.array([query_vector], dtype='float32')
             
-            # Search with larger limit for filtering
-            search_limit = min(limit * 3, self._index.ntotal)
-            scores, indices = self._index.search(query_array, search_limit)
+            # Reason: FAISS releases the GIL, so a worker thread searches in parallel
+            scores, indices = await asyncio.to_thread(self._search_index, query_array, limit * 3)
             
             # Process results
             results = []
@@ -322,11 +499,11 @@ class VectorStore:
         
         Following 2025 best practices for improved retrieval precision.
         """
-        # Get vector search results
-        vector_results = await self.search(query, limit * 2)
-        
-        # Get keyword search results (simplified BM25-like scoring)
-        keyword_results = await self._keyword_search(query, limit * 2)
+        # Run vector and keyword (simplified BM25-like) search concurrently
+        vector_results, keyword_results = await asyncio.gather(
+            self.search(query, limit * 2),
+            self._keyword_search(query, limit * 2)
+        )
         
         # Combine and re-rank results
         combined_scores = {}
@@ -437,6 +614,7 @@ class VectorStore:
         # For now, store in memory
         for chunk in chunks:
             self._chunks[chunk.id] = chunk
+        self.generation += 1
     
     async def _load_chunk(self, chunk_id: str) -> Optional[DocumentChunk]:
         """Load chunk details from storage."""
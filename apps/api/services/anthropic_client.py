@@ -143,6 +143,18 @@ class AnthropicClient:
         base_delay: float = 1.0
     ) -> Dict[str, Any]:
         """Make request with exponential backoff retry."""
+        response = await self._call_with_retry(request_func, model, estimated_tokens, max_retries, base_delay)
+        return self._format_response(response)
+    
+    async def _call_with_retry(
+        self,
+        request_func,
+        model: str,
+        estimated_tokens: int = 1000,
+        max_retries: int = 3,
+        base_delay: float = 1.0
+    ) -> Any:
+        """Call request_func with exponential backoff retry, returning the raw response."""
         last_exception = None
         
         for attempt in range(max_retries + 1):
@@ -156,8 +168,7 @@ class AnthropicClient:
                             continue
                 
                 # Make the request
-                response = await request_func()
-                return self._format_response(response)
+                return await request_func()
                 
             except Exception as e:
                 last_exception = e
@@ -274,16 +285,10 @@ class AnthropicClient:
         # Estimate tokens for rate limiting
         estimated_tokens = self._estimate_tokens(prompt + (system_prompt or "")) + max_tokens
         
-        # Check rate limiting
-        if not await self.rate_limiter.acquire(model, estimated_tokens):
-            wait_time = await self.rate_limiter.wait_time(model, estimated_tokens)
-            if wait_time > 0:
-                await asyncio.sleep(min(wait_time, 60))
-        
         # Prepare messages
         messages = [{"role": "user", "content": prompt}]
         
-        try:
+        async def make_request():
             kwargs = {
                 "model": model,
                 "messages": messages,
@@ -296,7 +301,16 @@ class AnthropicClient:
             if system_prompt:
                 kwargs["system"] = system_prompt
             
-            async with client.messages.stream(**kwargs) as stream:
+            # Reason: messages.stream() does not accept stream=True; create()
+            # returns the raw event stream and can go through the retry loop
+            return await client.messages.create(**kwargs)
+        
+        try:
+            # Reason: retry (and rate limit) only stream setup; a stream that
+            # fails midway cannot be replayed without duplicating tokens
+            stream = await self._call_with_retry(make_request, model, estimated_tokens)
+            
+            async with stream:
                 async for event in stream:
                     if event.type == "content_block_delta":
                         if hasattr(event.delta, 'text'):
@@ -85,6 +85,16 @@ class OpenAIClient:
         base_delay: float = 1.0
     ) -> Dict[str, Any]:
         """Make request with exponential backoff retry."""
+        response = await self._call_with_retry(request_func, max_retries, base_delay)
+        return self._format_response(response)
+    
+    async def _call_with_retry(
+        self,
+        request_func,
+        max_retries: int = 3,
+        base_delay: float = 1.0
+    ) -> Any:
+        """Call request_func with exponential backoff retry, returning the raw response."""
         last_exception = None
         
         for attempt in range(max_retries + 1):
@@ -98,8 +108,7 @@ class OpenAIClient:
                             continue
                 
                 # Make the request
-                response = await request_func()
-                return self._format_response(response)
+                return await request_func()
                 
             except Exception as e:
                 last_exception = e
@@ -202,20 +211,14 @@ class OpenAIClient:
         """Stream completion using OpenAI models."""
         client = self._get_client()
         
-        # Check rate limiting
-        if not await self.rate_limiter.acquire():
-            wait_time = await self.rate_limiter.wait_for_capacity()
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-        
         # Prepare messages
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
         
-        try:
-            stream = await client.chat.completions.create(
+        async def make_request():
+            return await client.chat.completions.create(
                 model=model,
                 messages=messages,
                 max_tokens=max_tokens,
@@ -223,6 +226,11 @@ class OpenAIClient:
                 stream=True,
                 timeout=60.0
             )
+        
+        try:
+            # Reason: retry (and rate limit) only stream setup; a stream that
+            # fails midway cannot be replayed without duplicating tokens
+            stream = await self._call_with_retry(make_request)
             
             async for chunk in stream:
                 if chunk.choices and chunk.choices[0].delta:
@@ -246,6 +246,55 @@ def mock_vector_store():
     return mock_store
 
 
+class FakeEmbedder:
+    """Embedding provider stand-in that records calls and tracks their overlap."""
+    
+    def __init__(self, fail_on: str = None, max_texts: int = None, delay: float = 0.0):
+        self.fail_on = fail_on
+        self.max_texts = max_texts
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    async def embed_texts(self, texts):
+        self.calls.append(list(texts))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_on and any(self.fail_on in text for text in texts):
+                raise RuntimeError("Embedding service unavailable")
+            if self.max_texts and len(texts) > self.max_texts:
+                raise RuntimeError("CUDA out of memory")
+            return [[float(len(text)), 1.0] for text in texts]
+        finally:
+            self.in_flight -= 1
+    
+    async def embed_matrix(self, texts):
+        import numpy as np
+        return np.asarray(await self.embed_texts(texts), dtype=np.float32)
+
+
+@pytest.fixture
+def embedder_factory():
+    """Build FakeEmbedder stand-ins for the ingestion pipeline."""
+    return FakeEmbedder
+
+
+@pytest.fixture
+def upload_factory():
+    """Build in-memory text/plain uploads from text or bytes."""
+    from io import BytesIO
+    from starlette.datastructures import Headers, UploadFile
+    
+    def make_upload(name: str = "lease.txt", content=b"Lease terms"):
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        return UploadFile(file=BytesIO(data), filename=name, headers=Headers({"content-type": "text/plain"}))
+    
+    return make_upload
+
+
 @pytest.fixture
 def sample_documents():
     """Sample document metadata for testing."""
@@ -0,0 +1,111 @@
+"""
+Tests for workflow node caching.
+
+Following PRP requirements:
+- 1 expected-use test, 1 edge case, 1 failure case per feature
+- Cached nodes must not replay thinking states or errors from other runs
+- The cache is a bounded LRU and drops expired entries on write
+"""
+
+import pytest
+from agents.cache import CachePolicy, NodeCache, cached_node, state_key
+from core.models import JurisdictionType
+
+
+def _emit(label):
+    """Minimal emit() stand-in that returns the raw label as a delta."""
+    return {"thinking": [label]}
+
+
+def _make_node(cache: NodeCache, calls: list, error: str = None):
+    """Build a cached fake node that records how often it runs."""
+    @cached_node(
+        CachePolicy(key=lambda s: state_key(s.get("prompt"), s.get("jurisdiction")), fields=("plan",), ttl=60),
+        cache=cache,
+        emit=_emit
+    )
+    async def fake_plan(state):
+        calls.append(state["prompt"])
+        if error:
+            return {**state, "error": error}
+        return {**state, "plan": f"plan for {state['prompt']}", "thinking": ["planned"]}
+
+    return fake_plan
+
+
+class TestNodeCache:
+    """Test node-level result caching."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_inputs_hit_cache(self):
+        """Identical prompt/jurisdiction reuses the cached plan."""
+        cache = NodeCache()
+        calls = []
+        node = _make_node(cache, calls)
+        state = {"prompt": "DIFC employment", "jurisdiction": JurisdictionType.DIFC, "thinking": []}
+
+        first = await node(state)
+        second = await node(state)
+
+        assert calls == ["DIFC employment"]
+        assert second["plan"] == first["plan"]
+        # Only this run's thinking is present, not the cached run's
+        assert second["thinking"] == ["Reusing cached fake_plan result"]
+
+    def test_expired_entry_is_recomputed(self):
+        """Entries past their TTL are evicted and recomputed."""
+        cache = NodeCache()
+        cache.set("fake_plan", state_key("q", "DIFC"), {"plan": "stale"}, ttl=-1)
+
+        assert cache.get("fake_plan", state_key("q", "DIFC")) is None
+        assert cache.get_stats()["cache_size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self):
+        """A failed node run is never stored."""
+        cache = NodeCache()
+        calls = []
+        node = _make_node(cache, calls, error="Rate limit exceeded")
+        state = {"prompt": "DIFC employment", "jurisdiction": JurisdictionType.DIFC}
+
+        await node(state)
+        await node(state)
+
+        assert len(calls) == 2
+        assert cache.get_stats()["cache_size"] == 0
+
+
+class TestNodeCacheBounds:
+    """Test bounding the node cache."""
+
+    def test_least_recently_used_is_evicted(self):
+        """A full cache evicts the entry read least recently."""
+        cache = NodeCache(max_entries=2)
+        cache.set("plan", "a", {"plan": "a"}, ttl=60)
+        cache.set("plan", "b", {"plan": "b"}, ttl=60)
+        cache.get("plan", "a")
+
+        cache.set("plan", "c", {"plan": "c"}, ttl=60)
+
+        assert cache.get("plan", "b") is None
+        assert cache.get("plan", "a") == {"plan": "a"}
+        assert cache.get_stats() == {"cache_size": 2, "max_entries": 2}
+
+    def test_expired_entries_pruned_on_set(self):
+        """Expired entries that are never read again are dropped by later writes."""
+        cache = NodeCache()
+        cache.set("plan", "old", {"plan": "old"}, ttl=-1)
+
+        cache.set("plan", "new", {"plan": "new"}, ttl=60)
+
+        assert cache.get_stats()["cache_size"] == 1
+
+    def test_entries_without_ttl_still_bounded(self):
+        """Entries that never expire are evicted once the cap is reached."""
+        cache = NodeCache(max_entries=3)
+
+        for i in range(10):
+            cache.set("plan", str(i), {"plan": i}, ttl=None)
+
+        assert cache.get_stats()["cache_size"] == 3
+        assert cache.get("plan", "9") == {"plan": 9}
@@ -0,0 +1,54 @@
+"""
+Tests for the sharded in-memory checkpointer.
+
+Following PRP requirements:
+- 1 expected-use test, 1 edge case, 1 failure case per feature
+- A thread's checkpoints always live on one shard
+"""
+
+import pytest
+from langgraph.checkpoint.base import empty_checkpoint
+
+from agents.checkpoint import ShardedMemorySaver
+
+
+def _config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+
+
+class TestShardedMemorySaver:
+    """Test thread-to-shard dispatch."""
+
+    def test_put_and_get_round_trip(self):
+        """A stored checkpoint is read back from the same shard."""
+        saver = ShardedMemorySaver(shards=4)
+        checkpoint = empty_checkpoint()
+
+        saved = saver.put(_config("thread-1"), checkpoint, {"source": "input", "step": 0}, {})
+        loaded = saver.get_tuple(saved)
+
+        assert loaded is not None
+        assert loaded.checkpoint["id"] == checkpoint["id"]
+        assert saver._shard(_config("thread-1")) is saver._shard(_config("thread-1"))
+
+    @pytest.mark.asyncio
+    async def test_list_without_thread_spans_shards(self):
+        """Listing without a thread_id returns checkpoints from every shard."""
+        saver = ShardedMemorySaver(shards=4)
+        threads = [f"thread-{i}" for i in range(8)]
+        for thread_id in threads:
+            await saver.aput(_config(thread_id), empty_checkpoint(), {"source": "input", "step": 0}, {})
+
+        listed = [c async for c in saver.alist(None)]
+        owned = [c for c in saver.list(_config("thread-3"))]
+
+        assert {c.config["configurable"]["thread_id"] for c in listed} == set(threads)
+        assert len({id(saver._shard(_config(t))) for t in threads}) > 1
+        assert [c.config["configurable"]["thread_id"] for c in owned] == ["thread-3"]
+
+    def test_unknown_thread_has_no_checkpoint(self):
+        """Reading a thread that was never written returns None, even with one shard."""
+        saver = ShardedMemorySaver(shards=0)
+
+        assert len(saver.shards) == 1
+        assert saver.get_tuple(_config("missing")) is None
@@ -17,6 +17,7 @@ from agents.nodes import (
     human_review, export, emit, NODE_REGISTRY
 )
 from core.models import WorkflowState, JurisdictionType, Citation
+from rag.retrievers import get_difc_retriever
 
 
 class TestWorkflowNodes:
@@ -380,33 +381,32 @@ class TestNodeUtilities:
     """Test node utility functions."""
     
     def test_emit_function(self):
-        """Test emit utility for adding thinking states."""
-        initial_state = {"thinking": ["Initial thought"]}
+        """Test emit returns only the new thinking entry as a delta."""
+        result = emit("New thinking state")
         
-        result = emit(initial_state, "New thinking state")
-        
-        assert len(result["thinking"]) == 2
-        assert result["thinking"][-1] == "New thinking state"
-        assert result["thinking"][0] == "Initial thought"
+        assert list(result.keys()) == ["thinking"]
+        assert len(result["thinking"]) == 1
+        assert result["thinking"][0].endswith("New thinking state")
     
-    def test_emit_function_empty_state(self):
-        """Test emit function with empty thinking state."""
-        initial_state = {"thinking": []}
+    def test_emit_function_appends_to_update(self):
+        """Test emit appends to an existing update without copying it."""
+        update = emit("First thought")
         
-        result = emit(initial_state, "First thought")
+        result = emit("Second thought", update)
         
-        assert len(result["thinking"]) == 1
-        assert result["thinking"][0] == "First thought"
+        assert result is update
+        assert len(result["thinking"]) == 2
+        assert result["thinking"][1].endswith("Second thought")
     
     def test_emit_function_missing_thinking(self):
-        """Test emit function creates thinking array if missing."""
-        initial_state = {}
+        """Test emit creates thinking delta if update lacks one."""
+        update = {"plan": "Existing plan"}
         
-        result = emit(initial_state, "New thought")
+        result = emit("New thought", update)
         
-        assert "thinking" in result
+        assert result["plan"] == "Existing plan"
         assert len(result["thinking"]) == 1
-        assert result["thinking"][0] == "New thought"
+        assert result["thinking"][0].endswith("New thought")
     
     def test_node_registry_completeness(self):
         """Test that all nodes are registered."""
@@ -824,4 +824,291 @@ class TestNodeDIFCCompliance:
             
             # Thinking should note DIFC focus
             thinking_states = result["thinking"]
-            assert any("difc" in thought.lower() for thought in thinking_states)
\ No newline at end of file
+            assert any("difc" in thought.lower() for thought in thinking_states)
+
+
+class TestPlanAndRetrieve:
+    """Test the merged plan ∥ retrieve node."""
+    
+    @pytest.mark.asyncio
+    async def test_runs_concurrently_and_merges(self):
+        """Plan and retrieve overlap and their deltas are merged in order."""
+        import asyncio
+        import time
+        from agents.nodes import plan_and_retrieve
+        
+        async def fake_plan(state):
+            await asyncio.sleep(0.05)
+            return {"thinking": ["planned"], "plan": "1. Review DIFC Employment Law"}
+        
+        async def fake_retrieve(state):
+            await asyncio.sleep(0.05)
+            return {"thinking": ["retrieved"], "retrieved_context": [{"title": "DIFC Employment Law"}]}
+        
+        with patch("agents.nodes.plan", fake_plan), patch("agents.nodes.retrieve", fake_retrieve):
+            started = time.monotonic()
+            result = await plan_and_retrieve({"prompt": "Notice periods", "thinking": []})
+            elapsed = time.monotonic() - started
+        
+        assert elapsed < 0.09
+        assert result["plan"] == "1. Review DIFC Employment Law"
+        assert result["retrieved_context"] == [{"title": "DIFC Employment Law"}]
+        assert result["thinking"] == ["planned", "retrieved"]
+        assert "error" not in result
+    
+    @pytest.mark.asyncio
+    async def test_upstream_error_skips_both_branches(self):
+        """An existing error short-circuits without calling plan or retrieve."""
+        from agents.nodes import plan_and_retrieve
+        
+        plan_mock, retrieve_mock = AsyncMock(), AsyncMock()
+        with patch("agents.nodes.plan", plan_mock), patch("agents.nodes.retrieve", retrieve_mock):
+            result = await plan_and_retrieve({"prompt": "x", "error": "Preflight failed"})
+        
+        assert result == {}
+        plan_mock.assert_not_called()
+        retrieve_mock.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_branch_error_is_surfaced(self):
+        """A retrieval failure is reported while keeping the plan's thinking."""
+        from agents.nodes import plan_and_retrieve
+        
+        async def fake_plan(state):
+            return {"thinking": ["planned"], "plan": "plan"}
+        
+        async def failing_retrieve(state):
+            return {"thinking": ["retrieving"], "error": "Retrieval error: index missing"}
+        
+        with patch("agents.nodes.plan", fake_plan), patch("agents.nodes.retrieve", failing_retrieve):
+            result = await plan_and_retrieve({"prompt": "x", "thinking": []})
+        
+        assert result["error"] == "Retrieval error: index missing"
+        assert result["thinking"] == ["planned", "retrieving"]
+
+
+class TestDraftStreaming:
+    """Test token streaming from the draft node."""
+    
+    @staticmethod
+    def _router():
+        from agents.router import ModelProvider
+        router = MagicMock()
+        router.get_drafter_model.return_value = ("gpt-4.1", ModelProvider.OPENAI)
+        return router
+    
+    @staticmethod
+    def _stream(*events):
+        async def stream_complete(**kwargs):
+            for event in events:
+                yield event
+        return stream_complete
+    
+    @pytest.mark.asyncio
+    async def test_tokens_forwarded_to_writer(self):
+        """Each model token reaches the writer and the draft gets a disclaimer."""
+        written = []
+        stream = self._stream(
+            {"type": "chunk", "content": "EMPLOYMENT "},
+            {"type": "chunk", "content": "AGREEMENT"}
+        )
+        
+        with patch("agents.nodes.get_model_router", return_value=self._router()), \
+             patch("agents.nodes.openai_client.stream_complete", stream):
+            result = await draft({"prompt": "Employment contract", "plan": "plan"}, written.append)
+        
+        assert written == [
+            {"type": "draft_progress", "delta": "EMPLOYMENT "},
+            {"type": "draft_progress", "delta": "AGREEMENT"}
+        ]
+        assert result["draft"].startswith("EMPLOYMENT AGREEMENT")
+        assert "DISCLAIMER" in result["draft"]
+        assert result["model_routing"]["drafter"] == "gpt-4.1"
+    
+    @pytest.mark.asyncio
+    async def test_draft_without_writer(self):
+        """Outside a streaming run the node still assembles the draft."""
+        stream = self._stream({"type": "chunk", "content": "Clause 1"}, {"type": "chunk", "content": ""})
+        
+        with patch("agents.nodes.get_model_router", return_value=self._router()), \
+             patch("agents.nodes.openai_client.stream_complete", stream):
+            result = await draft({"prompt": "Employment contract"})
+        
+        assert result["draft"].startswith("Clause 1")
+        assert "error" not in result
+    
+    @pytest.mark.asyncio
+    async def test_stream_error_stops_draft(self):
+        """A streaming error is returned as the node error without a draft."""
+        written = []
+        stream = self._stream(
+            {"type": "chunk", "content": "Partial"},
+            {"type": "error", "content": "Streaming error: rate limited"}
+        )
+        
+        with patch("agents.nodes.get_model_router", return_value=self._router()), \
+             patch("agents.nodes.openai_client.stream_complete", stream):
+            result = await draft({"prompt": "Employment contract"}, written.append)
+        
+        assert result["error"] == "Streaming error: rate limited"
+        assert "draft" not in result
+        assert len(written) == 1
+
+
+class TestVerifyAndFinalize:
+    """Test the merged verify ∥ finalize node."""
+    
+    @pytest.fixture
+    def drafted_state(self) -> WorkflowState:
+        return {
+            "prompt": "Employment contract",
+            "jurisdiction": JurisdictionType.DIFC,
+            "draft": "EMPLOYMENT AGREEMENT",
+            "citations": [{"title": "DIFC Employment Law"}],
+            "thinking": ["drafted"],
+            "model_routing": {"planner": "o1", "drafter": "gpt-4.1"}
+        }
+    
+    @pytest.mark.asyncio
+    async def test_payload_patched_with_verification(self, drafted_state):
+        """The review/export payloads carry the verifier's outcome."""
+        from agents.nodes import verify_and_finalize
+        
+        async def fake_verify(state):
+            return {
+                "thinking": ["verified"],
+                "verification_result": "Citations verified",
+                "verification_passed": True
+            }
+        
+        with patch("agents.nodes.verify_citations", fake_verify):
+            result = await verify_and_finalize(drafted_state)
+        
+        assert result["thinking"][0] == "verified"
+        assert result["thinking"][-1].endswith("Export completed")
+        assert result["final_output"]["verification_result"] == "Citations verified"
+        assert result["final_output"]["verification_passed"] is True
+        assert result["export_data"]["metadata"]["verification_passed"] is True
+        assert result["export_data"]["content"] == "EMPLOYMENT AGREEMENT"
+    
+    @pytest.mark.asyncio
+    async def test_flagged_verification_still_exports(self, drafted_state):
+        """A failed verification is recorded rather than blocking export."""
+        from agents.nodes import verify_and_finalize
+        
+        async def fake_verify(state):
+            return {"thinking": [], "verification_result": "Missing Part 4", "verification_passed": False}
+        
+        with patch("agents.nodes.verify_citations", fake_verify):
+            result = await verify_and_finalize(drafted_state)
+        
+        assert result["final_output"]["verification_passed"] is False
+        assert result["export_data"]["metadata"]["verification_passed"] is False
+    
+    @pytest.mark.asyncio
+    async def test_verifier_error_skips_payload(self, drafted_state):
+        """A verifier error is returned without review/export payloads."""
+        from agents.nodes import verify_and_finalize
+        
+        async def failing_verify(state):
+            return {"thinking": ["verifying"], "error": "Verification error: timeout"}
+        
+        with patch("agents.nodes.verify_citations", failing_verify):
+            result = await verify_and_finalize(drafted_state)
+        
+        assert result["error"] == "Verification error: timeout"
+        assert "final_output" not in result
+        assert "export_data" not in result
+
+
+class TestRetrieveReuseOnEscalation:
+    """Test that assist → draft escalation reuses the cached retrieval."""
+    
+    @staticmethod
+    def _assist_state(prompt: str, jurisdiction=JurisdictionType.DIFC) -> WorkflowState:
+        """Initial state built by SimpleAssistantGraph.run."""
+        return {"prompt": prompt, "jurisdiction": jurisdiction, "thinking": [], "citations": []}
+    
+    @staticmethod
+    def _draft_state(prompt: str, jurisdiction=JurisdictionType.DIFC) -> WorkflowState:
+        """Initial state built by QaAIWorkflowGraph.stream_run."""
+        return {
+            "prompt": prompt,
+            "jurisdiction": jurisdiction,
+            "template_doc_id": None,
+            "reference_doc_ids": [],
+            "model_override": None,
+            "models_validated": True,
+            "thinking": [],
+            "citations": []
+        }
+    
+    @pytest.fixture(autouse=True)
+    def _clear_node_cache(self):
+        from agents.cache import node_cache
+        node_cache.clear()
+        yield
+        node_cache.clear()
+    
+    @pytest.mark.asyncio
+    async def test_draft_reuses_assist_retrieval(self):
+        """Re-running an assist prompt in draft mode skips embedding and search."""
+        search = AsyncMock(return_value=([], []))
+        
+        with patch.object(get_difc_retriever(), "retrieve_with_citations", search):
+            assist = await retrieve(self._assist_state("Notice period under DIFC law"))
+            escalated = await retrieve(self._draft_state("Notice period under DIFC law"))
+        
+        assert search.await_count == 1
+        assert escalated["retrieved_context"] == assist["retrieved_context"]
+        assert escalated["citations"] == assist["citations"]
+    
+    @pytest.mark.asyncio
+    async def test_other_jurisdiction_retrieves_again(self):
+        """Escalating with a different jurisdiction is a fresh search."""
+        search = AsyncMock(return_value=([], []))
+        
+        with patch.object(get_difc_retriever(), "retrieve_with_citations", search):
+            await retrieve(self._assist_state("Notice period"))
+            await retrieve(self._draft_state("Notice period", JurisdictionType.UAE))
+        
+        assert search.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_failed_assist_retrieval_not_reused(self):
+        """A retrieval error in assist mode does not poison the draft run."""
+        search = AsyncMock(side_effect=[RuntimeError("index missing"), ([], [])])
+        
+        with patch.object(get_difc_retriever(), "retrieve_with_citations", search):
+            failed = await retrieve(self._assist_state("Notice period"))
+            escalated = await retrieve(self._draft_state("Notice period"))
+        
+        assert "Retrieval error" in failed["error"]
+        assert "error" not in escalated
+        assert search.await_count == 2
+
+
+class TestNeedsRetrieval:
+    """Test the early-exit gate for trivial prompts."""
+    
+    def test_greetings_skip_retrieval(self):
+        """Short prompts without legal vocabulary are not searched."""
+        from agents.nodes import needs_retrieval
+        
+        assert needs_retrieval("hello") is False
+        assert needs_retrieval("test") is False
+        assert needs_retrieval("Thanks!") is False
+    
+    def test_short_legal_prompt_still_retrieves(self):
+        """A single legal term is enough, even with punctuation."""
+        from agents.nodes import needs_retrieval
+        
+        assert needs_retrieval("DIFC?") is True
+        assert needs_retrieval("notice period") is True
+    
+    def test_plain_english_question_not_dropped(self):
+        """Longer questions without listed terms are still searched."""
+        from agents.nodes import needs_retrieval
+        
+        assert needs_retrieval("Can I fire someone without warning?") is True
+        assert needs_retrieval("") is False
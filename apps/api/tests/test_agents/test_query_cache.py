@@ -0,0 +1,95 @@
+"""
+Tests for the assistant response cache.
+
+Following PRP requirements:
+- 1 expected-use test, 1 edge case, 1 failure case per feature
+- Differently scoped queries must never share a cached response
+"""
+
+import pytest
+
+from core.models import AssistantQuery, AssistantMode, KnowledgeFilter, JurisdictionType
+from agents.query_cache import CachedResponse, QueryCache
+from rag.retrievers import get_difc_retriever
+
+
+def _query(prompt: str, mode: AssistantMode = AssistantMode.ASSIST, jurisdiction=JurisdictionType.DIFC):
+    return AssistantQuery(mode=mode, prompt=prompt, knowledge=KnowledgeFilter(jurisdiction=jurisdiction))
+
+
+async def _embed(text: str):
+    """Toy embedding: questions about notice periods point the same way."""
+    return [1.0, 0.0] if "notice" in text else [0.0, 1.0]
+
+
+class TestQueryCache:
+    """Test exact and semantic response reuse."""
+
+    @pytest.mark.asyncio
+    async def test_exact_and_semantic_hits(self):
+        """Normalized repeats and semantically similar prompts reuse the response."""
+        pytest.importorskip("numpy")
+        cache = QueryCache(semantic=True, embed=_embed)
+        response = CachedResponse(content="30 days notice under DIFC Employment Law.")
+        await cache.store(cache.key_for(_query("What is the notice period?")), response)
+
+        exact = await cache.lookup(cache.key_for(_query("  what is the NOTICE period? ")))
+        semantic = await cache.lookup(cache.key_for(_query("How much notice must an employer give?")))
+
+        assert exact is response
+        assert semantic is response
+
+    @pytest.mark.asyncio
+    async def test_semantic_tier_off_by_default(self):
+        """Without opting in, only exact prompts hit and nothing is embedded."""
+        calls = []
+
+        async def embed(text):
+            calls.append(text)
+            return await _embed(text)
+
+        cache = QueryCache(embed=embed)
+        response = CachedResponse(content="x")
+        await cache.store(cache.key_for(_query("What is the notice period?")), response)
+
+        assert await cache.lookup(cache.key_for(_query("what is the notice period?"))) is response
+        assert await cache.lookup(cache.key_for(_query("How much notice must an employer give?"))) is None
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_scope_isolates_mode_and_jurisdiction(self):
+        """The same prompt in another mode or jurisdiction is a miss."""
+        cache = QueryCache(embed=_embed)
+        await cache.store(cache.key_for(_query("What is the notice period?")), CachedResponse(content="x"))
+
+        draft = await cache.lookup(cache.key_for(_query("What is the notice period?", mode=AssistantMode.DRAFT)))
+        uae = await cache.lookup(cache.key_for(
+            _query("What is the notice period?", jurisdiction=JurisdictionType.UAE)
+        ))
+
+        assert draft is None
+        assert uae is None
+
+    @pytest.mark.asyncio
+    async def test_vector_store_write_invalidates(self, monkeypatch):
+        """Ingesting documents makes earlier answers miss."""
+        cache = QueryCache(embed=_embed)
+        await cache.store(cache.key_for(_query("What is the notice period?")), CachedResponse(content="x"))
+
+        store = get_difc_retriever().vector_store
+        monkeypatch.setattr(store, "generation", store.generation + 1)
+
+        assert await cache.lookup(cache.key_for(_query("What is the notice period?"))) is None
+
+    @pytest.mark.asyncio
+    async def test_embedding_failure_falls_back_to_exact_tier(self):
+        """If embedding fails, only exact matches are served."""
+        async def failing_embed(text):
+            raise RuntimeError("Embedding service unavailable")
+
+        cache = QueryCache(semantic=True, embed=failing_embed)
+        response = CachedResponse(content="x")
+        await cache.store(cache.key_for(_query("What is the notice period?")), response)
+
+        assert await cache.lookup(cache.key_for(_query("what is the notice period?"))) is response
+        assert await cache.lookup(cache.key_for(_query("Explain DIFC notice rules"))) is None
@@ -255,6 +255,7 @@ class TestAssistantSSEStreaming:
         assert "Access-Control-Allow-Origin" in response.headers
         assert response.headers["Cache-Control"] == "no-cache"
         assert response.headers["Connection"] == "keep-alive"
+        assert response.headers["X-Accel-Buffering"] == "no"
     
     def _parse_sse_events(self, response_text: str) -> list[dict]:
         """Parse SSE response into structured events."""
@@ -272,6 +273,167 @@ class TestAssistantSSEStreaming:
         return events
 
 
+class TestAssistantSSEBackpressure:
+    """Test the bounded queue between the workflow and the SSE client."""
+    
+    @staticmethod
+    def _frames(count: int):
+        from api.assistant import sse
+        
+        async def events(query):
+            for i in range(count):
+                yield sse(str(i).encode())
+        return events
+    
+    @pytest.mark.asyncio
+    async def test_frames_delivered_in_order(self, sample_assistant_queries):
+        """All frames pass through the queue in production order."""
+        from api.assistant import stream_assistant_response
+        
+        with patch("api.assistant._assistant_events", self._frames(10)):
+            frames = [
+                frame
+                async for frame in stream_assistant_response(sample_assistant_queries["assist_basic"])
+            ]
+        
+        assert frames == [f"data: {i}\n\n".encode() for i in range(10)]
+    
+    @pytest.mark.asyncio
+    async def test_slow_client_stream_closed(self, sample_assistant_queries):
+        """A client that stops reading is disconnected after the queue timeout."""
+        from api.assistant import stream_assistant_response, settings
+        
+        with patch("api.assistant._assistant_events", self._frames(100)), \
+             patch.object(settings, "sse_max_queue_size", 2), \
+             patch.object(settings, "sse_queue_timeout", 0.01):
+            stream = stream_assistant_response(sample_assistant_queries["assist_basic"])
+            first = await stream.__anext__()
+            await asyncio.sleep(0.1)  # Client stalls while the producer fills the queue
+            remaining = [frame async for frame in stream]
+        
+        assert first == b"data: 0\n\n"
+        assert len(remaining) < 99
+        # The client is told the answer was cut short
+        assert remaining[-1].startswith(b"event: error\n")
+    
+    @pytest.mark.asyncio
+    async def test_producer_failure_ends_stream_with_error(self, sample_assistant_queries):
+        """An unexpected producer exception still terminates the stream."""
+        from api.assistant import sse, stream_assistant_response
+        
+        async def failing(query):
+            yield sse(b"0")
+            raise RuntimeError("Serialization failed")
+        
+        with patch("api.assistant._assistant_events", failing):
+            frames = await asyncio.wait_for(
+                self._collect(stream_assistant_response(sample_assistant_queries["assist_basic"])),
+                timeout=1
+            )
+        
+        assert frames[0] == b"data: 0\n\n"
+        assert frames[-1].startswith(b"event: error\n")
+        assert b"Serialization failed" in frames[-1]
+    
+    @staticmethod
+    async def _collect(stream):
+        return [frame async for frame in stream]
+    
+    @pytest.mark.asyncio
+    async def test_keep_alive_sent_while_workflow_is_silent(self, sample_assistant_queries):
+        """A long pause between frames produces keep-alive comments, not a timeout."""
+        from api.assistant import KEEP_ALIVE_FRAME, sse, settings, stream_assistant_response
+        
+        async def slow(query):
+            await asyncio.sleep(0.05)
+            yield sse(b"0")
+        
+        with patch("api.assistant._assistant_events", slow), \
+             patch.object(settings, "sse_ping_interval", 0.01):
+            frames = await self._collect(stream_assistant_response(sample_assistant_queries["assist_basic"]))
+        
+        assert KEEP_ALIVE_FRAME in frames
+        assert frames[-1] == b"data: 0\n\n"
+    
+    def test_frames_are_prebuilt_sse_bytes(self):
+        """Message, done and error frames are ready-to-send SSE bytes."""
+        from api.assistant import _done, _error, _message
+        from core.models import StreamDone, StreamError, TextChunk
+        
+        chunk = _message(TextChunk(text="DIFC"))
+        done = _done([])
+        error = _error(StreamError(error="Model unavailable"))
+        
+        assert chunk == b'data: {"type":"chunk","text":"DIFC"}\n\n'
+        assert done == b"data: " + StreamDone(final_response="Response completed").model_dump_json().encode() + b"\n\n"
+        assert error == b'event: error\ndata: {"error":"Model unavailable"}\n\n'
+    
+    @pytest.mark.asyncio
+    async def test_client_disconnect_cancels_producer(self, sample_assistant_queries):
+        """Closing the stream stops the workflow producer."""
+        from api.assistant import sse, stream_assistant_response
+        
+        cancelled = asyncio.Event()
+        
+        async def endless(query):
+            try:
+                while True:
+                    yield sse(b"x")
+            finally:
+                cancelled.set()
+        
+        with patch("api.assistant._assistant_events", endless):
+            stream = stream_assistant_response(sample_assistant_queries["assist_basic"])
+            await stream.__anext__()
+            await stream.aclose()
+            await asyncio.wait_for(cancelled.wait(), timeout=1)
+        
+        assert cancelled.is_set()
+
+
+class TestAssistantMetadataCache:
+    """Test TTL caching of the /models and /knowledge-sources payloads."""
+    
+    def test_value_reused_until_invalidated(self):
+        """The loader runs once per TTL window and again after invalidate()."""
+        from api.assistant import _TTLValue
+        
+        load = MagicMock(return_value={"manual_override": None})
+        cached = _TTLValue(ttl=30)
+        
+        assert cached.get(load) is cached.get(load)
+        assert load.call_count == 1
+        
+        cached.invalidate()
+        cached.get(load)
+        assert load.call_count == 2
+    
+    def test_expiry_and_version_change_reload(self):
+        """An expired TTL or a new vector store generation recomputes the value."""
+        from api.assistant import _TTLValue
+        
+        load = MagicMock(side_effect=[{"total_vectors": 1}, {"total_vectors": 2}, {"total_vectors": 3}])
+        
+        versioned = _TTLValue(ttl=30)
+        assert versioned.get(load, version=0) == {"total_vectors": 1}
+        assert versioned.get(load, version=1) == {"total_vectors": 2}
+        
+        expired = _TTLValue(ttl=0)
+        assert expired.get(load) == {"total_vectors": 3}
+        assert load.call_count == 3
+    
+    def test_failed_load_not_cached(self):
+        """A loader error propagates and the next request retries."""
+        from api.assistant import _TTLValue
+        
+        load = MagicMock(side_effect=[RuntimeError("Index unreadable"), {"total_vectors": 5}])
+        cached = _TTLValue(ttl=30)
+        
+        with pytest.raises(RuntimeError):
+            cached.get(load)
+        assert cached.get(load) == {"total_vectors": 5}
+
+
 class TestAssistantModelRouting:
     """Test model routing and override functionality."""
     
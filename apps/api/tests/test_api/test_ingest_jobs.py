@@ -0,0 +1,230 @@
+"""
+Tests for ingestion job listing and statistics.
+
+Following PRP requirements:
+- 1 expected-use test, 1 edge case, 1 failure case per feature
+- Listing walks jobs newest first without sorting the whole table
+- The job table is bounded and keeps running statistics
+- Eviction stops at the first finished jobs it needs
+- Form enums resolve by dict lookup; unknown jurisdictions are rejected
+"""
+
+import io
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from api import ingest
+from core.models import IngestionJob, IngestionStatus, InstrumentType, JurisdictionType
+
+
+_STATUSES = [
+    IngestionStatus.COMPLETED,
+    IngestionStatus.FAILED,
+    IngestionStatus.COMPLETED,
+    IngestionStatus.PROCESSING,
+    IngestionStatus.PENDING,
+]
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    """Five jobs created a minute apart, oldest first."""
+    start = datetime(2024, 1, 1)
+    table = ingest.JobStore(max_jobs=100)
+    for i, status in enumerate(_STATUSES):
+        table.create(IngestionJob(
+            id=f"job-{i}",
+            status=status,
+            file_count=2,
+            error_count=1 if status == IngestionStatus.FAILED else 0,
+            document_ids=[f"doc-{i}"] if status == IngestionStatus.COMPLETED else [],
+            created_at=start + timedelta(minutes=i)
+        ))
+    monkeypatch.setattr(ingest, "ingestion_jobs", table)
+    monkeypatch.setattr(ingest.vector_store, "get_stats", lambda: {"total_vectors": 0})
+    return table
+
+
+class TestListIngestionJobs:
+    """Test newest-first job pagination."""
+
+    @pytest.mark.asyncio
+    async def test_pages_newest_first(self, jobs):
+        """Pages come back newest first with the full count."""
+        page = await ingest.list_ingestion_jobs(limit=2, offset=1)
+
+        assert [job["job_id"] for job in page["jobs"]] == ["job-3", "job-2"]
+        assert page["total_count"] == 5
+        assert page["has_more"] is True
+
+    @pytest.mark.asyncio
+    async def test_status_filter_counts_all_matches(self, jobs):
+        """Filtered listings page over matches and still report their total."""
+        page = await ingest.list_ingestion_jobs(limit=1, offset=0, status="completed")
+
+        assert [job["job_id"] for job in page["jobs"]] == ["job-2"]
+        assert page["total_count"] == 2
+        assert page["has_more"] is True
+
+    @pytest.mark.asyncio
+    async def test_offset_past_end_is_empty(self, jobs):
+        """An offset beyond the last job returns an empty page."""
+        page = await ingest.list_ingestion_jobs(limit=10, offset=50)
+
+        assert page["jobs"] == []
+        assert page["has_more"] is False
+
+
+class TestIngestionStats:
+    """Test single-pass job statistics."""
+
+    @pytest.mark.asyncio
+    async def test_counts_by_status(self, jobs):
+        """Each status and the document totals are counted once."""
+        stats = await ingest.get_ingestion_stats()
+
+        assert stats["ingestion_jobs"] == {
+            "total": 5, "completed": 2, "failed": 1, "processing": 1, "pending": 1
+        }
+        assert stats["documents"]["total_ingested"] == 2
+        assert stats["documents"]["total_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_no_jobs(self, jobs, monkeypatch):
+        """An empty job table reports zeros and no division by zero."""
+        monkeypatch.setattr(ingest, "ingestion_jobs", ingest.JobStore(max_jobs=100))
+
+        stats = await ingest.get_ingestion_stats()
+
+        assert stats["ingestion_jobs"]["total"] == 0
+        assert stats["documents"]["success_rate"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stats_error_is_http_500(self, jobs, monkeypatch):
+        """A failing vector store is reported as a server error."""
+        from fastapi import HTTPException
+
+        def broken_stats():
+            raise RuntimeError("index unavailable")
+
+        monkeypatch.setattr(ingest.vector_store, "get_stats", broken_stats)
+
+        with pytest.raises(HTTPException) as exc:
+            await ingest.get_ingestion_stats()
+        assert exc.value.status_code == 500
+
+
+class TestJobStore:
+    """Test the bounded job table and its running totals."""
+
+    def test_totals_follow_updates_and_deletes(self, jobs):
+        """Counters track status changes, results and deletions."""
+        jobs.update("job-3", status=IngestionStatus.COMPLETED, document_ids=["a", "b"], error_count=2)
+        jobs.delete("job-0")
+
+        assert jobs.status_counts[IngestionStatus.COMPLETED] == 2
+        assert jobs.status_counts[IngestionStatus.PROCESSING] == 0
+        assert jobs.total_documents == 3
+        assert jobs.total_errors == 3
+
+    def test_oldest_finished_jobs_evicted(self):
+        """Over capacity, the oldest finished job goes first and running jobs stay."""
+        store = ingest.JobStore(max_jobs=2)
+        store.create(IngestionJob(id="running", status=IngestionStatus.PROCESSING, file_count=1))
+        store.create(IngestionJob(id="done", status=IngestionStatus.COMPLETED, file_count=1, document_ids=["d"]))
+        store.create(IngestionJob(id="new", file_count=1))
+
+        assert [job.id for job in store.values()] == ["running", "new"]
+        assert store.total_documents == 0
+        assert store.status_counts[IngestionStatus.COMPLETED] == 0
+
+    def test_update_of_evicted_job_is_ignored(self):
+        """A stream finishing after its job was dropped does not corrupt totals."""
+        store = ingest.JobStore(max_jobs=10)
+
+        store.update("missing", status=IngestionStatus.COMPLETED, error_count=3)
+
+        assert len(store) == 0
+        assert store.total_errors == 0
+        assert not store.status_counts[IngestionStatus.COMPLETED]
+
+
+class _CountingJobs(OrderedDict):
+    """Job table that counts the entries eviction walks over."""
+
+    visited = 0
+
+    def items(self):
+        for item in super().items():
+            self.visited += 1
+            yield item
+
+
+class TestJobEviction:
+    """Test evicting finished jobs from the oldest end."""
+
+    def test_walk_stops_at_first_finished_job(self):
+        """Only the entries up to the evicted job are looked at."""
+        store = ingest.JobStore(max_jobs=100)
+        store._jobs = _CountingJobs()
+        for i in range(100):
+            store.create(IngestionJob(id=f"job-{i}", status=IngestionStatus.COMPLETED, file_count=1))
+
+        store.create(IngestionJob(id="new", file_count=1))
+
+        assert store._jobs.visited == 1
+        assert "job-0" not in store and len(store) == 100
+
+    def test_running_jobs_are_skipped(self):
+        """Running jobs at the old end are passed over, not evicted."""
+        store = ingest.JobStore(max_jobs=3)
+        store._jobs = _CountingJobs()
+        for job_id, status in [("a", IngestionStatus.PROCESSING), ("b", IngestionStatus.PROCESSING), ("c", IngestionStatus.FAILED)]:
+            store.create(IngestionJob(id=job_id, status=status, file_count=1))
+
+        store.create(IngestionJob(id="new", file_count=1))
+
+        assert [job.id for job in store.values()] == ["a", "b", "new"]
+        assert store._jobs.visited == 3
+
+    def test_no_finished_job_keeps_all(self):
+        """With nothing finished to evict the table grows past capacity."""
+        store = ingest.JobStore(max_jobs=1)
+        store.create(IngestionJob(id="a", status=IngestionStatus.PROCESSING, file_count=1))
+
+        store.create(IngestionJob(id="b", file_count=1))
+
+        assert len(store) == 2
+
+
+class TestFormEnums:
+    """Test jurisdiction and instrument type resolution."""
+
+    def test_valid_values_resolve(self):
+        """Jurisdiction values and instrument names map to their enums."""
+        assert ingest._resolve_form_enums("DFSA", "RULEBOOK") == (JurisdictionType.DFSA, InstrumentType.RULEBOOK)
+
+    def test_unknown_instrument_falls_back_to_other(self):
+        """Unknown or value-cased instrument names resolve to OTHER."""
+        assert ingest._resolve_form_enums("DIFC", "Rulebook")[1] == InstrumentType.OTHER
+        assert ingest._resolve_form_enums("DIFC", "TREATY")[1] == InstrumentType.OTHER
+
+    @pytest.mark.asyncio
+    async def test_invalid_jurisdiction_rejected(self):
+        """Both endpoints reject an unknown jurisdiction with 400."""
+        with pytest.raises(HTTPException) as batch_error:
+            await ingest.ingest_documents_batch(
+                files=[UploadFile(io.BytesIO(b"x"), filename="law.txt")],
+                jurisdiction="difc", instrument_type="LAW", project_id=None, db=None
+            )
+        with pytest.raises(HTTPException) as single_error:
+            await ingest.ingest_single_document(
+                file=UploadFile(io.BytesIO(b"x"), filename="law.txt"),
+                jurisdiction="Mars", instrument_type="LAW", project_id=None, db=None
+            )
+
+        assert batch_error.value.status_code == 400
+        assert single_error.value.status_code == 400
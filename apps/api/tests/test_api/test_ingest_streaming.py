@@ -0,0 +1,730 @@
+"""
+Tests for the streaming batch ingestion pipeline.
+
+Following PRP requirements:
+- 1 expected-use test, 1 edge case, 1 failure case per feature
+- Embedding calls for a document run concurrently, bounded by settings
+- Chunks from a job's files share full-size embedding batches
+- Batches are packed by chunk token count and vectors keep chunk order
+- Chunks are sliced from the original text by word offsets
+- Adjacent chunks overlap by a quarter of their words
+- Each flush writes to the vector store once
+- Uploaded text is read off the event loop thread
+- A document's chunks share one read-only metadata mapping
+- Chunks carry the token count the chunker already computed
+- Streamed chunking matches chunking the whole text
+- Embedding progress events are throttled
+- Events are sent as pre-encoded SSE byte frames
+- Events of one processing step share a timestamp
+- Chunking runs on worker threads
+- Frames splice event fields after a per-job pre-encoded prefix
+"""
+
+import asyncio
+import json
+import random
+import threading
+from datetime import datetime
+
+import pytest
+
+from api import ingest
+from rag import pipeline
+from core.config import settings
+from core.models import DocumentMetadata, InstrumentType, JurisdictionType
+from core.storage import StorageManager
+from rag.vector_store import DocumentChunk, VectorStore
+
+
+async def _run(monkeypatch, tmp_path, files, embedder, store=None):
+    """Run a job against temp storage and return (events, vector store)."""
+    store = store or VectorStore(index_dir=tmp_path / "index")
+    monkeypatch.setattr(ingest, "storage", StorageManager(base_path=tmp_path / "files"))
+    monkeypatch.setattr(pipeline, "embedding_provider", embedder)
+    monkeypatch.setattr(pipeline, "vector_store", store)
+
+    events = []
+    async for frame in ingest.stream_ingestion_progress(
+        job_id="job-1",
+        files=files,
+        jurisdiction=JurisdictionType.DIFC,
+        instrument_type=InstrumentType.LAW,
+        project_id="test"
+    ):
+        events.append(_parse(frame))
+    return events, store
+
+
+def _parse(frame: bytes) -> dict:
+    """Decode the JSON payload of an SSE frame."""
+    assert frame.endswith(b"\n\n")
+    data = frame.split(b"data: ", 1)[1]
+    return json.loads(data)
+
+
+def _words(count: int, word: str = "notice") -> str:
+    return " ".join(f"{word}{i}" for i in range(count))
+
+
+class TestConcurrentEmbedding:
+    """Test concurrent embedding of a document's chunk batches."""
+
+    @pytest.mark.asyncio
+    async def test_batches_embedded_concurrently_in_order(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """Batches overlap up to the cap and vectors land in chunk order."""
+        pytest.importorskip("faiss")
+        monkeypatch.setattr(settings, "ingest_embedding_concurrency", 4)
+        monkeypatch.setattr(settings, "ingest_embedding_batch_size", 10)
+        embedder = embedder_factory(delay=0.01)
+
+        events, store = await _run(monkeypatch, tmp_path, [upload_factory("law.txt", _words(11_375))], embedder)
+
+        assert len(embedder.calls) == 3
+        assert embedder.max_in_flight == 3
+        progress = [e for e in events if e["type"] == "embedding_progress"]
+        assert len(progress) == 1
+        assert progress[0]["processed_chunks"] == progress[0]["total_chunks"] == 30
+        assert [v["chunk_index"] for v in store._metadata["vectors"]] == list(range(30))
+        assert store._index.ntotal == 30
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap_is_respected(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """No more than the configured number of calls are in flight."""
+        pytest.importorskip("faiss")
+        monkeypatch.setattr(settings, "ingest_embedding_concurrency", 2)
+        monkeypatch.setattr(settings, "ingest_embedding_batch_size", 10)
+        embedder = embedder_factory(delay=0.01)
+
+        events, store = await _run(monkeypatch, tmp_path, [upload_factory("law.txt", _words(18_875))], embedder)
+
+        assert len(embedder.calls) == 5
+        assert embedder.max_in_flight == 2
+        assert events[-1]["type"] == "ingestion_complete" and events[-1]["success"]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_fails_only_that_file(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """An embedding error is reported for its file and nothing is indexed for it."""
+        pytest.importorskip("faiss")
+        monkeypatch.setattr(settings, "ingest_embedding_batch_size", 2)
+        embedder = embedder_factory(delay=0.01, fail_on="broken")
+        files = [upload_factory("bad.txt", _words(600, "broken")), upload_factory("good.txt", _words(50))]
+
+        events, store = await _run(monkeypatch, tmp_path, files, embedder)
+
+        assert [e["type"] for e in events if e["type"] in ("file_error", "file_complete")] == [
+            "file_error", "file_complete"
+        ]
+        assert events[-1]["error_count"] == 1
+        assert store._index.ntotal == 1
+
+
+class TestCrossFileBatching:
+    """Test embedding batches shared across a job's files."""
+
+    @pytest.mark.asyncio
+    async def test_small_files_share_one_call(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """Several one-chunk files are embedded in a single request."""
+        pytest.importorskip("faiss")
+        embedder = embedder_factory(delay=0.01)
+        files = [upload_factory(f"law{i}.txt", _words(20)) for i in range(5)]
+
+        events, store = await _run(monkeypatch, tmp_path, files, embedder)
+
+        assert len(embedder.calls) == 1
+        assert len(embedder.calls[0]) == 5
+        completed = [e for e in events if e["type"] == "file_complete"]
+        assert [e["filename"] for e in completed] == [f"law{i}.txt" for i in range(5)]
+        assert events[-1]["processed_count"] == 5
+        assert store._index.ntotal == 5
+
+    @pytest.mark.asyncio
+    async def test_full_batches_flush_before_job_end(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """Full batches are embedded as soon as they fill; the remainder at the end."""
+        pytest.importorskip("faiss")
+        monkeypatch.setattr(settings, "ingest_embedding_batch_size", 3)
+        embedder = embedder_factory(delay=0.01)
+        files = [upload_factory(f"law{i}.txt", _words(700)) for i in range(2)]
+
+        events, store = await _run(monkeypatch, tmp_path, files, embedder)
+
+        assert [len(call) for call in embedder.calls] == [3, 1]
+        types = [e["type"] for e in events]
+        assert types.index("file_complete") < types.index("ingestion_complete")
+        assert types.index("embedding_progress") < types.index("file_complete")
+        progress = [e for e in events if e["type"] == "embedding_progress"]
+        assert (progress[-1]["processed_chunks"], progress[-1]["total_chunks"]) == (4, 4)
+
+    @pytest.mark.asyncio
+    async def test_failed_shared_batch_fails_every_file_in_it(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """Files whose chunks shared a failed call are all reported as errors."""
+        pytest.importorskip("faiss")
+        embedder = embedder_factory(delay=0.01, fail_on="broken")
+        files = [upload_factory("bad.txt", _words(20, "broken")), upload_factory("good.txt", _words(20))]
+
+        events, store = await _run(monkeypatch, tmp_path, files, embedder)
+
+        assert [e["filename"] for e in events if e["type"] == "file_error"] == ["bad.txt", "good.txt"]
+        assert events[-1]["success"] is False
+        assert store._index is None
+
+
+class TestLengthPacking:
+    """Test packing embedding batches by chunk token count."""
+
+    @pytest.mark.asyncio
+    async def test_vectors_written_back_in_chunk_order(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """Packing reorders requests but each chunk keeps its own vector."""
+        pytest.importorskip("faiss")
+        monkeypatch.setattr(settings, "ingest_embedding_token_budget", 250)
+        embedder = embedder_factory(delay=0.01)
+        files = [upload_factory(f"law{i}.txt", _words(count)) for i, count in enumerate([30, 200, 5, 120, 60])]
+
+        events, store = await _run(monkeypatch, tmp_path, files, embedder)
+
+        first_call = [len(text.split()) for text in embedder.calls[0]]
+        assert first_call == sorted(first_call, reverse=True)
+        assert all(sum(len(text.split()) for text in call) <= 250 or len(call) == 1 for call in embedder.calls)
+        assert len(embedder.calls) > 1
+        for position, entry in enumerate(store._metadata["vectors"]):
+            chunk = store._chunks[entry["chunk_id"]]
+            assert store._index.reconstruct(position)[0] == len(chunk.content)
+
+    def test_oversized_chunk_gets_own_batch(self):
+        """A chunk over the budget is never packed with others."""
+        chunks = [
+            DocumentChunk(id=f"c{i}", doc_id="d0", content="x", chunk_index=i, token_count=tokens)
+            for i, tokens in enumerate([10, 500, 20, 30])
+        ]
+
+        packs = pipeline._pack_by_tokens(chunks, max_batch=2, token_budget=100)
+
+        assert packs == [[1], [3, 2], [0]]
+
+    @pytest.mark.asyncio
+    async def test_oversized_batch_falls_back_to_single_chunks(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """An out-of-memory batch is retried one chunk at a time."""
+        pytest.importorskip("faiss")
+        embedder = embedder_factory(delay=0.01, max_texts=1)
+        files = [upload_factory(f"law{i}.txt", _words(20)) for i in range(3)]
+
+        events, store = await _run(monkeypatch, tmp_path, files, embedder)
+
+        assert [len(call) for call in embedder.calls] == [3, 1, 1, 1]
+        assert events[-1]["success"] is True
+        assert store._index.ntotal == 3
+
+
+class TestWordChunking:
+    """Test offset-based word chunking."""
+
+    def test_windows_match_word_split(self):
+        """Windows hold the same words as splitting and re-joining would."""
+        content = "  ".join(f"word{i}\n" for i in range(1234))
+
+        windows = pipeline._chunk_words(content, chunk_size=500)
+
+        words = content.split()
+        assert [text.split() for text, _ in windows] == [words[i:i + 500] for i in range(0, len(words), 500)]
+
+    def test_windows_keep_original_whitespace(self):
+        """Text is sliced from the source, not re-joined with single spaces."""
+        content = "\n Article 1.\n\tNotice   period  "
+
+        assert pipeline._chunk_words(content, chunk_size=2) == [("Article 1.", 2), ("Notice   period", 2)]
+        assert pipeline._chunk_words(content, chunk_size=4) == [("Article 1.\n\tNotice   period", 4)]
+
+    def test_blank_text_has_no_chunks(self):
+        """Whitespace-only text produces no chunks."""
+        assert pipeline._chunk_words(" \n\t ", chunk_size=500) == []
+        assert pipeline._chunk_words("", chunk_size=500) == []
+
+
+class TestOverlapChunking:
+    """Test sliding-window chunking."""
+
+    def test_adjacent_windows_share_a_quarter(self):
+        """With the default stride, each window repeats the last 125 words of the previous one."""
+        content = " ".join(f"w{i}" for i in range(1200))
+
+        windows = [
+            text.split() for text, _ in pipeline._chunk_words(content, pipeline.WORDS_PER_CHUNK, pipeline.WORDS_OVERLAP)
+        ]
+
+        assert [(w[0], w[-1]) for w in windows] == [("w0", "w499"), ("w375", "w874"), ("w750", "w1199")]
+
+    def test_short_text_is_one_window(self):
+        """Text shorter than a window is not duplicated into overlapping chunks."""
+        assert pipeline._chunk_words("a b c", chunk_size=500, overlap=125) == [("a b c", 3)]
+        assert len(pipeline._chunk_words(" ".join(["x"] * 500), chunk_size=500, overlap=125)) == 1
+
+    def test_overlap_not_below_one_word_stride(self):
+        """An overlap as large as the window still advances through the text."""
+        windows = pipeline._chunk_words("a b c d", chunk_size=2, overlap=2)
+
+        assert [text for text, _ in windows] == ["a b", "b c", "c d"]
+
+
+class _CountingStore(VectorStore):
+    """Vector store that records the size of each bulk write."""
+
+    def __init__(self, index_dir, fail: bool = False):
+        super().__init__(index_dir=index_dir)
+        self.fail = fail
+        self.writes = []
+
+    async def add_chunks_with_embeddings(self, chunks, vectors):
+        self.writes.append(len(chunks))
+        if self.fail:
+            raise RuntimeError("Index is read-only")
+        return await super().add_chunks_with_embeddings(chunks, vectors)
+
+
+class TestBulkVectorWrites:
+    """Test one vector store write per flush."""
+
+    @pytest.mark.asyncio
+    async def test_many_batches_one_write(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """All batches of a flush are indexed with a single call."""
+        pytest.importorskip("faiss")
+        monkeypatch.setattr(settings, "ingest_embedding_batch_size", 10)
+        embedder = embedder_factory(delay=0.01)
+        store = _CountingStore(tmp_path / "index")
+
+        await _run(monkeypatch, tmp_path, [upload_factory("law.txt", _words(11_375))], embedder, store)
+
+        assert len(embedder.calls) == 3
+        assert store.writes == [30]
+        assert store.generation == 1
+
+    @pytest.mark.asyncio
+    async def test_final_flush_is_its_own_write(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """The leftover chunks at the end of a job get one more write."""
+        pytest.importorskip("faiss")
+        monkeypatch.setattr(settings, "ingest_embedding_batch_size", 3)
+        store = _CountingStore(tmp_path / "index")
+        files = [upload_factory(f"law{i}.txt", _words(700)) for i in range(2)]
+
+        await _run(monkeypatch, tmp_path, files, embedder_factory(delay=0.01), store)
+
+        assert store.writes == [3, 1]
+
+    @pytest.mark.asyncio
+    async def test_write_failure_fails_flushed_files(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """If the bulk write fails, every file in the flush is reported."""
+        store = _CountingStore(tmp_path / "index", fail=True)
+        files = [upload_factory(f"law{i}.txt", _words(20)) for i in range(2)]
+
+        events, _ = await _run(monkeypatch, tmp_path, files, embedder_factory(delay=0.01), store)
+
+        errors = [e for e in events if e["type"] == "file_error"]
+        assert [e["filename"] for e in errors] == ["law0.txt", "law1.txt"]
+        assert "read-only" in errors[0]["error"]
+
+
+class TestTextExtraction:
+    """Test reading stored uploads off the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_text_read_in_worker_thread(self, monkeypatch, tmp_path):
+        """The file is read on a worker thread and chunked."""
+        path = tmp_path / "law.txt"
+        path.write_text("Article 1. Notice period", encoding="utf-8")
+        threads = []
+
+        class TrackingFile:
+            def __init__(self, f):
+                self.f = f
+
+            def read(self, size):
+                threads.append(threading.get_ident())
+                return self.f.read(size)
+
+            def close(self):
+                self.f.close()
+
+        monkeypatch.setattr(pipeline, "open", lambda *a, **kw: TrackingFile(open(*a, **kw)), raising=False)
+
+        windows, length = await pipeline._extract_windows(path, "law.txt", "text/plain")
+
+        assert windows == [("Article 1. Notice period", 4)]
+        assert length == 24
+        assert threads and threading.get_ident() not in threads
+
+    @pytest.mark.asyncio
+    async def test_binary_upload_is_not_read(self, tmp_path):
+        """Non-text uploads get the demo placeholder without touching disk."""
+        windows, _ = await pipeline._extract_windows(tmp_path / "missing.pdf", "law.pdf", "application/pdf")
+
+        assert windows[0][0] == "Sample content for law.pdf (binary file not processed in demo)"
+
+    @pytest.mark.asyncio
+    async def test_undecodable_text_falls_back(self, tmp_path):
+        """Invalid UTF-8 falls back to the demo placeholder."""
+        path = tmp_path / "law.txt"
+        path.write_bytes(b"\xff\xfe\xfa")
+
+        windows, _ = await pipeline._extract_windows(path, "law.txt", "text/plain")
+
+        assert windows == [("Sample content for law.txt", 4)]
+
+
+def _windows(text: str):
+    return pipeline._chunk_words(text, pipeline.WORDS_PER_CHUNK, pipeline.WORDS_OVERLAP)
+
+
+def _doc_metadata() -> DocumentMetadata:
+    return DocumentMetadata(
+        id="doc-1", project_id="test", filename="law.txt", title="Law", file_path="p/doc-1_law.txt",
+        content_type="text/plain", size_bytes=10, jurisdiction=JurisdictionType.DIFC,
+        instrument_type=InstrumentType.LAW, upload_date=datetime(2024, 1, 1)
+    )
+
+
+class TestSharedChunkMetadata:
+    """Test one metadata mapping per document."""
+
+    def test_chunks_share_one_mapping(self):
+        """All chunks of a document reference the same metadata object."""
+        chunks = pipeline._build_chunks("doc-1", _windows(_words(2_000)), _doc_metadata())
+
+        assert len(chunks) > 1
+        assert all(chunk.metadata is chunks[0].metadata for chunk in chunks)
+        assert chunks[0].metadata["title"] == "Law"
+        assert chunks[0].metadata.get("jurisdiction") == JurisdictionType.DIFC
+
+    def test_documents_do_not_share(self):
+        """Separate documents get separate mappings."""
+        first = pipeline._build_chunks("doc-1", _windows("a b"), _doc_metadata())
+        second = pipeline._build_chunks("doc-2", _windows("c d"), _doc_metadata())
+
+        assert first[0].metadata is not second[0].metadata
+
+    def test_shared_mapping_is_read_only(self):
+        """A chunk cannot change metadata seen by its siblings."""
+        chunks = pipeline._build_chunks("doc-1", _windows(_words(2_000)), _doc_metadata())
+
+        with pytest.raises(TypeError):
+            chunks[0].metadata["title"] = "Changed"
+
+
+class TestChunkTokenCounts:
+    """Test token counts recorded at chunking time."""
+
+    def test_chunks_record_word_counts(self):
+        """Full windows count WORDS_PER_CHUNK tokens and the tail its remainder."""
+        chunks = pipeline._build_chunks("doc-1", _windows(_words(1_000)), _doc_metadata())
+
+        assert [chunk.token_count for chunk in chunks] == [500, 500, 250]
+        assert all(chunk.token_count == len(chunk.content.split()) for chunk in chunks)
+
+    def test_packer_uses_recorded_counts(self):
+        """The packer trusts token_count instead of re-splitting content."""
+        chunks = [
+            DocumentChunk(id="c0", doc_id="d0", content="short", chunk_index=0, token_count=90),
+            DocumentChunk(id="c1", doc_id="d0", content="a much longer chunk of text", chunk_index=1, token_count=5),
+        ]
+
+        assert pipeline._pack_by_tokens(chunks, max_batch=10, token_budget=100) == [[0, 1]]
+        assert pipeline._pack_by_tokens(chunks, max_batch=10, token_budget=94) == [[0], [1]]
+
+    def test_chunks_without_counts_are_counted(self):
+        """Chunks built elsewhere fall back to counting their words."""
+        chunks = [
+            DocumentChunk(id="c0", doc_id="d0", content="one two three", chunk_index=0),
+            DocumentChunk(id="c1", doc_id="d0", content="four five", chunk_index=1),
+        ]
+
+        assert pipeline._pack_by_tokens(chunks, max_batch=10, token_budget=4) == [[0], [1]]
+
+
+class TestStreamedChunking:
+    """Test chunking text as it is read in blocks."""
+
+    def test_matches_whole_text_chunking(self):
+        """Any block split yields exactly the windows of the whole text."""
+        rng = random.Random(7)
+        for _ in range(200):
+            words = [f"w{i}" for i in range(rng.randint(0, 40))]
+            text = "".join(word + rng.choice([" ", "\n", "  ", "\t "]) for word in words)
+            text = rng.choice(["", " "]) + (text.rstrip() if rng.random() < 0.5 else text)
+            size, overlap = rng.randint(1, 8), rng.randint(0, 7)
+
+            chunker = pipeline._WindowChunker(size, overlap)
+            windows = []
+            position = 0
+            while position < len(text):
+                step = rng.randint(1, 12)
+                windows.extend(chunker.feed(text[position:position + step]))
+                position += step
+            windows.extend(chunker.feed("", final=True))
+
+            assert windows == pipeline._chunk_words(text, size, overlap), (text, size, overlap)
+
+    @pytest.mark.asyncio
+    async def test_word_split_across_blocks(self, monkeypatch, tmp_path):
+        """A word cut by a block boundary is kept whole."""
+        monkeypatch.setattr(pipeline, "TEXT_BLOCK_CHARS", 4)
+        path = tmp_path / "law.txt"
+        path.write_text("Employment notice\n", encoding="utf-8")
+
+        windows, length = await pipeline._extract_windows(path, "law.txt", "text/plain")
+
+        assert windows == [("Employment notice", 2)]
+        assert length == 18
+
+    @pytest.mark.asyncio
+    async def test_blank_file_has_no_windows(self, tmp_path):
+        """A whitespace-only upload yields no chunks, so ingestion reports it."""
+        path = tmp_path / "law.txt"
+        path.write_text(" \n\n ", encoding="utf-8")
+
+        windows, _ = await pipeline._extract_windows(path, "law.txt", "text/plain")
+
+        assert windows == []
+
+
+class TestProgressThrottling:
+    """Test coalesced embedding progress events."""
+
+    @pytest.mark.asyncio
+    async def test_progress_coalesced_by_percent(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """Within the interval, progress is reported once per percent of files."""
+        pytest.importorskip("faiss")
+        monkeypatch.setattr(settings, "ingest_embedding_batch_size", 1)
+        monkeypatch.setattr(ingest, "PROGRESS_MIN_INTERVAL", float("inf"))
+        files = [upload_factory(f"law{i}.txt", "notice") for i in range(150)]
+
+        events, _ = await _run(monkeypatch, tmp_path, files, embedder_factory(delay=0.01))
+
+        progress = [e for e in events if e["type"] == "embedding_progress"]
+        assert len(progress) == 76  # every second file (2/150 >= 1%) plus the final flush
+        assert progress[-1]["processed_chunks"] == progress[-1]["total_chunks"] == 150
+
+    @pytest.mark.asyncio
+    async def test_slow_flushes_all_reported(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """Flushes further apart than the interval are each reported."""
+        pytest.importorskip("faiss")
+        monkeypatch.setattr(settings, "ingest_embedding_batch_size", 1)
+        monkeypatch.setattr(ingest, "PROGRESS_MIN_INTERVAL", 0.0)
+        files = [upload_factory(f"law{i}.txt", "notice") for i in range(20)]
+
+        events, _ = await _run(monkeypatch, tmp_path, files, embedder_factory(delay=0.01))
+
+        assert len([e for e in events if e["type"] == "embedding_progress"]) == 20
+
+    @pytest.mark.asyncio
+    async def test_final_progress_always_sent(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """The last flush reports progress even inside the interval."""
+        pytest.importorskip("faiss")
+        monkeypatch.setattr(ingest, "PROGRESS_MIN_STEP", float("inf"))
+        monkeypatch.setattr(ingest, "PROGRESS_MIN_INTERVAL", float("inf"))
+        files = [upload_factory(f"law{i}.txt", "notice") for i in range(3)]
+
+        events, _ = await _run(monkeypatch, tmp_path, files, embedder_factory(delay=0.01))
+
+        progress = [e for e in events if e["type"] == "embedding_progress"]
+        assert len(progress) == 1
+        assert progress[0]["processed_chunks"] == 3
+
+
+class TestIngestionFrames:
+    """Test SSE frames encoded straight to bytes."""
+
+    @pytest.mark.asyncio
+    async def test_frames_are_sse_bytes(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """Every event is a ready-to-send message frame with the usual payload."""
+        pytest.importorskip("faiss")
+        frames = []
+        monkeypatch.setattr(ingest, "storage", StorageManager(base_path=tmp_path / "files"))
+        monkeypatch.setattr(pipeline, "embedding_provider", embedder_factory(delay=0.01))
+        monkeypatch.setattr(pipeline, "vector_store", VectorStore(index_dir=tmp_path / "index"))
+
+        async for frame in ingest.stream_ingestion_progress(
+            "job-1", [upload_factory("law.txt", "Article 1")], JurisdictionType.DIFC, InstrumentType.LAW, "test"
+        ):
+            frames.append(frame)
+
+        assert all(isinstance(f, bytes) and f.startswith(b"data: {") and f.endswith(b"}\n\n") for f in frames)
+        assert [_parse(f)["type"] for f in frames] == [
+            "ingestion_start", "file_processing", "text_extraction", "chunking", "chunking_complete",
+            "embedding_generation", "embedding_progress", "file_complete", "ingestion_complete"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_endpoint_streams_event_stream(self, monkeypatch, upload_factory):
+        """The batch endpoint returns a raw event stream that proxies won't buffer."""
+        monkeypatch.setattr(ingest, "ingestion_jobs", ingest.JobStore(max_jobs=10))
+
+        response = await ingest.ingest_documents_batch(
+            files=[upload_factory("law.txt", "Article 1")], jurisdiction="DIFC", instrument_type="LAW",
+            project_id="test", db=None
+        )
+
+        assert response.media_type == "text/event-stream"
+        assert response.headers["x-accel-buffering"] == "no"
+        assert response.headers["cache-control"] == "no-cache"
+
+    @pytest.mark.asyncio
+    async def test_job_failure_is_error_frame(self, monkeypatch, tmp_path, upload_factory):
+        """A job-level failure is sent as an SSE error event."""
+        class BrokenStorage:
+            async def store_uploads(self, files, project_id):
+                raise OSError("storage offline")
+
+        monkeypatch.setattr(ingest, "storage", BrokenStorage())
+        frames = [
+            frame async for frame in ingest.stream_ingestion_progress(
+                "job-1", [upload_factory("law.txt", "Article 1")], JurisdictionType.DIFC, InstrumentType.LAW, "test"
+            )
+        ]
+
+        assert frames[-1].startswith(b"event: error\ndata: ")
+        assert _parse(frames[-1])["type"] == "ingestion_error"
+        assert "storage offline" in _parse(frames[-1])["error"]
+
+
+class TestEventTimestamps:
+    """Test timestamps shared by the events of one step."""
+
+    @pytest.mark.asyncio
+    async def test_step_events_share_timestamp(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """Events of the same step carry one timestamp; only a handful are taken."""
+        pytest.importorskip("faiss")
+        calls = []
+
+        class CountingDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                calls.append(1)
+                return super().now(tz)
+
+        monkeypatch.setattr(ingest, "datetime", CountingDatetime)
+        monkeypatch.setattr(pipeline, "datetime", CountingDatetime)
+
+        events, _ = await _run(monkeypatch, tmp_path, [upload_factory("law.txt", "Article 1")], embedder_factory(delay=0.01))
+
+        by_type = {e["type"]: e["timestamp"] for e in events}
+        assert by_type["file_processing"] == by_type["text_extraction"]
+        assert by_type["chunking"] == by_type["chunking_complete"] == by_type["embedding_generation"]
+        assert by_type["embedding_progress"] == by_type["file_complete"]
+        assert len(calls) == 5
+
+    @pytest.mark.asyncio
+    async def test_job_times_match_events(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """The start and completion events report the job's recorded times."""
+        pytest.importorskip("faiss")
+        job = ingest.IngestionJob(id="job-1", file_count=1)
+        jobs = ingest.JobStore(max_jobs=10)
+        jobs.create(job)
+        monkeypatch.setattr(ingest, "ingestion_jobs", jobs)
+
+        events, _ = await _run(monkeypatch, tmp_path, [upload_factory("law.txt", "Article 1")], embedder_factory(delay=0.01))
+
+        assert events[0]["timestamp"] == job.started_at.isoformat()
+        assert events[-1]["timestamp"] == job.completed_at.isoformat()
+
+    @pytest.mark.asyncio
+    async def test_failure_time_matches_error_event(self, monkeypatch, tmp_path, upload_factory):
+        """A failed job's completion time is the error event's timestamp."""
+        class BrokenStorage:
+            async def store_uploads(self, files, project_id):
+                raise OSError("storage offline")
+
+        job = ingest.IngestionJob(id="job-1", file_count=1)
+        jobs = ingest.JobStore(max_jobs=10)
+        jobs.create(job)
+        monkeypatch.setattr(ingest, "ingestion_jobs", jobs)
+        monkeypatch.setattr(ingest, "storage", BrokenStorage())
+
+        events = [
+            _parse(frame) async for frame in ingest.stream_ingestion_progress(
+                "job-1", [upload_factory("law.txt", "Article 1")], JurisdictionType.DIFC, InstrumentType.LAW, "test"
+            )
+        ]
+
+        assert events[-1]["type"] == "ingestion_error"
+        assert events[-1]["timestamp"] == job.completed_at.isoformat()
+
+
+class TestChunkingOffLoop:
+    """Test chunk construction on worker threads."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_built_in_worker_thread(self, monkeypatch, tmp_path, embedder_factory, upload_factory):
+        """Building a file's chunks does not run on the event loop thread."""
+        pytest.importorskip("faiss")
+        threads = []
+        build_chunks = pipeline._build_chunks
+
+        def tracking_build_chunks(*args):
+            threads.append(threading.get_ident())
+            return build_chunks(*args)
+
+        monkeypatch.setattr(pipeline, "_build_chunks", tracking_build_chunks)
+
+        events, store = await _run(monkeypatch, tmp_path, [upload_factory("law.txt", _words(900))], embedder_factory(delay=0.01))
+
+        assert threads and threading.get_ident() not in threads
+        assert store._index.ntotal == 3
+
+    @pytest.mark.asyncio
+    async def test_block_chunking_in_worker_thread(self, monkeypatch, tmp_path):
+        """Each block is chunked in the same thread hop that read it."""
+        threads = []
+        feed = pipeline._WindowChunker.feed
+
+        def tracking_feed(self, text, final=False):
+            threads.append(threading.get_ident())
+            return feed(self, text, final)
+
+        monkeypatch.setattr(pipeline._WindowChunker, "feed", tracking_feed)
+        monkeypatch.setattr(pipeline, "TEXT_BLOCK_CHARS", 1_000)
+        path = tmp_path / "law.txt"
+        path.write_text(_words(900), encoding="utf-8")
+
+        windows, _ = await pipeline._extract_windows(path, "law.txt", "text/plain")
+
+        assert len(threads) > 5 and threading.get_ident() not in threads
+        assert windows == _windows(_words(900))
+
+    @pytest.mark.asyncio
+    async def test_read_error_mid_file_falls_back(self, monkeypatch, tmp_path):
+        """A decode error in a later block still yields the demo placeholder."""
+        monkeypatch.setattr(pipeline, "TEXT_BLOCK_CHARS", 8)
+        path = tmp_path / "law.txt"
+        path.write_bytes(b"Article one two three four \xff\xfe")
+
+        windows, _ = await pipeline._extract_windows(path, "law.txt", "text/plain")
+
+        assert windows == [("Sample content for law.txt", 4)]
+
+
+class TestJobFrames:
+    """Test per-job pre-encoded frame prefixes."""
+
+    def test_frame_matches_full_payload(self):
+        """A spliced frame decodes to the type, job and fields in order."""
+        frames = ingest._JobFrames("job-1")
+
+        frame = frames.message("file_complete", {"file_id": "doc", "chunk_count": 3})
+
+        assert frame.startswith(b'data: {"type":"file_complete","job_id":"job-1",')
+        assert list(_parse(frame).items()) == [
+            ("type", "file_complete"), ("job_id", "job-1"), ("file_id", "doc"), ("chunk_count", 3)
+        ]
+
+    def test_event_without_fields(self):
+        """An event with no fields of its own is still valid JSON."""
+        frame = ingest._JobFrames("job-1").message("ingestion_start", {})
+
+        assert _parse(frame) == {"type": "ingestion_start", "job_id": "job-1"}
+
+    def test_job_id_escaped_once(self):
+        """A job id needing JSON escapes is encoded correctly in every frame."""
+        frames = ingest._JobFrames('job "1"\n')
+
+        first = frames.message("chunking", {"file_id": "a"})
+        second = frames.message("chunking", {"file_id": "b"})
+
+        assert _parse(first)["job_id"] == _parse(second)["job_id"] == 'job "1"\n'
+        assert len(frames._prefixes) == 1
@@ -0,0 +1,46 @@
+"""
+Tests for application startup configuration.
+
+Following PRP requirements:
+- 1 expected-use test, 1 edge case, 1 failure case per feature
+- Blocking work runs on a thread pool sized for concurrent uploads
+"""
+
+import asyncio
+import threading
+
+import anyio.to_thread
+import pytest
+
+main = pytest.importorskip("main")
+
+
+class TestWorkerThreads:
+    """Test sizing the pools blocking work is offloaded to."""
+
+    @pytest.mark.asyncio
+    async def test_to_thread_uses_sized_pool(self, monkeypatch):
+        """asyncio.to_thread work runs on the configured worker pool."""
+        monkeypatch.setattr(main.settings, "worker_threads", 8)
+
+        workers = main.configure_worker_threads()
+        name = await asyncio.to_thread(lambda: threading.current_thread().name)
+
+        assert workers == 8
+        assert name.startswith("qaai-worker")
+        assert anyio.to_thread.current_default_thread_limiter().total_tokens == 8
+
+    @pytest.mark.asyncio
+    async def test_default_scales_with_cpus(self, monkeypatch):
+        """Unset, the pool is four threads per CPU and never below 32."""
+        monkeypatch.setattr(main.settings, "worker_threads", None)
+        monkeypatch.setattr(main.os, "cpu_count", lambda: 16)
+        assert main.configure_worker_threads() == 64
+
+        monkeypatch.setattr(main.os, "cpu_count", lambda: None)
+        assert main.configure_worker_threads() == 32
+
+    def test_requires_running_loop(self):
+        """Configuring outside the event loop is an error rather than a silent no-op."""
+        with pytest.raises(RuntimeError):
+            main.configure_worker_threads()
@@ -0,0 +1,51 @@
+"""
+Tests for the shared JSON response class.
+
+Following PRP requirements:
+- 1 expected-use test, 1 edge case, 1 failure case per feature
+- JSON bodies are rendered by pydantic-core with JSONResponse's output format
+"""
+
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from pydantic_core import PydanticSerializationError
+
+from api.responses import FastJSONResponse
+from core.models import VaultProject
+
+
+class TestFastJSONResponse:
+    """Test rendering response bodies with pydantic-core."""
+
+    def test_default_for_routes(self):
+        """An app using it as default returns the same JSON as JSONResponse would."""
+        app = FastAPI(default_response_class=FastJSONResponse)
+        body = {"projects": [{"name": "Résumé", "count": 2, "score": 0.5, "tags": None}]}
+        app.get("/projects")(lambda: body)
+
+        response = TestClient(app).get("/projects")
+
+        assert response.headers["content-type"] == "application/json"
+        assert response.content == JSONResponse(body).body
+
+    def test_datetimes_uuids_and_models_serialized(self):
+        """Values JSONResponse cannot encode by itself are rendered directly."""
+        when = datetime(2024, 1, 2, 3, 4, 5)
+        project = VaultProject(id="p1", name="Leases", created_at=when, updated_at=when, owner="u")
+        project_id = uuid.UUID(int=1)
+
+        body = json.loads(FastJSONResponse({"id": project_id, "project": project}).body)
+
+        assert body["id"] == str(project_id)
+        assert body["project"]["created_at"] == "2024-01-02T03:04:05"
+
+    def test_unserializable_content_raises(self):
+        """Content with no JSON form is an error, not a silent repr."""
+        with pytest.raises(PydanticSerializationError):
+            FastJSONResponse({"handle": object()})
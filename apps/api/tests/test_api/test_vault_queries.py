@@ -0,0 +1,885 @@
+"""
+Tests for Vault project queries against a real async database.
+
+Following PRP requirements:
+- 1 expected-use test, 1 edge case, 1 failure case per feature
+- Existence checks are folded into the mutation they guard
+- Project listings fetch the page and its total in one query
+- Deleting a project removes its stored files concurrently
+- Upload and search build their models from module-level imports
+- Search reads each match's metadata once per field
+- Near-identical searches are served from the semantic cache
+- Each request reads the clock once for all of its timestamps
+- Storage cleanup failures are logged, not printed
+- Projects are created with a plain INSERT of known values
+- Stored projects become response models without re-validation
+- Search runs alongside the project existence check
+- Search result metadata shares fixed fields and skips re-validation
+- Read endpoints send ETags and answer matching revalidations with 304
+- Project listings stream rows in batches
+- Reads select columns instead of hydrating ORM objects
+- Uploads hold the project row lock only for the count update
+- Listing revalidation skips building response models
+"""
+
+import asyncio
+import logging
+import uuid
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI, HTTPException
+from sqlalchemy import delete, event, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from api import vault
+from core.database import Base, VaultProject as VaultProjectDB, get_db
+from core.models import CreateProjectRequest, InstrumentType, JurisdictionType, SearchRequest, VaultProject
+from core.storage import StorageManager
+from rag.semantic_cache import SemanticSearchCache
+from rag.vector_store import DocumentChunk, RetrievalMatch
+
+
+class _FakeEmbeddings:
+    """Query embedder returning fixed vectors by query text."""
+
+    def __init__(self, vectors=None):
+        self.vectors = vectors or {}
+        self.calls = []
+
+    async def embed_query(self, query):
+        self.calls.append(query)
+        return self.vectors.get(query, [1.0, 0.0, 0.0, 0.0])
+
+
+@pytest_asyncio.fixture
+async def db(monkeypatch, tmp_path):
+    """In-memory SQLite session; executed statements are recorded on db.statements."""
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement.split()[0].upper())
+    )
+    monkeypatch.setattr(vault, "storage", StorageManager(base_path=tmp_path))
+    monkeypatch.setattr(vault, "embeddings", _FakeEmbeddings())
+    monkeypatch.setattr(vault, "semantic_search_cache", SemanticSearchCache())
+
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        session.statements = statements
+        yield session
+    await engine.dispose()
+
+
+async def _create(db, name: str = "DIFC Leases") -> str:
+    response = await vault.create_project(CreateProjectRequest(name=name), db=db)
+    db.statements.clear()
+    return response.project.id
+
+
+class TestSingleRoundTripMutations:
+    """Test mutations that report a missing project themselves."""
+
+    @pytest.mark.asyncio
+    async def test_create_and_update_use_one_statement(self, db):
+        """Creating a project is one INSERT and updating it one UPDATE."""
+        response = await vault.create_project(CreateProjectRequest(name="DIFC Leases"), db=db)
+        created = db.statements[:]
+
+        updated = await vault.update_project(response.project.id, CreateProjectRequest(name="Renamed"), db=db)
+
+        assert created == ["INSERT"]
+        assert db.statements == ["INSERT", "UPDATE"]
+        assert updated.project.name == "Renamed"
+        assert updated.project.created_at == response.project.created_at
+
+    @pytest.mark.asyncio
+    async def test_delete_then_missing(self, db):
+        """A deleted project is gone, and deleting it again is a 404."""
+        project_id = await _create(db)
+
+        await vault.delete_project(project_id, db=db)
+        with pytest.raises(HTTPException) as error:
+            await vault.delete_project(project_id, db=db)
+
+        assert db.statements == ["DELETE", "DELETE"]
+        assert error.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_missing_project_not_modified(self, db, tmp_path, upload_factory):
+        """Updating or uploading to an unknown project is a 404 and stores nothing."""
+        with pytest.raises(HTTPException) as update_error:
+            await vault.update_project("missing", CreateProjectRequest(name="X"), db=db)
+        with pytest.raises(HTTPException) as upload_error:
+            await vault.upload_document("missing", file=upload_factory(), jurisdiction="DIFC", instrument_type="LAW", db=db)
+
+        assert update_error.value.status_code == upload_error.value.status_code == 404
+        assert not (tmp_path / "projects" / "missing").exists()
+
+
+class TestListProjectsCount:
+    """Test listing a page and its total in one query."""
+
+    @pytest.mark.asyncio
+    async def test_page_and_total_in_one_select(self, db):
+        """The total comes back with the page rows."""
+        for name in ("A", "B", "C"):
+            await _create(db, name)
+
+        listing = await vault.list_projects(limit=2, offset=0, visibility=None, db=db)
+
+        assert db.statements == ["SELECT"]
+        assert len(listing["projects"]) == 2
+        assert listing["total_count"] == 3 and listing["has_more"]
+
+    @pytest.mark.asyncio
+    async def test_page_past_end_still_counts(self, db):
+        """An empty page past the end reports the real total."""
+        await _create(db)
+
+        listing = await vault.list_projects(limit=20, offset=5, visibility=None, db=db)
+
+        assert listing["projects"] == []
+        assert listing["total_count"] == 1 and not listing["has_more"]
+
+    @pytest.mark.asyncio
+    async def test_filter_applies_to_total(self, db):
+        """Only projects with the requested visibility are listed and counted."""
+        await _create(db, "Private")
+        await vault.create_project(CreateProjectRequest(name="Shared", visibility="shared"), db=db)
+
+        listing = await vault.list_projects(limit=20, offset=0, visibility="shared", db=db)
+
+        assert [p.name for p in listing["projects"]] == ["Shared"]
+        assert listing["total_count"] == 1
+
+
+class _SlowStorage:
+    """Storage stand-in whose deletes overlap and can fail."""
+
+    def __init__(self, count: int, fail_on: str = None):
+        self.files = [{"file_id": f"f{i}"} for i in range(count)]
+        self.fail_on = fail_on
+        self.deleted = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def list_project_files(self, project_id):
+        return self.files
+
+    async def delete_file(self, file_id, project_id):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if file_id == self.fail_on:
+                raise OSError("permission denied")
+            self.deleted.append(file_id)
+            return True
+        finally:
+            self.in_flight -= 1
+
+
+class TestProjectFileCleanup:
+    """Test concurrent storage cleanup when a project is deleted."""
+
+    @pytest.mark.asyncio
+    async def test_files_deleted_concurrently(self, monkeypatch, db):
+        """All of a deleted project's files are removed in parallel."""
+        project_id = await _create(db)
+        fake = _SlowStorage(10)
+        monkeypatch.setattr(vault, "storage", fake)
+
+        await vault.delete_project(project_id, db=db)
+
+        assert sorted(fake.deleted) == sorted(f["file_id"] for f in fake.files)
+        assert fake.max_in_flight == 10
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self, monkeypatch, db):
+        """No more deletes than the cap are in flight at once."""
+        project_id = await _create(db)
+        fake = _SlowStorage(10)
+        monkeypatch.setattr(vault, "storage", fake)
+        monkeypatch.setattr(vault, "STORAGE_CLEANUP_CONCURRENCY", 3)
+
+        await vault.delete_project(project_id, db=db)
+
+        assert len(fake.deleted) == 10
+        assert fake.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_delete_does_not_stop_others(self, monkeypatch, db):
+        """One file failing to delete leaves the rest deleted and the request successful."""
+        project_id = await _create(db)
+        fake = _SlowStorage(5, fail_on="f2")
+        monkeypatch.setattr(vault, "storage", fake)
+
+        response = await vault.delete_project(project_id, db=db)
+
+        assert response["success"]
+        assert sorted(fake.deleted) == ["f0", "f1", "f3", "f4"]
+
+
+class _FakeRetriever:
+    """Retriever stand-in returning fixed project matches."""
+
+    def __init__(self, matches):
+        self.matches = matches
+        self.vector_store = type("Store", (), {"generation": 0})()
+        self.searches = []
+
+    async def search_vault_project(self, query, project_id, limit, query_vector=None):
+        self.searches.append((query, limit, query_vector))
+        return self.matches[:limit]
+
+
+def _match(doc_id: str, metadata=None, score: float = 0.9) -> RetrievalMatch:
+    chunk = DocumentChunk(id=f"{doc_id}_chunk_0", doc_id=doc_id, content="Lease terms", chunk_index=0, metadata=metadata)
+    return RetrievalMatch(chunk=chunk, score=score)
+
+
+class TestModelImports:
+    """Test the upload and search paths that build model objects."""
+
+    @pytest.mark.asyncio
+    async def test_upload_maps_instrument_name(self, db, upload_factory):
+        """An upload is stored with the named instrument type and counted."""
+        project_id = await _create(db)
+
+        response = await vault.upload_document(
+            project_id, file=upload_factory(), jurisdiction="DFSA", instrument_type="RULEBOOK", db=db
+        )
+
+        assert response.document.instrument_type == InstrumentType.RULEBOOK
+        assert response.document.jurisdiction == JurisdictionType.DFSA
+        assert (await db.get(VaultProjectDB, project_id)).document_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_instrument_is_other(self, db, upload_factory):
+        """An unknown instrument name falls back to OTHER."""
+        project_id = await _create(db)
+
+        response = await vault.upload_document(
+            project_id, file=upload_factory(), jurisdiction="DIFC", instrument_type="TREATY", db=db
+        )
+
+        assert response.document.instrument_type == InstrumentType.OTHER
+
+    @pytest.mark.asyncio
+    async def test_search_results_without_metadata(self, monkeypatch, db):
+        """Matches with and without chunk metadata become results."""
+        project_id = await _create(db)
+        monkeypatch.setattr(vault, "get_difc_retriever", lambda: _FakeRetriever([
+            _match("a", {"filename": "lease.txt", "title": "Lease", "size_bytes": 11}),
+            _match("b"),
+        ]))
+
+        response = await vault.search_project(project_id, SearchRequest(query="lease"), db=db)
+
+        assert [r.document.metadata.filename for r in response.results] == ["lease.txt", "Unknown"]
+        assert all(r.document.metadata.instrument_type == InstrumentType.OTHER for r in response.results)
+        assert response.total_count == 2
+
+
+class _CountingMetadata(dict):
+    """Chunk metadata that counts key lookups."""
+
+    lookups = 0
+
+    def get(self, key, default=None):
+        type(self).lookups += 1
+        return super().get(key, default)
+
+
+class TestSearchResultBuilding:
+    """Test building search results from matches."""
+
+    @pytest.mark.asyncio
+    async def test_metadata_read_once_per_field(self, monkeypatch, db):
+        """Each metadata field of a match is read exactly once."""
+        project_id = await _create(db)
+        monkeypatch.setattr(_CountingMetadata, "lookups", 0)
+        metadata = _CountingMetadata(filename="lease.txt", title="Lease", content_type="text/plain")
+        monkeypatch.setattr(vault, "get_difc_retriever", lambda: _FakeRetriever([_match("a", metadata)]))
+
+        response = await vault.search_project(project_id, SearchRequest(query="lease"), db=db)
+
+        assert _CountingMetadata.lookups == 5
+        assert response.results[0].document.metadata.title == "Lease"
+
+    @pytest.mark.asyncio
+    async def test_results_share_one_timestamp(self, monkeypatch, db):
+        """All results of a search carry the same upload_date placeholder."""
+        project_id = await _create(db)
+        monkeypatch.setattr(vault, "get_difc_retriever", lambda: _FakeRetriever([_match(f"d{i}") for i in range(5)]))
+
+        response = await vault.search_project(project_id, SearchRequest(query="lease"), db=db)
+
+        assert len({r.document.metadata.upload_date for r in response.results}) == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_score_is_search_error(self, monkeypatch, db):
+        """A match that cannot become a result fails the search with 500."""
+        project_id = await _create(db)
+        monkeypatch.setattr(vault, "get_difc_retriever", lambda: _FakeRetriever([_match("a", score=1.5)]))
+
+        with pytest.raises(HTTPException) as error:
+            await vault.search_project(project_id, SearchRequest(query="lease"), db=db)
+
+        assert error.value.status_code == 500
+
+
+class TestSemanticSearchCache:
+    """Test serving near-identical project searches from the cache."""
+
+    @pytest.mark.asyncio
+    async def test_similar_query_served_from_cache(self, monkeypatch, db):
+        """A near-identical query reuses the first search and its embedding is computed once."""
+        project_id = await _create(db)
+        retriever = _FakeRetriever([_match(f"d{i}") for i in range(3)])
+        fake_embeddings = _FakeEmbeddings({"lease term": [1.0, 0.01, 0.0, 0.0]})
+        monkeypatch.setattr(vault, "get_difc_retriever", lambda: retriever)
+        monkeypatch.setattr(vault, "embeddings", fake_embeddings)
+
+        first = await vault.search_project(project_id, SearchRequest(query="lease terms", limit=2), db=db)
+        second = await vault.search_project(project_id, SearchRequest(query="lease term", limit=3), db=db)
+
+        assert retriever.searches == [("lease terms", 20, [1.0, 0.0, 0.0, 0.0])]
+        assert fake_embeddings.calls == ["lease terms", "lease term"]
+        assert len(first.results) == 2 and len(second.results) == 3
+
+    @pytest.mark.asyncio
+    async def test_other_project_not_served(self, monkeypatch, db):
+        """The same query in another project runs its own search."""
+        first_id = await _create(db, "A")
+        second_id = await _create(db, "B")
+        retriever = _FakeRetriever([_match("d0")])
+        monkeypatch.setattr(vault, "get_difc_retriever", lambda: retriever)
+
+        await vault.search_project(first_id, SearchRequest(query="lease"), db=db)
+        await vault.search_project(second_id, SearchRequest(query="lease"), db=db)
+
+        assert len(retriever.searches) == 2
+
+    @pytest.mark.asyncio
+    async def test_new_documents_invalidate(self, monkeypatch, db):
+        """A vector store change makes the next search go to the retriever."""
+        project_id = await _create(db)
+        retriever = _FakeRetriever([_match("d0")])
+        monkeypatch.setattr(vault, "get_difc_retriever", lambda: retriever)
+
+        await vault.search_project(project_id, SearchRequest(query="lease"), db=db)
+        retriever.vector_store.generation += 1
+        await vault.search_project(project_id, SearchRequest(query="lease"), db=db)
+
+        assert len(retriever.searches) == 2
+
+
+class TestRequestTimestamps:
+    """Test one timestamp per request."""
+
+    @pytest.mark.asyncio
+    async def test_new_project_created_equals_updated(self, db):
+        """A new project's created_at and updated_at are the same instant."""
+        response = await vault.create_project(CreateProjectRequest(name="DIFC Leases"), db=db)
+
+        assert response.project.created_at == response.project.updated_at
+
+    @pytest.mark.asyncio
+    async def test_upload_date_matches_project_update(self, db, upload_factory):
+        """An upload's date is the project's new updated_at."""
+        project_id = await _create(db)
+
+        response = await vault.upload_document(
+            project_id, file=upload_factory(), jurisdiction="DIFC", instrument_type="LAW", db=db
+        )
+
+        assert (await db.get(VaultProjectDB, project_id)).updated_at == response.document.upload_date
+
+    @pytest.mark.asyncio
+    async def test_rejected_upload_keeps_timestamp(self, db, upload_factory):
+        """An upload without a filename leaves the project's updated_at alone."""
+        project_id = await _create(db)
+        before = (await db.get(VaultProjectDB, project_id)).updated_at
+
+        with pytest.raises(HTTPException):
+            await vault.upload_document(project_id, file=upload_factory(""), jurisdiction="DIFC", instrument_type="LAW", db=db)
+
+        assert (await db.get(VaultProjectDB, project_id)).updated_at == before
+
+
+class _BrokenListing(_SlowStorage):
+    """Storage stand-in whose project listing fails."""
+
+    def __init__(self, error: Exception):
+        super().__init__(0)
+        self.error = error
+
+    async def list_project_files(self, project_id):
+        raise self.error
+
+
+class TestCleanupLogging:
+    """Test logging storage cleanup failures after a project is deleted."""
+
+    @pytest.mark.asyncio
+    async def test_failed_file_logged_as_warning(self, monkeypatch, db, caplog, capsys):
+        """A file that fails to delete is logged with its id and nothing is printed."""
+        project_id = await _create(db)
+        monkeypatch.setattr(vault, "storage", _SlowStorage(2, fail_on="f1"))
+
+        with caplog.at_level(logging.WARNING, logger=vault.logger.name):
+            await vault.delete_project(project_id, db=db)
+
+        [record] = caplog.records
+        assert "f1" in record.getMessage() and project_id in record.getMessage()
+        assert isinstance(record.exc_info[1], OSError)
+        assert capsys.readouterr().out == ""
+
+    @pytest.mark.asyncio
+    async def test_unreadable_storage_logged(self, monkeypatch, db, caplog):
+        """An OS error listing the project's files is logged and the delete still succeeds."""
+        project_id = await _create(db)
+        monkeypatch.setattr(vault, "storage", _BrokenListing(PermissionError("denied")))
+
+        with caplog.at_level(logging.WARNING, logger=vault.logger.name):
+            response = await vault.delete_project(project_id, db=db)
+
+        assert response["success"]
+        assert "Storage cleanup failed for project" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_programming_error_surfaces(self, monkeypatch, db):
+        """A non-OS error during cleanup is not swallowed."""
+        project_id = await _create(db)
+        monkeypatch.setattr(vault, "storage", _BrokenListing(TypeError("bad call")))
+
+        with pytest.raises(HTTPException) as error:
+            await vault.delete_project(project_id, db=db)
+
+        assert error.value.status_code == 500
+
+
+class TestCreateProjectInsert:
+    """Test creating a project without the ORM unit of work."""
+
+    @pytest.mark.asyncio
+    async def test_row_matches_response(self, db):
+        """The stored row holds exactly the values returned to the client."""
+        response = await vault.create_project(CreateProjectRequest(name="DIFC Leases", visibility="shared"), db=db)
+
+        assert not db.identity_map
+        row = await db.get(VaultProjectDB, response.project.id)
+        assert (row.name, row.visibility, row.document_count, row.owner) == ("DIFC Leases", "shared", 0, "default_user")
+        assert row.created_at == response.project.created_at
+
+    @pytest.mark.asyncio
+    async def test_projects_get_distinct_ids(self, db):
+        """Each create inserts its own row."""
+        first = await vault.create_project(CreateProjectRequest(name="A"), db=db)
+        second = await vault.create_project(CreateProjectRequest(name="B"), db=db)
+
+        listing = await vault.list_projects(limit=20, offset=0, visibility=None, db=db)
+
+        assert first.project.id != second.project.id
+        assert listing["total_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_insert_rolled_back(self, monkeypatch, db):
+        """A rejected insert is a 500 and leaves the session usable."""
+        fixed = uuid.uuid4()
+        monkeypatch.setattr(vault.uuid, "uuid4", lambda: fixed)
+        await vault.create_project(CreateProjectRequest(name="A"), db=db)
+
+        with pytest.raises(HTTPException) as error:
+            await vault.create_project(CreateProjectRequest(name="B"), db=db)
+
+        assert error.value.status_code == 500
+        assert (await vault.list_projects(limit=20, offset=0, visibility=None, db=db))["total_count"] == 1
+
+
+class TestProjectResponseModels:
+    """Test building project responses from trusted rows."""
+
+    @pytest.mark.asyncio
+    async def test_rows_become_project_models(self, db):
+        """Listing, fetching and updating return project models with the stored values."""
+        project_id = await _create(db, "DIFC Leases")
+
+        listed = (await vault.list_projects(limit=20, offset=0, visibility=None, db=db))["projects"][0]
+        fetched = (await vault.get_project(project_id, db=db))["project"]
+        updated = (await vault.update_project(project_id, CreateProjectRequest(name="Renamed"), db=db)).project
+
+        assert all(isinstance(p, VaultProject) for p in (listed, fetched, updated))
+        assert listed.model_dump() == fetched.model_dump()
+        assert (listed.name, updated.name, updated.document_count) == ("DIFC Leases", "Renamed", 0)
+
+    @pytest.mark.asyncio
+    async def test_legacy_row_still_listed(self, db):
+        """A stored value outside the current schema does not fail the listing."""
+        project_id = await _create(db)
+        await db.execute(update(VaultProjectDB).where(VaultProjectDB.id == project_id).values(visibility="team"))
+        await db.commit()
+
+        listing = await vault.list_projects(limit=20, offset=0, visibility=None, db=db)
+
+        assert listing["projects"][0].visibility == "team"
+
+    @pytest.mark.asyncio
+    async def test_missing_project_is_404(self, db):
+        """Fetching an unknown project is still a 404."""
+        with pytest.raises(HTTPException) as error:
+            await vault.get_project("missing", db=db)
+
+        assert error.value.status_code == 404
+
+
+class _GatedRetriever(_FakeRetriever):
+    """Retriever that signals when its search starts and can be held open."""
+
+    def __init__(self, matches, hold: float = 0.0):
+        super().__init__(matches)
+        self.started = asyncio.Event()
+        self.cancelled = False
+        self.hold = hold
+
+    async def search_vault_project(self, query, project_id, limit, query_vector=None):
+        self.started.set()
+        try:
+            await asyncio.sleep(self.hold)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return await super().search_vault_project(query, project_id, limit, query_vector)
+
+
+class TestSearchPipelining:
+    """Test overlapping the search with the project existence check."""
+
+    @pytest.mark.asyncio
+    async def test_search_starts_before_check_finishes(self, monkeypatch, db):
+        """The retriever is already searching while the existence query runs."""
+        project_id = await _create(db)
+        retriever = _GatedRetriever([_match("d0")])
+        monkeypatch.setattr(vault, "get_difc_retriever", lambda: retriever)
+        execute = db.execute
+
+        async def gated_execute(*args, **kwargs):
+            await asyncio.wait_for(retriever.started.wait(), timeout=1)
+            return await execute(*args, **kwargs)
+
+        monkeypatch.setattr(db, "execute", gated_execute)
+
+        response = await vault.search_project(project_id, SearchRequest(query="lease"), db=db)
+
+        assert response.total_count == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_project_cancels_search(self, monkeypatch, db):
+        """An unknown project is a 404 and the abandoned search is cancelled."""
+        retriever = _GatedRetriever([_match("d0")], hold=10)
+        monkeypatch.setattr(vault, "get_difc_retriever", lambda: retriever)
+
+        with pytest.raises(HTTPException) as error:
+            await vault.search_project("missing", SearchRequest(query="lease"), db=db)
+        await asyncio.sleep(0)
+
+        assert error.value.status_code == 404
+        assert retriever.cancelled
+
+    @pytest.mark.asyncio
+    async def test_database_error_cancels_search(self, monkeypatch, db):
+        """A failing existence query is a 500 and does not leave the search running."""
+        retriever = _GatedRetriever([_match("d0")], hold=10)
+        monkeypatch.setattr(vault, "get_difc_retriever", lambda: retriever)
+
+        async def failing_execute(*args, **kwargs):
+            await retriever.started.wait()
+            raise OSError("database is locked")
+
+        monkeypatch.setattr(db, "execute", failing_execute)
+
+        with pytest.raises(HTTPException) as error:
+            await vault.search_project("p1", SearchRequest(query="lease"), db=db)
+        await asyncio.sleep(0)
+
+        assert error.value.status_code == 500
+        assert retriever.cancelled
+
+
+class TestSearchMetadataConstruction:
+    """Test building search result metadata from shared fields."""
+
+    @pytest.mark.asyncio
+    async def test_shared_fields_on_every_result(self, monkeypatch, db):
+        """Every result carries the project, DIFC defaults and serializes normally."""
+        project_id = await _create(db)
+        monkeypatch.setattr(vault, "get_difc_retriever", lambda: _FakeRetriever([
+            _match("a", {"filename": "lease.txt", "size_bytes": 11}), _match("b")
+        ]))
+
+        response = await vault.search_project(project_id, SearchRequest(query="lease"), db=db)
+        dumped = response.model_dump(mode="json")["results"]
+
+        assert {r["document"]["metadata"]["project_id"] for r in dumped} == {project_id}
+        assert {r["document"]["metadata"]["jurisdiction"] for r in dumped} == {"DIFC"}
+        assert dumped[0]["document"]["metadata"]["size_bytes"] == 11
+
+    @pytest.mark.asyncio
+    async def test_indexed_metadata_not_revalidated(self, monkeypatch, db):
+        """An indexed chunk with an empty filename is still returned."""
+        project_id = await _create(db)
+        monkeypatch.setattr(vault, "get_difc_retriever", lambda: _FakeRetriever([_match("a", {"filename": ""})]))
+
+        response = await vault.search_project(project_id, SearchRequest(query="lease"), db=db)
+
+        assert response.results[0].document.metadata.filename == ""
+
+    @pytest.mark.asyncio
+    async def test_result_fields_still_validated(self, monkeypatch, db):
+        """A negative score is still rejected as a search error."""
+        project_id = await _create(db)
+        monkeypatch.setattr(vault, "get_difc_retriever", lambda: _FakeRetriever([_match("a", score=-0.1)]))
+
+        with pytest.raises(HTTPException) as error:
+            await vault.search_project(project_id, SearchRequest(query="lease"), db=db)
+
+        assert error.value.status_code == 500
+
+
+@pytest_asyncio.fixture
+async def client(db):
+    """HTTP client for the Vault router sharing the test session."""
+    app = FastAPI()
+    app.include_router(vault.router)
+    app.dependency_overrides[get_db] = lambda: db
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        yield http
+
+
+class TestConditionalReads:
+    """Test ETag revalidation of read endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_matching_etag_is_not_modified(self, db, client):
+        """Every read endpoint sends an ETag and answers it with an empty 304."""
+        project_id = await _create(db)
+
+        for path in ("/projects", f"/projects/{project_id}", f"/projects/{project_id}/documents", f"/projects/{project_id}/stats"):
+            first = await client.get(path)
+            again = await client.get(path, headers={"If-None-Match": first.headers["etag"]})
+
+            assert first.status_code == 200 and first.headers["cache-control"] == "private, max-age=5"
+            assert again.status_code == 304 and again.content == b""
+            assert again.headers["etag"] == first.headers["etag"]
+
+    @pytest.mark.asyncio
+    async def test_change_gives_new_etag(self, db, client):
+        """Updating a project changes its ETag, so a stale copy gets the full body."""
+        project_id = await _create(db)
+        stale = (await client.get(f"/projects/{project_id}")).headers["etag"]
+
+        await client.put(f"/projects/{project_id}", json={"name": "Renamed"})
+        response = await client.get(f"/projects/{project_id}", headers={"If-None-Match": stale})
+
+        assert response.status_code == 200
+        assert response.json()["project"]["name"] == "Renamed"
+
+    @pytest.mark.asyncio
+    async def test_unknown_etag_and_missing_project(self, db, client):
+        """A foreign ETag gets the full body and a missing project is still a 404."""
+        await _create(db)
+
+        listing = await client.get("/projects", headers={"If-None-Match": 'W/"other", "nope"'})
+        missing = await client.get("/projects/missing", headers={"If-None-Match": "*"})
+
+        assert listing.status_code == 200 and listing.json()["total_count"] == 1
+        assert missing.status_code == 404
+
+
+class TestStreamedListing:
+    """Test listing projects from a streamed result."""
+
+    @pytest.mark.asyncio
+    async def test_page_spans_several_batches(self, monkeypatch, db):
+        """A page larger than one fetch batch is listed whole, newest first."""
+        monkeypatch.setattr(vault, "PROJECT_FETCH_BATCH", 2)
+        for name in ("A", "B", "C", "D", "E"):
+            await _create(db, name)
+
+        listing = await vault.list_projects(limit=20, offset=0, visibility=None, db=db)
+
+        assert [p.name for p in listing["projects"]] == ["E", "D", "C", "B", "A"]
+        assert listing["total_count"] == 5 and not listing["has_more"]
+
+    @pytest.mark.asyncio
+    async def test_listing_does_not_buffer_result(self, monkeypatch, db):
+        """Rows are read from a stream rather than a fully buffered result."""
+        await _create(db)
+
+        async def no_execute(*args, **kwargs):
+            raise AssertionError("listing used a buffered execute")
+
+        monkeypatch.setattr(db, "execute", no_execute)
+
+        listing = await vault.list_projects(limit=20, offset=0, visibility=None, db=db)
+
+        assert listing["total_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_error_is_listing_error(self, monkeypatch, db):
+        """A failing stream is reported as a listing error."""
+        async def failing_stream(*args, **kwargs):
+            raise OSError("connection reset")
+
+        monkeypatch.setattr(db, "stream", failing_stream)
+
+        with pytest.raises(HTTPException) as error:
+            await vault.list_projects(limit=20, offset=0, visibility=None, db=db)
+
+        assert error.value.status_code == 500
+
+
+class TestColumnReads:
+    """Test reading projects as plain column rows."""
+
+    @pytest.mark.asyncio
+    async def test_reads_load_no_orm_objects(self, db):
+        """Listing, fetching, updating and searching leave the session's identity map empty."""
+        project_id = await _create(db)
+
+        await vault.list_projects(limit=20, offset=0, visibility=None, db=db)
+        await vault.get_project(project_id, db=db)
+        await vault.update_project(project_id, CreateProjectRequest(name="Renamed"), db=db)
+        await vault.list_documents(project_id, limit=20, offset=0, db=db)
+
+        assert not db.identity_map
+
+    @pytest.mark.asyncio
+    async def test_stats_from_selected_columns(self, db):
+        """Stats report the project's stored timestamps and visibility."""
+        response = await vault.create_project(CreateProjectRequest(name="A", visibility="shared"), db=db)
+
+        stats = await vault.get_project_stats(response.project.id, db=db)
+
+        assert stats["created_at"] == response.project.created_at.isoformat()
+        assert stats["visibility"] == "shared"
+        assert stats["document_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_missing_project_checks(self, db):
+        """Document listing and stats report an unknown project as 404."""
+        with pytest.raises(HTTPException) as documents_error:
+            await vault.list_documents("missing", limit=20, offset=0, db=db)
+        with pytest.raises(HTTPException) as stats_error:
+            await vault.get_project_stats("missing", db=db)
+
+        assert documents_error.value.status_code == stats_error.value.status_code == 404
+
+
+class TestUploadRowLock:
+    """Test that uploads update the project row only after the file is stored."""
+
+    @pytest.mark.asyncio
+    async def test_count_updated_after_store(self, monkeypatch, db, upload_factory):
+        """The file is written before the count UPDATE, which is committed at once."""
+        project_id = await _create(db)
+        store_upload = vault.storage.store_upload
+        seen = []
+
+        async def recording_store(file, project_id):
+            seen.extend(db.statements)
+            return await store_upload(file, project_id)
+
+        monkeypatch.setattr(vault.storage, "store_upload", recording_store)
+
+        await vault.upload_document(project_id, file=upload_factory(), jurisdiction="DIFC", instrument_type="LAW", db=db)
+
+        assert seen == ["SELECT"]
+        assert db.statements == ["SELECT", "UPDATE"]
+        assert not db.in_transaction()
+
+    @pytest.mark.asyncio
+    async def test_project_deleted_during_store(self, monkeypatch, db, tmp_path, upload_factory):
+        """A project removed while its file was written is a 404 and the file is deleted."""
+        project_id = await _create(db)
+        store_upload = vault.storage.store_upload
+
+        async def store_then_delete(file, project_id):
+            stored = await store_upload(file, project_id)
+            await db.execute(delete(VaultProjectDB).where(VaultProjectDB.id == project_id))
+            return stored
+
+        monkeypatch.setattr(vault.storage, "store_upload", store_then_delete)
+
+        with pytest.raises(HTTPException) as error:
+            await vault.upload_document(project_id, file=upload_factory(), jurisdiction="DIFC", instrument_type="LAW", db=db)
+
+        assert error.value.status_code == 404
+        assert await vault.storage.list_project_files(project_id) == []
+
+    @pytest.mark.asyncio
+    async def test_failed_commit_removes_file(self, monkeypatch, db, upload_factory):
+        """A commit failure is a 500, leaves the count alone and deletes the stored file."""
+        project_id = await _create(db)
+
+        async def broken_commit():
+            raise OSError("database is locked")
+
+        monkeypatch.setattr(db, "commit", broken_commit)
+
+        with pytest.raises(HTTPException) as error:
+            await vault.upload_document(project_id, file=upload_factory(), jurisdiction="DIFC", instrument_type="LAW", db=db)
+
+        assert error.value.status_code == 500
+        assert await vault.storage.list_project_files(project_id) == []
+        assert (await db.get(VaultProjectDB, project_id)).document_count == 0
+
+
+class TestListingRevalidationCost:
+    """Test that a revalidated listing builds no response models."""
+
+    @pytest.mark.asyncio
+    async def test_not_modified_builds_no_models(self, monkeypatch, db, client):
+        """A matching If-None-Match is answered from the rows alone."""
+        for name in ("A", "B"):
+            await _create(db, name)
+        etag = (await client.get("/projects")).headers["etag"]
+        built = []
+        project_from_row = vault._project_from_row
+        monkeypatch.setattr(vault, "_project_from_row", lambda row: built.append(row.id) or project_from_row(row))
+
+        response = await client.get("/projects", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert built == []
+
+    @pytest.mark.asyncio
+    async def test_full_body_builds_each_model(self, monkeypatch, db, client):
+        """Without a matching ETag every row on the page becomes a model."""
+        for name in ("A", "B"):
+            await _create(db, name)
+        built = []
+        project_from_row = vault._project_from_row
+        monkeypatch.setattr(vault, "_project_from_row", lambda row: built.append(row.id) or project_from_row(row))
+
+        response = await client.get("/projects", headers={"If-None-Match": 'W/"stale"'})
+
+        assert response.status_code == 200
+        assert len(built) == 2 and [p["name"] for p in response.json()["projects"]] == ["B", "A"]
+
+    @pytest.mark.asyncio
+    async def test_empty_page_not_modified(self, db, client):
+        """A page past the end still revalidates against its total."""
+        await _create(db)
+        etag = (await client.get("/projects?offset=5")).headers["etag"]
+
+        response = await client.get("/projects?offset=5", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
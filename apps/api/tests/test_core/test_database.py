@@ -0,0 +1,80 @@
+"""
+Tests for database engine configuration.
+
+Following PRP requirements:
+- 1 expected-use test, 1 edge case, 1 failure case per feature
+- PostgreSQL always runs on the native async driver
+- Project listing is served by an index, also on existing databases
+"""
+
+from sqlalchemy import create_engine, inspect, text
+
+from core.database import Base, _create_missing_indexes, _engine_options
+
+
+class TestEngineOptions:
+    """Test driver resolution for the async engine."""
+
+    def test_postgres_uses_asyncpg_without_jit(self):
+        """An asyncpg URL is kept and JIT is disabled for its connections."""
+        url, kwargs = _engine_options("postgresql+asyncpg://user:pw@db:5432/qaai")
+
+        assert url == "postgresql+asyncpg://user:pw@db:5432/qaai"
+        assert kwargs == {"connect_args": {"server_settings": {"jit": "off"}}}
+
+    def test_sync_postgres_url_switched_to_asyncpg(self):
+        """Plain and psycopg2 URLs are rewritten to the async driver."""
+        assert _engine_options("postgres://db/qaai")[0] == "postgresql+asyncpg://db/qaai"
+        assert _engine_options("postgresql+psycopg2://db/qaai")[0] == "postgresql+asyncpg://db/qaai"
+
+    def test_sqlite_left_untouched(self):
+        """SQLite keeps its URL and gets no PostgreSQL-only options."""
+        assert _engine_options("sqlite+aiosqlite:///./data/qaai.db") == ("sqlite+aiosqlite:///./data/qaai.db", {})
+
+
+def _index_names(engine):
+    return {index["name"] for index in inspect(engine).get_indexes("vault_projects")}
+
+
+class TestVaultProjectIndexes:
+    """Test the indexes behind project listing."""
+
+    def test_listing_uses_index(self):
+        """A filtered, newest-first listing scans the composite index."""
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+
+        with engine.connect() as conn:
+            plan = conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT * FROM vault_projects "
+                "WHERE visibility = 'private' ORDER BY updated_at DESC LIMIT 20"
+            )).all()
+
+        assert "ix_vault_projects_vis_updated" in " ".join(str(row) for row in plan)
+        assert _index_names(engine) == {"ix_vault_projects_vis_updated", "ix_vault_projects_updated"}
+
+    def test_indexes_added_to_existing_table(self):
+        """A table created before the indexes existed gets them on startup."""
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE vault_projects (id VARCHAR PRIMARY KEY, name VARCHAR, visibility VARCHAR, "
+                "document_count INTEGER, owner VARCHAR, created_at DATETIME, updated_at DATETIME)"
+            ))
+
+        with engine.begin() as conn:
+            Base.metadata.create_all(conn)
+            _create_missing_indexes(conn)
+
+        assert {"ix_vault_projects_vis_updated", "ix_vault_projects_updated"} <= _index_names(engine)
+
+    def test_repeated_startup_is_safe(self):
+        """Creating indexes that already exist is a no-op, not an error."""
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+
+        with engine.begin() as conn:
+            _create_missing_indexes(conn)
+            _create_missing_indexes(conn)
+
+        assert len(_index_names(engine)) == 2
@@ -0,0 +1,255 @@
+"""
+Tests for batched and streamed upload storage.
+
+Following PRP requirements:
+- 1 expected-use test, 1 edge case, 1 failure case per feature
+- Upload writes run off the event loop thread
+- Uploads are streamed to disk and hashed in one pass
+- Project file listings are cached until a write, delete or the TTL
+- Listings are invalidated again once a write or delete has finished
+- Project counts and sizes are aggregated without building a listing
+"""
+
+import asyncio
+import hashlib
+import threading
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from core import storage as storage_module
+from core.storage import StorageManager
+
+
+class TestStoreUploads:
+    """Test storing a batch of uploads in one worker thread hop."""
+
+    @pytest.mark.asyncio
+    async def test_batch_written_in_order_off_loop(self, tmp_path, upload_factory):
+        """Every upload is written, in order, from a worker thread."""
+        storage = StorageManager(base_path=tmp_path)
+        threads = []
+        write_file = storage._write_file
+
+        def tracking_write_file(*args):
+            threads.append(threading.get_ident())
+            return write_file(*args)
+
+        storage._write_file = tracking_write_file
+        uploads = [upload_factory(f"law{i}.txt", f"Article {i}".encode()) for i in range(3)]
+
+        results = await storage.store_uploads(uploads, "proj")
+
+        assert [meta["filename"] for _, _, meta in results] == ["law0.txt", "law1.txt", "law2.txt"]
+        assert [path.read_bytes() for _, path, _ in results] == [b"Article 0", b"Article 1", b"Article 2"]
+        assert len(set(threads)) == 1 and threads[0] != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self, tmp_path):
+        """An empty batch stores nothing."""
+        storage = StorageManager(base_path=tmp_path)
+
+        assert await storage.store_uploads([], "proj") == []
+
+    @pytest.mark.asyncio
+    async def test_failed_write_reported_per_upload(self, tmp_path, upload_factory):
+        """One failing write is returned as its exception; the rest are stored."""
+        storage = StorageManager(base_path=tmp_path)
+        write_file = storage._write_file
+
+        def failing_write_file(content, filename, project_id):
+            if filename == "bad.txt":
+                raise OSError("disk full")
+            return write_file(content, filename, project_id)
+
+        storage._write_file = failing_write_file
+        uploads = [upload_factory("bad.txt", b"x"), upload_factory("good.txt", b"y")]
+
+        results = await storage.store_uploads(uploads, "proj")
+
+        assert isinstance(results[0], OSError)
+        assert results[1][2]["size_bytes"] == 1
+
+
+class TestStreamedUpload:
+    """Test streaming a single upload to disk."""
+
+    @pytest.mark.asyncio
+    async def test_copied_in_blocks_with_hash(self, monkeypatch, tmp_path, upload_factory):
+        """The upload is copied block by block and hashed in the same pass."""
+        monkeypatch.setattr(storage_module, "UPLOAD_BLOCK_SIZE", 1024)
+        data = bytes(range(256)) * 40
+        upload = upload_factory("deed.pdf", data)
+        reads = []
+        read = upload.file.read
+        upload.file.read = lambda size=-1: reads.append(size) or read(size)
+
+        _, path, meta = await StorageManager(base_path=tmp_path).store_upload(upload, "proj")
+
+        assert path.read_bytes() == data
+        assert meta["size_bytes"] == len(data)
+        assert meta["file_hash"] == hashlib.sha256(data).hexdigest()
+        assert set(reads) == {1024}
+
+    @pytest.mark.asyncio
+    async def test_empty_upload_and_rewind(self, tmp_path, upload_factory):
+        """An empty upload is stored as an empty file and the upload is rewound."""
+        upload = upload_factory("empty.txt", b"")
+
+        _, path, meta = await StorageManager(base_path=tmp_path).store_upload(upload, "proj")
+
+        assert path.read_bytes() == b""
+        assert meta["size_bytes"] == 0
+        assert meta["file_hash"] == hashlib.sha256(b"").hexdigest()
+        assert upload.file.tell() == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_write_rewinds_upload(self, tmp_path, upload_factory):
+        """A write error is raised and the upload can still be re-read."""
+        storage = StorageManager(base_path=tmp_path)
+        upload = upload_factory("law.txt", b"Article 1")
+
+        def failing_write_file(content, filename, project_id):
+            content.read(4)
+            raise OSError("disk full")
+
+        storage._write_file = failing_write_file
+
+        with pytest.raises(OSError, match="disk full"):
+            await storage.store_upload(upload, "proj")
+        assert await upload.read() == b"Article 1"
+
+
+class TestProjectFilesCache:
+    """Test caching project file listings."""
+
+    @pytest.mark.asyncio
+    async def test_listing_cached_with_total(self, tmp_path, upload_factory):
+        """A second listing reuses the first scan, including its total size."""
+        storage = StorageManager(base_path=tmp_path)
+        await storage.store_uploads([upload_factory("a.txt", b"abc"), upload_factory("b.txt", b"de")], "proj")
+        scans = []
+        scan = storage._scan_project_files
+        storage._scan_project_files = lambda project_id: scans.append(project_id) or scan(project_id)
+
+        first = await storage.list_project_files("proj")
+        files, total_size = await storage.project_files_summary("proj")
+
+        assert scans == ["proj"]
+        assert sorted(f["filename"] for f in first) == sorted(f["filename"] for f in files) == ["a.txt", "b.txt"]
+        assert total_size == 5
+
+    @pytest.mark.asyncio
+    async def test_expired_listing_rescanned(self, tmp_path):
+        """A listing older than the TTL sees files written behind the manager's back."""
+        storage = StorageManager(base_path=tmp_path)
+        storage.listing_ttl = -1.0
+        assert await storage.list_project_files("proj") == []
+
+        (tmp_path / "projects" / "proj" / "abc_external.txt").write_bytes(b"x")
+
+        assert [f["filename"] for f in await storage.list_project_files("proj")] == ["external.txt"]
+
+    @pytest.mark.asyncio
+    async def test_upload_and_delete_invalidate(self, tmp_path, upload_factory):
+        """Uploading or deleting a file is visible in the very next listing."""
+        storage = StorageManager(base_path=tmp_path)
+        assert await storage.list_project_files("proj") == []
+
+        file_id, _, _ = await storage.store_upload(upload_factory("lease.txt", b"Lease"), "proj")
+        listed = await storage.list_project_files("proj")
+        await storage.delete_file(file_id, "proj")
+
+        assert [f["file_id"] for f in listed] == [file_id]
+        assert await storage.project_files_summary("proj") == ([], 0)
+
+
+class _ListingReader:
+    """Upload source that lists the project while its content is being written."""
+
+    def __init__(self, storage: StorageManager, data: bytes, fail: bool = False):
+        self.storage = storage
+        self.source = BytesIO(data)
+        self.fail = fail
+        self.listed = None
+
+    def read(self, size: int = -1) -> bytes:
+        if self.listed is None:
+            self.listed = asyncio.run(self.storage.project_files_summary("proj"))
+            if self.fail:
+                raise OSError("disk full")
+        return self.source.read(size)
+
+
+class TestListingInvalidationOrder:
+    """Test that listings cached while a file changes are dropped afterwards."""
+
+    def test_listing_cached_mid_write_dropped(self, tmp_path):
+        """A listing taken before the write finished is not served after it."""
+        storage = StorageManager(base_path=tmp_path)
+        reader = _ListingReader(storage, b"Lease terms")
+
+        storage._write_file(reader, "lease.txt", "proj")
+
+        assert reader.listed[1] == 0
+        assert asyncio.run(storage.project_files_summary("proj"))[1] == 11
+
+    def test_listing_cached_mid_delete_dropped(self, monkeypatch, tmp_path):
+        """A listing taken just before the unlink is not served after it."""
+        storage = StorageManager(base_path=tmp_path)
+        file_id, stored_path = storage._write_file(b"Lease", "lease.txt", "proj")
+        unlink = Path.unlink
+
+        def listing_unlink(path, *args, **kwargs):
+            asyncio.run(storage.project_files_summary("proj"))
+            unlink(path, *args, **kwargs)
+
+        monkeypatch.setattr(Path, "unlink", listing_unlink)
+
+        assert storage._delete_file(file_id, "proj")
+        assert asyncio.run(storage.project_files_summary("proj")) == ([], 0)
+
+    def test_failed_write_still_invalidates(self, tmp_path):
+        """A write that raises part-way drops listings cached during it."""
+        storage = StorageManager(base_path=tmp_path)
+        reader = _ListingReader(storage, b"Lease terms", fail=True)
+
+        with pytest.raises(OSError):
+            storage._write_file(reader, "lease.txt", "proj")
+
+        assert "proj" not in storage._project_files
+
+
+class TestProjectAggregate:
+    """Test counting and sizing a project's files in storage."""
+
+    @pytest.mark.asyncio
+    async def test_counts_and_sizes_without_listing(self, tmp_path, upload_factory):
+        """The aggregate matches the stored files and builds no listing."""
+        storage = StorageManager(base_path=tmp_path)
+        await storage.store_uploads([upload_factory("a.txt", b"abc"), upload_factory("b.txt", b"de")], "proj")
+        storage._scan_project_files = None
+
+        assert await storage.get_project_aggregate("proj") == {"count": 2, "total_size": 5}
+
+    @pytest.mark.asyncio
+    async def test_cached_listing_reused(self, tmp_path, upload_factory):
+        """A fresh cached listing answers without touching the disk."""
+        storage = StorageManager(base_path=tmp_path)
+        await storage.store_upload(upload_factory("a.txt", b"abc"), "proj")
+        await storage.list_project_files("proj")
+        storage._scan_project_aggregate = None
+
+        assert await storage.get_project_aggregate("proj") == {"count": 1, "total_size": 3}
+
+    @pytest.mark.asyncio
+    async def test_ignores_directories_and_unprefixed_files(self, tmp_path):
+        """Only stored files count, matching the listing's rules."""
+        storage = StorageManager(base_path=tmp_path)
+        project_path = tmp_path / "projects" / "proj"
+        project_path.mkdir(parents=True)
+        (project_path / "notes.txt").write_bytes(b"xx")
+        (project_path / "sub_dir").mkdir()
+
+        assert await storage.get_project_aggregate("proj") == {"count": 0, "total_size": 0}
@@ -0,0 +1,50 @@
+"""
+Tests for cached citation text processing.
+
+Following PRP requirements:
+- 1 expected-use test, 1 edge case, 1 failure case per feature
+- Caching must not change verification scores
+"""
+
+from rag.citations import (
+    CitationCandidate,
+    _legal_terms,
+    _token_set,
+    enhanced_similarity,
+    extract_legal_terms,
+    jaccard_similarity
+)
+
+
+class TestCachedTokenization:
+    """Test LRU-cached tokenization and legal term extraction."""
+
+    def test_query_tokenized_once_across_candidates(self):
+        """Scoring one query against many candidates reuses its token set."""
+        _token_set.cache_clear()
+        _legal_terms.cache_clear()
+        query = "What notice period does DIFC Employment Law require?"
+        candidates = [
+            CitationCandidate(title="DIFC Employment Law No. 2 of 2019", section=f"Article {i}")
+            for i in range(5)
+        ]
+
+        scores = [enhanced_similarity(query, candidate) for candidate in candidates]
+
+        assert all(score > 0 for score in scores)
+        assert _token_set.cache_info().hits > 0
+        assert _legal_terms.cache_info().hits >= len(candidates) - 1
+
+    def test_punctuation_and_empty_text(self):
+        """Normalization still ignores case/punctuation and empty text scores zero."""
+        assert jaccard_similarity("DIFC Employment Law!", "difc employment law") == 1.0
+        assert jaccard_similarity("", "difc employment law") == 0.0
+        assert _token_set("...") == frozenset()
+
+    def test_mutating_extracted_terms_does_not_poison_cache(self):
+        """extract_legal_terms returns a fresh set each call."""
+        terms = extract_legal_terms("The employer shall comply with DIFC law")
+        terms.add("tampered")
+
+        assert "tampered" not in extract_legal_terms("The employer shall comply with DIFC law")
+        assert {"shall", "difc", "law"} <= extract_legal_terms("The employer shall comply with DIFC law")
@@ -0,0 +1,132 @@
+"""
+Tests for query embedding micro-batching and matrix embeddings.
+
+Following PRP requirements:
+- 1 expected-use test, 1 edge case, 1 failure case per feature
+- Concurrent queries must share a single provider call
+- Document embeddings can be produced as one float32 matrix
+"""
+
+import asyncio
+import pytest
+
+from rag.embeddings import EmbeddingProvider, QueryBatcher, SentenceTransformerProvider
+
+
+class TestQueryBatcher:
+    """Test micro-batched query embeddings."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_share_one_call(self):
+        """Queries submitted together are embedded in one batch."""
+        calls = []
+
+        async def embed_texts(texts):
+            calls.append(list(texts))
+            return [[float(len(text))] for text in texts]
+
+        batcher = QueryBatcher(embed_texts, batch_size=32, max_delay_ms=5)
+        results = await asyncio.gather(
+            batcher.embed("DIFC"),
+            batcher.embed("DFSA rulebook")
+        )
+
+        assert calls == [["DIFC", "DFSA rulebook"]]
+        assert results == [[4.0], [13.0]]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_without_waiting(self):
+        """Reaching batch_size flushes immediately instead of waiting for the timer."""
+        calls = []
+
+        async def embed_texts(texts):
+            calls.append(list(texts))
+            return [[0.0] for _ in texts]
+
+        batcher = QueryBatcher(embed_texts, batch_size=2, max_delay_ms=10_000)
+        await asyncio.wait_for(
+            asyncio.gather(batcher.embed("a"), batcher.embed("b")),
+            timeout=1
+        )
+
+        assert calls == [["a", "b"]]
+        # In-flight batch tasks are released once they finish
+        await asyncio.sleep(0)
+        assert not batcher._tasks
+
+    @pytest.mark.asyncio
+    async def test_provider_error_propagates_to_every_caller(self):
+        """A failed batch raises in each waiting caller."""
+        async def embed_texts(texts):
+            raise RuntimeError("Embedding service unavailable")
+
+        batcher = QueryBatcher(embed_texts, max_delay_ms=1)
+        results = await asyncio.gather(
+            batcher.embed("a"),
+            batcher.embed("b"),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+
+class _ListProvider(EmbeddingProvider):
+    """Provider that only implements the list-based interface."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+
+    async def embed_texts(self, texts):
+        if self.fail:
+            raise RuntimeError("Embedding service unavailable")
+        return [[float(i), 0.5] for i, _ in enumerate(texts)]
+
+    async def embed_query(self, query):
+        return (await self.embed_texts([query]))[0]
+
+    @property
+    def dimension(self):
+        return 2
+
+
+class TestEmbedMatrix:
+    """Test float32 matrix embeddings."""
+
+    @pytest.mark.asyncio
+    async def test_model_output_kept_as_array(self):
+        """Sentence-transformers output becomes a float32 matrix without list conversion."""
+        np = pytest.importorskip("numpy")
+
+        class FakeModel:
+            def encode(self, texts, normalize_embeddings):
+                return np.ones((len(texts), 3), dtype=np.float64)
+
+        provider = SentenceTransformerProvider("fake")
+        provider._model = FakeModel()
+        provider._dimension = 3
+
+        matrix = await provider.embed_matrix(["a", "b"])
+
+        assert matrix.dtype == np.float32
+        assert matrix.shape == (2, 3)
+
+    @pytest.mark.asyncio
+    async def test_list_provider_and_empty_input(self):
+        """Providers without a native matrix path are converted; no texts gives no rows."""
+        np = pytest.importorskip("numpy")
+        provider = SentenceTransformerProvider("fake")
+        provider._dimension = 3
+
+        matrix = await _ListProvider().embed_matrix(["a", "b", "c"])
+        empty = await provider.embed_matrix([])
+
+        assert matrix.dtype == np.float32 and matrix.tolist() == [[0.0, 0.5], [1.0, 0.5], [2.0, 0.5]]
+        assert empty.shape == (0, 3)
+
+    @pytest.mark.asyncio
+    async def test_provider_error_propagates(self):
+        """An embedding failure is raised, not turned into an empty matrix."""
+        pytest.importorskip("numpy")
+
+        with pytest.raises(RuntimeError, match="unavailable"):
+            await _ListProvider(fail=True).embed_matrix(["a"])
@@ -0,0 +1,334 @@
+"""
+Tests for the shared document ingestion pipeline.
+
+Following PRP requirements:
+- 1 expected-use test, 1 edge case, 1 failure case per feature
+- One per-file ingestion path serves both ingestion endpoints
+- Concurrent single-document ingestions share embedding calls
+- Flushed embeddings reach the vector store as one float32 matrix
+- Vector store writes run in the background, in queue order
+- A document failing mid-write is reported once and never hangs callers
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from core.models import InstrumentType, JurisdictionType
+from rag import pipeline
+from rag.vector_store import DocumentChunk, VectorStore
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path, embedder_factory):
+    """Temp vector store with a recording embedder and a fresh shared batcher."""
+    store = VectorStore(index_dir=tmp_path / "index")
+    monkeypatch.setattr(pipeline, "vector_store", store)
+    monkeypatch.setattr(pipeline, "embedding_provider", embedder_factory())
+    monkeypatch.setattr(pipeline, "batched_embedder", pipeline.BatchedEmbedder())
+    return store
+
+
+def _stored(tmp_path, name: str, text: str):
+    """Write an upload to disk and return (file_id, path, storage metadata)."""
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    metadata = {
+        "filename": name,
+        "stored_path": str(path),
+        "content_type": "text/plain",
+        "size_bytes": len(text)
+    }
+    return name.split(".")[0], path, metadata
+
+
+async def _ingest(tmp_path, name: str, text: str, **kwargs):
+    file_id, path, metadata = _stored(tmp_path, name, text)
+    return await pipeline.ingest_file(
+        file_id, path, metadata, JurisdictionType.DIFC, InstrumentType.LAW, project_id="test", **kwargs
+    )
+
+
+class TestIngestFile:
+    """Test the per-file ingestion path."""
+
+    @pytest.mark.asyncio
+    async def test_indexes_and_reports_steps(self, store, tmp_path):
+        """Without an embedder the file is indexed before returning, with each step reported."""
+        pytest.importorskip("faiss")
+        events = []
+
+        result = await _ingest(tmp_path, "law.txt", "Article 1 notice period", progress_cb=events.append)
+
+        assert result == {"document_id": "law", "filename": "law.txt", "chunk_count": 1, "content_length": 23}
+        assert [e["type"] for e in events] == [
+            "text_extraction", "chunking", "chunking_complete", "embedding_generation"
+        ]
+        assert all(e["file_id"] == "law" for e in events)
+        assert store._index.ntotal == 1
+
+    @pytest.mark.asyncio
+    async def test_given_embedder_is_only_queued(self, store, tmp_path):
+        """A batch job's embedder receives the chunks and nothing is indexed yet."""
+        embedder = pipeline.BatchedEmbedder(batch_size=10)
+
+        result = await _ingest(tmp_path, "law.txt", "Article 1", embedder=embedder)
+
+        assert result["chunk_count"] == 1
+        assert embedder.queued_count == 1 and embedder.ready(final=True)
+        assert store._index is None or store._index.ntotal == 0
+
+    @pytest.mark.asyncio
+    async def test_empty_text_queues_nothing(self, store, tmp_path):
+        """A file without words reports zero chunks and is not indexed."""
+        embedder = pipeline.BatchedEmbedder(batch_size=10)
+
+        result = await _ingest(tmp_path, "blank.txt", "  \n ", embedder=embedder)
+
+        assert result["chunk_count"] == 0
+        assert embedder.queued_count == 0
+
+
+class TestSharedBatchedEmbedder:
+    """Test coalescing concurrent single-document ingestions."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_ingestions_share_one_call(self, store, tmp_path):
+        """Documents queued in the same loop turn are embedded together."""
+        pytest.importorskip("faiss")
+
+        results = await asyncio.gather(*(
+            _ingest(tmp_path, f"law{i}.txt", f"Article {i}") for i in range(3)
+        ))
+
+        assert [r["chunk_count"] for r in results] == [1, 1, 1]
+        assert len(pipeline.embedding_provider.calls) == 1
+        assert store._index.ntotal == 3
+
+    @pytest.mark.asyncio
+    async def test_empty_index_returns_immediately(self, store):
+        """Indexing no chunks makes no embedding call."""
+        await pipeline.batched_embedder.index([])
+
+        assert pipeline.embedding_provider.calls == []
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_raises_for_its_documents(self, monkeypatch, store, tmp_path, embedder_factory):
+        """Every document in a failed flush sees the embedding error."""
+        monkeypatch.setattr(pipeline, "embedding_provider", embedder_factory(fail_on="broken"))
+
+        results = await asyncio.gather(
+            _ingest(tmp_path, "law.txt", "Article 1"),
+            _ingest(tmp_path, "bad.txt", "broken text"),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert "Embedding service unavailable" in str(results[0])
+        assert pipeline.batched_embedder._waiters == {}
+
+
+class _RecordingStore:
+    """Vector store stand-in that keeps what each write received."""
+
+    def __init__(self):
+        self.writes = []
+        self.saves = 0
+
+    async def add_chunks_with_embeddings(self, chunks, vectors):
+        self.writes.append((chunks, vectors))
+        return len(chunks)
+
+    async def persist(self):
+        self.saves += 1
+        return True
+
+
+def _chunks(doc_id: str, sizes):
+    return [
+        DocumentChunk(id=f"{doc_id}_{i}", doc_id=doc_id, content="w " * size, chunk_index=i, token_count=size)
+        for i, size in enumerate(sizes)
+    ]
+
+
+class TestFlushMatrix:
+    """Test flushing embeddings as one float32 matrix."""
+
+    @pytest.mark.asyncio
+    async def test_matrix_in_chunk_order(self, monkeypatch, embedder_factory):
+        """Size-packed batches are reassembled into a matrix in queue order."""
+        store = _RecordingStore()
+        monkeypatch.setattr(pipeline, "vector_store", store)
+        monkeypatch.setattr(pipeline, "embedding_provider", embedder_factory())
+        embedder = pipeline.BatchedEmbedder(batch_size=2)
+        embedder.add(_chunks("law", [1, 5, 3, 4]))
+
+        await embedder.flush(final=True)
+
+        (chunks, vectors), = store.writes
+        assert store.saves == 1
+        assert isinstance(vectors, np.ndarray) and vectors.dtype == np.float32
+        assert vectors[:, 0].tolist() == [len(chunk.content) for chunk in chunks]
+
+    @pytest.mark.asyncio
+    async def test_oversized_batch_retried_per_text(self, monkeypatch, embedder_factory):
+        """A batch rejected as too large is embedded text by text into the same matrix."""
+        store = _RecordingStore()
+        monkeypatch.setattr(pipeline, "vector_store", store)
+        monkeypatch.setattr(pipeline, "embedding_provider", embedder_factory(max_texts=1))
+        embedder = pipeline.BatchedEmbedder(batch_size=3)
+        embedder.add(_chunks("law", [2, 2, 2]))
+
+        completed, failed = await embedder.flush(final=True)
+
+        assert completed == ["law"] and failed == {}
+        assert store.writes[0][1].shape == (3, 2)
+
+    @pytest.mark.asyncio
+    async def test_embedding_failure_writes_nothing(self, monkeypatch, embedder_factory):
+        """If embedding fails no matrix reaches the vector store."""
+        store = _RecordingStore()
+        monkeypatch.setattr(pipeline, "vector_store", store)
+        monkeypatch.setattr(pipeline, "embedding_provider", embedder_factory(fail_on="w"))
+        embedder = pipeline.BatchedEmbedder(batch_size=2)
+        embedder.add(_chunks("law", [1, 2]))
+
+        completed, failed = await embedder.flush(final=True)
+
+        assert completed == [] and "unavailable" in failed["law"]
+        assert store.writes == []
+
+
+class _GatedStore(_RecordingStore):
+    """Recording store whose first write waits until released."""
+
+    def __init__(self, fail_first: bool = False):
+        super().__init__()
+        self.release = asyncio.Event()
+        self.fail_first = fail_first
+
+    async def add_chunks_with_embeddings(self, chunks, vectors):
+        if not self.writes and not self.release.is_set():
+            self.writes.append(None)
+            await self.release.wait()
+            if self.fail_first:
+                raise OSError("disk full")
+            self.writes[0] = (chunks, vectors)
+            return len(chunks)
+        return await super().add_chunks_with_embeddings(chunks, vectors)
+
+
+class TestBackgroundWrites:
+    """Test overlapping vector store writes with the next embeddings."""
+
+    @pytest.mark.asyncio
+    async def test_next_batch_embeds_during_write(self, monkeypatch, embedder_factory):
+        """A flush returns while its write is pending and the next batch is embedded meanwhile."""
+        store = _GatedStore()
+        provider = embedder_factory()
+        monkeypatch.setattr(pipeline, "vector_store", store)
+        monkeypatch.setattr(pipeline, "embedding_provider", provider)
+        embedder = pipeline.BatchedEmbedder(batch_size=2)
+
+        embedder.add(_chunks("a", [1, 2]))
+        assert await embedder.flush() == ([], {})
+        embedder.add(_chunks("b", [3, 4]))
+        await embedder.flush()
+
+        assert len(provider.calls) == 2
+        assert embedder.indexed_count == 0
+        store.release.set()
+        completed, failed = await embedder.flush(final=True)
+        assert completed == ["a", "b"] and failed == {}
+        assert embedder.indexed_count == 4
+
+    @pytest.mark.asyncio
+    async def test_writes_land_in_queue_order(self, monkeypatch, embedder_factory):
+        """A later write waits for a slower earlier one."""
+        store = _GatedStore()
+        monkeypatch.setattr(pipeline, "vector_store", store)
+        monkeypatch.setattr(pipeline, "embedding_provider", embedder_factory())
+        embedder = pipeline.BatchedEmbedder(batch_size=2)
+
+        embedder.add(_chunks("a", [1, 2]))
+        await embedder.flush()
+        embedder.add(_chunks("b", [3, 4]))
+        await embedder.flush()
+        await asyncio.sleep(0.01)
+        store.release.set()
+        await embedder.flush(final=True)
+
+        assert [chunks[0].doc_id for chunks, _ in store.writes] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_failed_write_skips_document_rest(self, monkeypatch, embedder_factory):
+        """When a write fails, the document's later embedded chunks are not written."""
+        store = _GatedStore(fail_first=True)
+        monkeypatch.setattr(pipeline, "vector_store", store)
+        monkeypatch.setattr(pipeline, "embedding_provider", embedder_factory())
+        embedder = pipeline.BatchedEmbedder(batch_size=2)
+
+        embedder.add(_chunks("a", [1, 2, 3]))
+        await embedder.flush()
+        embedder.add(_chunks("b", [4]))
+        await embedder.flush()
+        await asyncio.sleep(0.01)
+        store.release.set()
+        completed, failed = await embedder.flush(final=True)
+
+        assert completed == ["b"]
+        assert failed == {"a": "disk full"}
+        assert [chunk.doc_id for chunk in store.writes[1][0]] == ["b"]
+
+
+class TestFailureDuringWrite:
+    """Test a document failing while an earlier batch of it is being written."""
+
+    @pytest.mark.asyncio
+    async def test_failed_document_skipped_by_running_write(self, monkeypatch, embedder_factory):
+        """The running write still completes its other documents and the failure is reported once."""
+        store = _GatedStore()
+        monkeypatch.setattr(pipeline, "vector_store", store)
+        monkeypatch.setattr(pipeline, "embedding_provider", embedder_factory(fail_on="broken"))
+        embedder = pipeline.BatchedEmbedder(batch_size=2)
+        embedder.add(_chunks("b", [1]))
+        embedder.add(_chunks("a", [1]) + [DocumentChunk(id="a_1", doc_id="a", content="broken", chunk_index=1)])
+
+        await embedder.flush()
+        asyncio.get_running_loop().call_later(0.01, store.release.set)
+        completed, failed = await embedder.flush(final=True)
+
+        assert completed == ["b"]
+        assert list(failed) == ["a"] and "unavailable" in failed["a"]
+        assert embedder.remaining == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_wakes_waiters(self, monkeypatch):
+        """If the shared flush itself raises, index() callers get the error instead of hanging."""
+        embedder = pipeline.BatchedEmbedder(batch_size=2)
+
+        async def broken_flush(final=False):
+            raise KeyError("doc")
+
+        monkeypatch.setattr(embedder, "flush", broken_flush)
+
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(embedder.index(_chunks("a", [1])), timeout=1)
+        assert embedder.remaining == {}
+
+    @pytest.mark.asyncio
+    async def test_written_chunks_of_failed_document_stay(self, monkeypatch, embedder_factory):
+        """Chunks written before their document failed are not removed from the store."""
+        store = _RecordingStore()
+        monkeypatch.setattr(pipeline, "vector_store", store)
+        monkeypatch.setattr(pipeline, "embedding_provider", embedder_factory(fail_on="broken"))
+        embedder = pipeline.BatchedEmbedder(batch_size=1)
+        embedder.add(_chunks("a", [1]))
+        await embedder.flush()
+        embedder.add([DocumentChunk(id="a_1", doc_id="a", content="broken", chunk_index=1)])
+
+        completed, failed = await embedder.flush(final=True)
+
+        assert completed == [] and list(failed) == ["a"]
+        assert [chunk.id for chunks, _ in store.writes for chunk in chunks] == ["a_0"]
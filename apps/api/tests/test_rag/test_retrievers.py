@@ -561,4 +561,41 @@ class TestRetrievalIntegration:
             assert "DIFC" in jurisdictions
             
             # DIFC should rank first due to boosting
-            assert results[0]["metadata"]["jurisdiction"] == "DIFC"
\ No newline at end of file
+            assert results[0]["metadata"]["jurisdiction"] == "DIFC"
+
+class TestRetrieverWarmup:
+    """Test the lazy retriever singleton and its startup warmup."""
+    
+    def test_singleton_built_lazily_and_shared(self):
+        """get_difc_retriever() returns one shared instance; the old name still resolves."""
+        import rag.retrievers as retrievers
+        
+        assert "difc_retriever" not in vars(retrievers)
+        assert retrievers.get_difc_retriever() is retrievers.get_difc_retriever()
+        assert retrievers.difc_retriever is retrievers.get_difc_retriever()
+    
+    @pytest.mark.asyncio
+    async def test_warmup_loads_index_and_runs_one_query(self):
+        """With an index on disk, warmup loads it and issues a throwaway retrieval."""
+        retriever = DIFCRetriever()
+        retriever.vector_store = MagicMock(is_loaded=True, warmup=AsyncMock())
+        
+        with patch.object(retriever, "retrieve_with_citations", AsyncMock(return_value=([], []))) as query:
+            await retriever.warmup()
+        
+        retriever.vector_store.warmup.assert_awaited_once()
+        assert query.await_args.args[0].query == "difc law"
+    
+    @pytest.mark.asyncio
+    async def test_warmup_failure_does_not_raise(self):
+        """An empty store skips the query and a failing query is only logged."""
+        retriever = DIFCRetriever()
+        retriever.vector_store = MagicMock(is_loaded=False, warmup=AsyncMock())
+        
+        with patch.object(retriever, "retrieve_with_citations", AsyncMock()) as query:
+            await retriever.warmup()
+        query.assert_not_called()
+        
+        retriever.vector_store.is_loaded = True
+        with patch.object(retriever, "retrieve_with_citations", AsyncMock(side_effect=RuntimeError("no key"))):
+            await retriever.warmup()
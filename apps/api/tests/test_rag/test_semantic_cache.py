@@ -0,0 +1,84 @@
+"""
+Tests for the Vault search semantic cache.
+
+Following PRP requirements:
+- 1 expected-use test, 1 edge case, 1 failure case per feature
+- Similar query embeddings share cached matches above the cosine threshold
+- Cached matches only answer requests they hold enough matches for
+"""
+
+import numpy as np
+import pytest
+
+from rag.semantic_cache import SemanticSearchCache
+
+
+def _near(vector, noise: float = 0.01, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    return (np.asarray(vector) + noise * rng.standard_normal(len(vector))).tolist()
+
+
+_QUERY = np.random.default_rng(0).standard_normal(64).tolist()
+
+
+class TestSimilarityLookup:
+    """Test LSH bucketing with a cosine threshold."""
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_hits(self):
+        """A slightly perturbed embedding is served the cached matches."""
+        cache = SemanticSearchCache(similarity_threshold=0.95)
+        await cache.set(_QUERY, "proj", ["m0", "m1", "m2"], requested=20)
+
+        assert await cache.lookup(_near(_QUERY), "proj", top_k=2) == ["m0", "m1"]
+
+    @pytest.mark.asyncio
+    async def test_dissimilar_query_misses(self):
+        """An unrelated embedding is a miss even in a one-bit lsh space."""
+        cache = SemanticSearchCache(lsh_bits=1)
+        await cache.set(_QUERY, "proj", ["m0"], requested=20)
+        other = np.random.default_rng(7).standard_normal(64).tolist()
+
+        assert await cache.lookup(other, "proj", top_k=1) is None
+
+    @pytest.mark.asyncio
+    async def test_other_project_and_generation_miss(self):
+        """Entries never cross projects and are dropped when the generation changes."""
+        cache = SemanticSearchCache()
+        await cache.set(_QUERY, "proj", ["m0"], requested=20, generation=3)
+
+        assert await cache.lookup(_QUERY, "other", top_k=1, generation=3) is None
+        assert await cache.lookup(_QUERY, "proj", top_k=1, generation=4) is None
+        assert cache.get_stats()["cache_size"] == 0
+
+
+class TestStoredTopK:
+    """Test reusing the larger stored top-k and bounding the cache."""
+
+    @pytest.mark.asyncio
+    async def test_wider_request_served_when_enough_matches(self):
+        """A request for more matches than first asked for is served from the stored top-k."""
+        cache = SemanticSearchCache()
+        await cache.set(_QUERY, "proj", [f"m{i}" for i in range(20)], requested=20)
+
+        assert len(await cache.lookup(_QUERY, "proj", top_k=15)) == 15
+
+    @pytest.mark.asyncio
+    async def test_exhausted_search_answers_any_limit(self):
+        """A search that found fewer matches than requested answers any later limit."""
+        cache = SemanticSearchCache()
+        await cache.set(_QUERY, "proj", ["m0"], requested=20)
+
+        assert await cache.lookup(_QUERY, "proj", top_k=50) == ["m0"]
+
+    @pytest.mark.asyncio
+    async def test_too_few_matches_and_eviction(self):
+        """A truncated entry cannot answer a wider request, and old entries are evicted."""
+        cache = SemanticSearchCache(max_entries=1)
+        await cache.set(_QUERY, "proj", ["m0", "m1"], requested=2)
+        assert await cache.lookup(_QUERY, "proj", top_k=5) is None
+
+        await cache.set(_QUERY, "other", ["m9"], requested=20)
+
+        assert await cache.lookup(_QUERY, "proj", top_k=1) is None
+        assert cache.get_stats()["cache_size"] == 1
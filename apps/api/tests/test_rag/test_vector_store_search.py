@@ -0,0 +1,258 @@
+"""
+Tests for non-blocking vector store search and writes.
+
+Following PRP requirements:
+- 1 expected-use test, 1 edge case, 1 failure case per feature
+- Disk loads, FAISS searches and index writes must not run on the event loop thread
+- Searches never read the index while an append is changing it
+- Appends stay in memory until the store is persisted
+"""
+
+import threading
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from core.models import JurisdictionType
+from rag.vector_store import DocumentChunk, VectorStore
+
+
+class _FakeIndex:
+    """FAISS index stand-in that records which thread searched it."""
+
+    def __init__(self, scores):
+        self.ntotal = len(scores)
+        self.scores = scores
+        self.threads = []
+
+    def search(self, query, k):
+        self.threads.append(threading.get_ident())
+        order = list(range(self.ntotal))[:k]
+        return np.array([[self.scores[i] for i in order]]), np.array([order])
+
+
+def _store(tmp_path, index=None) -> VectorStore:
+    store = VectorStore(index_dir=tmp_path)
+    store._index = index
+    store._metadata = {"vectors": [{"chunk_id": "c0"}, {"chunk_id": "c1"}]}
+    for i, jurisdiction in enumerate([JurisdictionType.UAE, JurisdictionType.DIFC]):
+        store._chunks[f"c{i}"] = DocumentChunk(
+            id=f"c{i}", doc_id=f"d{i}", content="notice period", chunk_index=0,
+            metadata={"jurisdiction": jurisdiction.value}
+        )
+    return store
+
+
+class TestVectorStoreSearch:
+    """Test FAISS search off the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_search_runs_in_worker_thread(self, tmp_path):
+        """FAISS search happens on a worker thread and DIFC boosting still applies."""
+        index = _FakeIndex([0.9, 0.8])
+        store = _store(tmp_path, index)
+
+        with patch("rag.vector_store.embeddings.embed_query", AsyncMock(return_value=[1.0, 0.0])):
+            results = await store.search("notice period", limit=2)
+
+        assert index.threads and index.threads[0] != threading.get_ident()
+        assert [r.chunk.id for r in results] == ["c1", "c0"]
+
+    @pytest.mark.asyncio
+    async def test_missing_index_loads_off_loop(self, tmp_path):
+        """With no index on disk the cold load runs in a thread and returns nothing."""
+        store = VectorStore(index_dir=tmp_path)
+        load_threads = []
+        store._load_all = lambda: load_threads.append(threading.get_ident())
+
+        results = await store.search("notice period")
+
+        assert results == []
+        assert load_threads and load_threads[0] != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_search_error_returns_empty(self, tmp_path):
+        """An index failure is reported as no results rather than raised."""
+        index = _FakeIndex([0.9, 0.8])
+        index.search = MagicMock(side_effect=RuntimeError("corrupt index"))
+        store = _store(tmp_path, index)
+
+        with patch("rag.vector_store.embeddings.embed_query", AsyncMock(return_value=[1.0, 0.0])):
+            assert await store.search("notice period") == []
+
+
+class TestAddChunksWithEmbeddings:
+    """Test appending pre-embedded chunks to the index."""
+
+    @pytest.mark.asyncio
+    async def test_append_persists_and_bumps_generation(self, tmp_path):
+        """Vectors are added, made searchable and saved by persist()."""
+        pytest.importorskip("faiss")
+        store = VectorStore(index_dir=tmp_path)
+        chunks = [
+            DocumentChunk(id=f"c{i}", doc_id="d0", content=f"clause {i}", chunk_index=i)
+            for i in range(3)
+        ]
+
+        added = await store.add_chunks_with_embeddings(chunks, [[1.0, 0.0]] * 3)
+
+        assert added == 3
+        assert store.generation == 1
+        assert await store.persist()
+        reloaded = VectorStore(index_dir=tmp_path)
+        reloaded._load_all()
+        assert reloaded._index.ntotal == 3
+        assert [v["chunk_id"] for v in reloaded._metadata["vectors"]] == ["c0", "c1", "c2"]
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_is_a_noop(self, tmp_path):
+        """Nothing is written and caches stay valid for an empty batch."""
+        store = VectorStore(index_dir=tmp_path)
+
+        assert await store.add_chunks_with_embeddings([], []) == 0
+        assert store.generation == 0
+        assert not store.index_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_mismatched_lengths_rejected(self, tmp_path):
+        """Each chunk needs exactly one embedding."""
+        store = VectorStore(index_dir=tmp_path)
+        chunk = DocumentChunk(id="c0", doc_id="d0", content="clause", chunk_index=0)
+
+        with pytest.raises(ValueError):
+            await store.add_chunks_with_embeddings([chunk], [])
+
+
+class _BlockingIndex(_FakeIndex):
+    """Index stand-in whose searches wait on a gate and count overlap."""
+
+    def __init__(self, scores, gate: threading.Event):
+        super().__init__(scores)
+        self.gate = gate
+        self.active = 0
+        self.max_active = 0
+
+    def search(self, query, k):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            self.gate.wait(timeout=1)
+            return super().search(query, k)
+        finally:
+            self.active -= 1
+
+
+class TestIndexLocking:
+    """Test that searches never overlap an index append."""
+
+    def test_search_waits_for_append(self, tmp_path):
+        """A search started during an append runs only after it finishes."""
+        store = _store(tmp_path, _FakeIndex([0.9, 0.8]))
+        order = []
+
+        with store._index_lock.write():
+            searcher = threading.Thread(
+                target=lambda: order.append(("search", store._search_index(np.zeros((1, 2), "float32"), 2)))
+            )
+            searcher.start()
+            searcher.join(timeout=0.05)
+            order.append("append done")
+        searcher.join(timeout=1)
+
+        assert [step if isinstance(step, str) else step[0] for step in order] == ["append done", "search"]
+
+    def test_searches_run_together(self, tmp_path):
+        """Concurrent searches share the lock instead of queuing."""
+        gate = threading.Event()
+        index = _BlockingIndex([0.9, 0.8], gate)
+        store = _store(tmp_path, index)
+        searchers = [
+            threading.Thread(target=store._search_index, args=(np.zeros((1, 2), "float32"), 2))
+            for _ in range(3)
+        ]
+
+        for searcher in searchers:
+            searcher.start()
+        threading.Timer(0.05, gate.set).start()
+        for searcher in searchers:
+            searcher.join(timeout=1)
+
+        assert index.max_active == 3
+
+    def test_waiting_append_not_starved(self, tmp_path):
+        """Once an append is waiting, new searches queue behind it."""
+        gate = threading.Event()
+        store = _store(tmp_path, _BlockingIndex([0.9, 0.8], gate))
+        order = []
+        query = np.zeros((1, 2), "float32")
+
+        first = threading.Thread(target=store._search_index, args=(query, 2))
+        first.start()
+
+        def append():
+            with store._index_lock.write():
+                order.append("append")
+
+        writer = threading.Thread(target=append)
+        writer.start()
+        threading.Event().wait(0.02)
+        late = threading.Thread(target=lambda: (store._search_index(query, 2), order.append("late search")))
+        late.start()
+        gate.set()
+        for thread in (first, writer, late):
+            thread.join(timeout=1)
+
+        assert order == ["append", "late search"]
+
+
+def _clauses(start: int, count: int):
+    return [
+        DocumentChunk(id=f"c{i}", doc_id="d0", content=f"clause {i}", chunk_index=i)
+        for i in range(start, start + count)
+    ]
+
+
+class TestDeferredPersist:
+    """Test saving appended vectors once instead of on every append."""
+
+    @pytest.mark.asyncio
+    async def test_appends_not_written_until_persist(self, tmp_path):
+        """Several appends touch the disk once, when persisted."""
+        pytest.importorskip("faiss")
+        store = VectorStore(index_dir=tmp_path)
+
+        with patch("faiss.write_index") as write_index:
+            for start in (0, 2, 4):
+                await store.add_chunks_with_embeddings(_clauses(start, 2), [[1.0, 0.0]] * 2)
+            assert write_index.call_count == 0
+            assert not store.metadata_path.exists()
+
+            await store.persist()
+
+        assert write_index.call_count == 1
+        assert store._index.ntotal == 6
+
+    @pytest.mark.asyncio
+    async def test_persist_without_changes_is_a_noop(self, tmp_path):
+        """Nothing is written when no append happened since the last save."""
+        pytest.importorskip("faiss")
+        store = VectorStore(index_dir=tmp_path)
+        await store.add_chunks_with_embeddings(_clauses(0, 1), [[1.0, 0.0]])
+
+        assert await store.persist()
+        assert not await store.persist()
+        assert not await VectorStore(index_dir=tmp_path / "empty").persist()
+
+    @pytest.mark.asyncio
+    async def test_failed_save_is_retried(self, tmp_path):
+        """A save that raises leaves the store dirty so the next persist writes it."""
+        pytest.importorskip("faiss")
+        store = VectorStore(index_dir=tmp_path)
+        await store.add_chunks_with_embeddings(_clauses(0, 1), [[1.0, 0.0]])
+
+        with patch("faiss.write_index", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                await store.persist()
+
+        assert await store.persist()
+        assert store.index_path.exists()